@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, g, stream_with_context
 from flask_cors import CORS
 import os
 import logging
@@ -6,32 +6,127 @@ from werkzeug.utils import secure_filename
 from datetime import datetime
 import tempfile
 import shutil
+import functools
+import time
+import uuid
+import sqlite3
 from pathlib import Path
 
 # Import parsing modules
 from parsers.resume_parser import ResumeParser
-from utils.file_handler import FileHandler
+from parsers.skill_extractor import SkillBatchExtractor, skill_frequencies
+from utils.file_handler import FileHandler, PDF_PROFILES
 from utils.data_cleaner import DataCleaner
+from utils.pipeline import ResumePipeline, InsufficientTextError, build_parse_data
+from utils.guardrails import DocumentRejectedError
+from utils.metrics import (
+    REGISTRY, UPLOAD_SIZE_BYTES, MATCH_SECONDS, FAILURES_TOTAL, IN_FLIGHT_REQUESTS,
+    CallbackGauge, begin_stage_recording, end_stage_recording
+)
+from utils.log_config import configure_logging, request_id_var
+from utils.serialization import (
+    FastJSONProvider, available_mimetypes, encode_body, choose_encoding, compress
+)
+from utils.profiling import RequestProfiler
+from utils.warmup import Warmup
+from utils.resume_store import ResumeStore, StaleVersionError, file_hash
+from utils.job_profiles import (
+    JobProfile, JobProfileRegistry, InvalidJobRequirementsError, compile_job_requirements
+)
+from utils.semantic import EMBEDDER, ResumeVectorIndex, vector_from_bytes
+from utils.facets import InvalidFacetQueryError, ResumeFacetIndex
+from utils.scheduler import BULK, INTERACTIVE, FairScheduler, SchedulerTimeoutError, parse_tenant_settings
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/resume_parser.log'),
-        logging.StreamHandler()
-    ]
+# Configure logging (JSON records written by a background thread)
+configure_logging(
+    log_file=os.environ.get('LOG_FILE', 'logs/resume_parser.log'),
+    level=os.environ.get('LOG_LEVEL', 'INFO'),
+    queue_size=int(os.environ.get('LOG_QUEUE_SIZE', 10000)),
+    warning_burst=int(os.environ.get('LOG_WARNING_BURST', 10)),
+    warning_interval=float(os.environ.get('LOG_WARNING_INTERVAL', 60))
 )
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)
 
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10MB max file size
 app.config['UPLOAD_FOLDER'] = 'temp_uploads'
-app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'doc', 'docx'}
+app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'doc', 'docx', 'txt'}
+
+# Async serving mode (see asgi.py)
+app.config['ASYNC_MAX_CONCURRENCY'] = int(os.environ.get('ASYNC_MAX_CONCURRENCY', os.cpu_count() or 1))
+app.config['ASYNC_MAX_QUEUE'] = int(os.environ.get('ASYNC_MAX_QUEUE', 4 * app.config['ASYNC_MAX_CONCURRENCY']))
+app.config['ASYNC_RETRY_AFTER'] = int(os.environ.get('ASYNC_RETRY_AFTER', 1))
+
+# Weighted fair scheduling of parses (see utils/scheduler.py). Work is
+# scheduled per tenant: the TENANT_HEADER value, else the user_id form field.
+# Tenant limits and weights are given as "tenant=number,tenant=number".
+app.config['PARSE_MAX_CONCURRENCY'] = int(os.environ.get('PARSE_MAX_CONCURRENCY', os.cpu_count() or 1))
+app.config['PARSE_INTERACTIVE_WEIGHT'] = float(os.environ.get('PARSE_INTERACTIVE_WEIGHT', 4))
+app.config['PARSE_BULK_WEIGHT'] = float(os.environ.get('PARSE_BULK_WEIGHT', 1))
+app.config['PARSE_TENANT_MAX_CONCURRENCY'] = int(os.environ.get('PARSE_TENANT_MAX_CONCURRENCY', 0))  # 0: no cap
+app.config['PARSE_TENANT_LIMITS'] = parse_tenant_settings(os.environ.get('PARSE_TENANT_LIMITS'))
+app.config['PARSE_TENANT_WEIGHTS'] = parse_tenant_settings(os.environ.get('PARSE_TENANT_WEIGHTS'))
+app.config['PARSE_QUEUE_TIMEOUT'] = float(os.environ.get('PARSE_QUEUE_TIMEOUT', 60))  # 0 waits forever
+app.config['TENANT_HEADER'] = os.environ.get('TENANT_HEADER', 'X-Tenant-ID')
+
+# On-demand profiling (X-Profile: 1 or ?profile=1 with X-Admin-Token)
+app.config['PROFILE_ADMIN_TOKEN'] = os.environ.get('PROFILE_ADMIN_TOKEN')
+app.config['PROFILE_SAMPLE_RATE'] = int(os.environ.get('PROFILE_SAMPLE_RATE', 0))  # 1 in N, 0 disables
+app.config['PROFILE_DUMP_DIR'] = os.environ.get('PROFILE_DUMP_DIR', 'profiles')
+
+# Response compression (gzip, or zstd when zstandard is installed)
+app.config['COMPRESSION_MIN_SIZE'] = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+app.config['COMPRESSION_LEVEL'] = int(os.environ.get('COMPRESSION_LEVEL', 5))
+
+# Extraction guardrails (see utils/guardrails.py)
+app.config['EXTRACTION_MEMORY_HEADROOM_MB'] = int(os.environ.get('EXTRACTION_MEMORY_HEADROOM_MB', 1024))  # 0 disables
+app.config['MAX_EXTRACTED_CHARS'] = int(os.environ.get('MAX_EXTRACTED_CHARS', 200000))
+app.config['MAX_ZIP_RATIO'] = float(os.environ.get('MAX_ZIP_RATIO', 100))
+app.config['MAX_ZIP_ENTRY_BYTES'] = int(os.environ.get('MAX_ZIP_ENTRY_BYTES', 50 * 1024 * 1024))
+app.config['MAX_ZIP_TOTAL_BYTES'] = int(os.environ.get('MAX_ZIP_TOTAL_BYTES', 100 * 1024 * 1024))
+
+# Default PDF extraction profile: fast, balanced or accurate (overridable per request)
+app.config['PDF_EXTRACTION_PROFILE'] = os.environ.get('PDF_EXTRACTION_PROFILE', 'accurate')
+
+# Long PDFs are split into page ranges extracted by a process pool (fewer than 2 workers disables)
+app.config['PDF_PARALLEL_MIN_PAGES'] = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 8))
+app.config['PDF_PARALLEL_WORKERS'] = int(os.environ.get('PDF_PARALLEL_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Batch skill extraction (see parsers/skill_extractor.py): batches of at least
+# SKILLS_BATCH_PARALLEL_MIN texts are split over a process pool (fewer than 2
+# workers disables)
+app.config['SKILLS_BATCH_MAX_TEXTS'] = int(os.environ.get('SKILLS_BATCH_MAX_TEXTS', 1000))
+app.config['SKILLS_BATCH_PARALLEL_MIN'] = int(os.environ.get('SKILLS_BATCH_PARALLEL_MIN', 64))
+app.config['SKILLS_BATCH_WORKERS'] = int(os.environ.get('SKILLS_BATCH_WORKERS', min(4, os.cpu_count() or 1)))
+
+# DOCX body text past this many characters is not read (0 reads everything)
+app.config['DOCX_CHAR_BUDGET'] = int(os.environ.get('DOCX_CHAR_BUDGET', 0))
+
+# Persistent resume store with full-text search (see utils/resume_store.py).
+# Off unless a path is set: stored resumes hold contact details, and the
+# /api/resumes endpoints that return them are not authenticated
+app.config['RESUME_STORE_PATH'] = os.environ.get('RESUME_STORE_PATH', '')
+app.config['RESUME_STORE_CACHE_MB'] = int(os.environ.get('RESUME_STORE_CACHE_MB', 64))
+app.config['RESUME_STORE_MMAP_MB'] = int(os.environ.get('RESUME_STORE_MMAP_MB', 256))
+app.config['SEARCH_MAX_LIMIT'] = int(os.environ.get('SEARCH_MAX_LIMIT', 100))
+
+# Compiled job requirement profiles kept per worker (see utils/job_profiles.py)
+app.config['JOB_PROFILES_MAX'] = int(os.environ.get('JOB_PROFILES_MAX', 10000))
+
+# Semantic search over stored resumes (see utils/semantic.py): collections up
+# to SEMANTIC_EXACT_MAX are scored exhaustively, larger ones through an IVF
+# index probing SEMANTIC_IVF_PROBES clusters per query
+app.config['SEMANTIC_EXACT_MAX'] = int(os.environ.get('SEMANTIC_EXACT_MAX', 20000))
+app.config['SEMANTIC_IVF_PROBES'] = int(os.environ.get('SEMANTIC_IVF_PROBES', 8))
+
+# Facet counts over stored resumes (see utils/facets.py): most values a
+# facet query may return per facet
+app.config['FACETS_MAX_LIMIT'] = int(os.environ.get('FACETS_MAX_LIMIT', 1000))
 
 # Create necessary directories
 os.makedirs('logs', exist_ok=True)
@@ -39,14 +134,271 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # Initialize parsers and utilities
 resume_parser = ResumeParser()
-file_handler = FileHandler()
+file_handler = FileHandler(
+    max_text_chars=app.config['MAX_EXTRACTED_CHARS'],
+    memory_headroom_mb=app.config['EXTRACTION_MEMORY_HEADROOM_MB'],
+    max_zip_ratio=app.config['MAX_ZIP_RATIO'],
+    max_zip_entry_bytes=app.config['MAX_ZIP_ENTRY_BYTES'],
+    max_zip_total_bytes=app.config['MAX_ZIP_TOTAL_BYTES'],
+    pdf_profile=app.config['PDF_EXTRACTION_PROFILE'],
+    pdf_parallel_min_pages=app.config['PDF_PARALLEL_MIN_PAGES'],
+    pdf_parallel_workers=app.config['PDF_PARALLEL_WORKERS'],
+    docx_char_budget=app.config['DOCX_CHAR_BUDGET']
+)
 data_cleaner = DataCleaner()
+resume_pipeline = ResumePipeline(file_handler, resume_parser, data_cleaner)
+skill_batch_extractor = SkillBatchExtractor(
+    resume_parser.skill_extractor,
+    workers=app.config['SKILLS_BATCH_WORKERS'],
+    parallel_min_texts=app.config['SKILLS_BATCH_PARALLEL_MIN']
+)
+resume_store = None
+if app.config['RESUME_STORE_PATH']:
+    try:
+        resume_store = ResumeStore(
+            app.config['RESUME_STORE_PATH'],
+            cache_size_mb=app.config['RESUME_STORE_CACHE_MB'],
+            mmap_size_mb=app.config['RESUME_STORE_MMAP_MB']
+        )
+    except (sqlite3.Error, OSError) as e:
+        logger.error(f"Resume store disabled, could not open {app.config['RESUME_STORE_PATH']}: {str(e)}")
+job_profiles = JobProfileRegistry(app.config['JOB_PROFILES_MAX'], store=resume_store)
+parse_scheduler = FairScheduler(
+    app.config['PARSE_MAX_CONCURRENCY'],
+    lane_weights={INTERACTIVE: app.config['PARSE_INTERACTIVE_WEIGHT'], BULK: app.config['PARSE_BULK_WEIGHT']},
+    tenant_max_concurrency=app.config['PARSE_TENANT_MAX_CONCURRENCY'],
+    tenant_limits=app.config['PARSE_TENANT_LIMITS'],
+    tenant_weights=app.config['PARSE_TENANT_WEIGHTS'],
+    timeout=app.config['PARSE_QUEUE_TIMEOUT']
+)
+resume_vectors = None
+resume_facets = None
+if resume_store is not None:
+    resume_vectors = ResumeVectorIndex(
+        resume_store,
+        probes=app.config['SEMANTIC_IVF_PROBES'],
+        exact_max=app.config['SEMANTIC_EXACT_MAX']
+    )
+    resume_facets = ResumeFacetIndex(resume_store)
+request_profiler = RequestProfiler(
+    admin_token=app.config['PROFILE_ADMIN_TOKEN'],
+    sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+    dump_dir=app.config['PROFILE_DUMP_DIR']
+)
+
+def warm_parse(file_path):
+    """Run a sample file through the same steps as /api/parse-resume"""
+    cleaned_data, extracted_text, extraction = resume_pipeline.process(file_path)
+    result = {
+        'success': True,
+        'message': 'Resume parsed successfully',
+        'data': build_parse_data(
+            cleaned_data, extracted_text, os.path.basename(file_path), file_path, extraction=extraction,
+            extractor_versions=resume_parser.EXTRACTOR_VERSIONS
+        )
+    }
+    return encode_body(result, available_mimetypes()[0], app.json)
+
+# Readiness warm-up: run in the gunicorn master before forking (see
+# gunicorn.conf.py), otherwise started by the first readiness probe
+warmup = Warmup(warm_parse)
+
+REGISTRY.register(CallbackGauge(
+    'resume_parser_ready', 'Whether the warm-up has completed (1) or not (0)',
+    lambda: 1 if warmup.ready else 0
+))
+REGISTRY.register(CallbackGauge(
+    'resume_parser_warmup_seconds', 'Time the warm-up took to parse the bundled samples',
+    lambda: warmup.duration
+))
+REGISTRY.register(CallbackGauge(
+    'resume_parser_job_profiles_cached', 'Compiled job profiles held by this worker',
+    lambda: len(job_profiles)
+))
+REGISTRY.register(CallbackGauge(
+    'resume_parser_semantic_index_vectors', 'Resume vectors loaded in this worker\'s semantic index',
+    lambda: len(resume_vectors) if resume_vectors is not None else 0
+))
+REGISTRY.register(CallbackGauge(
+    'resume_parser_facet_index_candidates', 'Resumes loaded in this worker\'s facet index',
+    lambda: len(resume_facets) if resume_facets is not None else 0
+))
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+def save_upload(file):
+    """
+    Save an uploaded file under a unique temporary name
+    
+    Returns:
+    - Tuple of (secure original filename, temporary file path)
+    """
+    filename = secure_filename(file.filename)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    temp_filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{filename}"
+    temp_filepath = os.path.join(app.config['UPLOAD_FOLDER'], temp_filename)
+    
+    file.save(temp_filepath)
+    UPLOAD_SIZE_BYTES.observe(os.path.getsize(temp_filepath))
+    logger.info(f"File uploaded: {temp_filename}")
+    
+    return filename, temp_filepath
+
+def remove_upload(temp_filepath):
+    """Remove a temporary upload, ignoring errors"""
+    try:
+        os.remove(temp_filepath)
+        logger.info(f"Temporary file removed: {os.path.basename(temp_filepath)}")
+    except OSError:
+        pass
+
+def request_tenant(user_id=None):
+    """Tenant whose share of the parse slots a request uses"""
+    return request.headers.get(app.config['TENANT_HEADER']) or user_id or ''
+
+def store_parse_result(data, extracted_text, file_path):
+    """
+    Persist a parse result and add its resume_id to the response data
+    
+    A store failure is logged but does not fail the parse.
+    """
+    if resume_store is None:
+        return
+    
+    metadata = data['metadata']
+    try:
+        data['resume_id'] = resume_store.save(
+            file_hash(file_path), data['parsed_data'], extracted_text, metadata,
+            user_id=metadata.get('user_id'), job_id=metadata.get('job_id'), filename=metadata.get('filename'),
+            vector=EMBEDDER.embed_resume(data['parsed_data']).tobytes(), vector_model=EMBEDDER.model
+        )
+    except (sqlite3.Error, OSError) as e:
+        logger.error(f"Error storing parsed resume {metadata.get('filename')}: {str(e)}")
+
+def negotiated_response(payload, status=200):
+    """Encode a payload as JSON or MessagePack depending on the Accept header"""
+    mimetype = request.accept_mimetypes.best_match(available_mimetypes(), default='application/json')
+    body = encode_body(payload, mimetype, app.json)
+    return Response(body, status=status, mimetype=mimetype)
+
+def ndjson_response(items):
+    """Stream an iterable of dicts as newline-delimited JSON"""
+    def generate():
+        for item in items:
+            yield app.json.dumps(item) + '\n'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'}
+    )
+
+def profiled(view):
+    """
+    Run the view under the request profiler when asked to or when sampled
+    
+    Explicitly requested profiles are returned in the JSON response under
+    'profile'; sampled profiles are only written to PROFILE_DUMP_DIR.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        explicit = request_profiler.is_requested(request.headers, request.args)
+        
+        if explicit and not request_profiler.is_authorized(request.headers):
+            return jsonify({
+                'success': False,
+                'message': 'Profiling requires a valid admin token'
+            }), 403
+        
+        if not explicit and not request_profiler.should_sample():
+            return view(*args, **kwargs)
+        
+        rv, report, profile = request_profiler.profile(view, *args, **kwargs)
+        dump_path = request_profiler.dump(report, profile, request.path)
+        
+        if not explicit:
+            logger.info(f"Sampled profile for {request.path} written to {dump_path}")
+            return rv
+        
+        # Views may return (body, status) or (body, status, headers)
+        response = app.make_response(rv)
+        payload = response.get_json(silent=True)
+        if isinstance(payload, dict):
+            report['dump_path'] = dump_path
+            payload['profile'] = report
+            response.set_data(app.json.dumps(payload))
+        
+        return response
+    
+    return wrapper
+
+@app.before_request
+def track_request_start():
+    """Count the request as in flight and start collecting its stage timings"""
+    IN_FLIGHT_REQUESTS.inc()
+    g.in_flight = True
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    g.request_id_token = request_id_var.set(g.request_id)
+    g.started_at = time.perf_counter()
+    g.stages, g.stages_token = begin_stage_recording()
+
+@app.after_request
+def log_request(response):
+    """Write one structured record per request with its stage timings"""
+    response.headers['X-Request-ID'] = g.get('request_id', '')
+    
+    if 'started_at' in g:
+        logger.info('request completed', extra={
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - g.started_at) * 1000, 2),
+            'stages': {
+                name: round(stage['seconds'] * 1000, 2)
+                for name, stage in g.stages.items()
+            }
+        })
+    
+    return response
+
+@app.after_request
+def compress_response(response):
+    """Compress large buffered responses when the client accepts it"""
+    if (response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or not 200 <= response.status_code < 300):
+        return response
+    
+    body = response.get_data()
+    if len(body) < app.config['COMPRESSION_MIN_SIZE']:
+        return response
+    
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    
+    response.set_data(compress(body, encoding, app.config['COMPRESSION_LEVEL']))
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.teardown_request
+def track_request_end(error=None):
+    """Stop counting the request as in flight"""
+    # Runs twice for a streamed response (once more when the stream ends), so undo everything once
+    if g.pop('in_flight', False):
+        IN_FLIGHT_REQUESTS.dec()
+    if 'stages_token' in g:
+        end_stage_recording(g.pop('stages_token'))
+    if 'request_id_token' in g:
+        try:
+            request_id_var.reset(g.pop('request_id_token'))
+        except ValueError:
+            pass
+
 @app.route('/', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -57,15 +409,32 @@ def health_check():
         'timestamp': datetime.now().isoformat()
     }), 200
 
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness endpoint: 200 only once the parsing hot paths are warm"""
+    if not warmup.ready:
+        warmup.start()
+    
+    snapshot = warmup.snapshot()
+    return jsonify({
+        'status': 'ready' if warmup.ready else 'warming_up',
+        'warmup': snapshot
+    }), 200 if warmup.ready else 503
+
 @app.route('/api/parse-resume', methods=['POST'])
+@profiled
 def parse_resume():
     """
     Parse resume from uploaded file
     
     Expected form data:
-    - file: Resume file (PDF, DOC, DOCX)
+    - file: Resume file (PDF, DOC, DOCX, TXT)
     - user_id: User ID (optional)
     - job_id: Job ID for matching (optional)
+    - pdf_profile: PDF extraction profile, fast, balanced or accurate (optional)
+    
+    The parse runs in the interactive lane of the parse scheduler; an
+    X-Parse-Lane: bulk header moves it to the bulk lane.
     
     Returns:
     - Parsed resume data in structured format
@@ -73,6 +442,7 @@ def parse_resume():
     try:
         # Check if file is present
         if 'file' not in request.files:
+            FAILURES_TOTAL.inc(reason='no_file')
             return jsonify({
                 'success': False,
                 'message': 'No file provided'
@@ -81,9 +451,18 @@ def parse_resume():
         file = request.files['file']
         user_id = request.form.get('user_id')
         job_id = request.form.get('job_id')
+        pdf_profile = request.form.get('pdf_profile') or None
+        
+        if pdf_profile is not None and pdf_profile not in PDF_PROFILES:
+            FAILURES_TOTAL.inc(reason='invalid_profile')
+            return jsonify({
+                'success': False,
+                'message': f"Invalid pdf_profile. Expected one of: {', '.join(PDF_PROFILES)}"
+            }), 400
         
         # Check if file is selected
         if file.filename == '':
+            FAILURES_TOTAL.inc(reason='no_file')
             return jsonify({
                 'success': False,
                 'message': 'No file selected'
@@ -91,65 +470,60 @@ def parse_resume():
         
         # Check file extension
         if not allowed_file(file.filename):
+            FAILURES_TOTAL.inc(reason='invalid_format')
             return jsonify({
                 'success': False,
-                'message': 'Invalid file format. Only PDF, DOC, and DOCX are allowed.'
+                'message': 'Invalid file format. Only PDF, DOC, DOCX and TXT are allowed.'
             }), 400
         
         # Secure filename and save temporarily
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        temp_filename = f"{timestamp}_{filename}"
-        temp_filepath = os.path.join(app.config['UPLOAD_FOLDER'], temp_filename)
+        filename, temp_filepath = save_upload(file)
         
-        # Save uploaded file
-        file.save(temp_filepath)
-        logger.info(f"File uploaded: {temp_filename}")
+        lane = BULK if request.headers.get('X-Parse-Lane', '').lower() == BULK else INTERACTIVE
         
         try:
-            # Extract text from file
-            extracted_text = file_handler.extract_text(temp_filepath)
-            
-            if not extracted_text or len(extracted_text.strip()) < 50:
-                return jsonify({
-                    'success': False,
-                    'message': 'Could not extract sufficient text from the resume. Please ensure the file is not corrupted or password-protected.'
-                }), 400
-            
-            # Parse resume data
-            parsed_data = resume_parser.parse(extracted_text, temp_filepath)
-            
-            # Clean and validate data
-            cleaned_data = data_cleaner.clean_resume_data(parsed_data)
+            # Extract, parse and clean
+            with parse_scheduler.slot(request_tenant(user_id), lane):
+                cleaned_data, extracted_text, extraction = resume_pipeline.process(temp_filepath, pdf_profile)
             
             # Add metadata
             result = {
                 'success': True,
                 'message': 'Resume parsed successfully',
-                'data': {
-                    'parsed_data': cleaned_data,
-                    'metadata': {
-                        'filename': filename,
-                        'file_size': os.path.getsize(temp_filepath),
-                        'processed_at': datetime.now().isoformat(),
-                        'text_length': len(extracted_text),
-                        'user_id': user_id,
-                        'job_id': job_id
-                    },
-                    'parsing_stats': {
-                        'skills_found': len(cleaned_data.get('skills', [])),
-                        'experience_entries': len(cleaned_data.get('experience', [])),
-                        'education_entries': len(cleaned_data.get('education', [])),
-                        'certifications_found': len(cleaned_data.get('certifications', [])),
-                        'languages_found': len(cleaned_data.get('languages', []))
-                    }
-                }
+                'data': build_parse_data(
+                    cleaned_data, extracted_text, filename, temp_filepath, user_id, job_id, extraction,
+                    resume_parser.EXTRACTOR_VERSIONS
+                )
             }
+            store_parse_result(result['data'], extracted_text, temp_filepath)
             
             logger.info(f"Resume parsed successfully for user: {user_id}, file: {filename}")
-            return jsonify(result), 200
+            return negotiated_response(result, 200)
+            
+        except InsufficientTextError as text_error:
+            FAILURES_TOTAL.inc(reason='insufficient_text')
+            return jsonify({
+                'success': False,
+                'message': str(text_error)
+            }), 400
+            
+        except DocumentRejectedError as rejected:
+            FAILURES_TOTAL.inc(reason=rejected.code)
+            return jsonify({
+                'success': False,
+                'error_code': rejected.code,
+                'message': str(rejected)
+            }), 422
+            
+        except SchedulerTimeoutError as timeout:
+            FAILURES_TOTAL.inc(reason='queue_timeout')
+            return jsonify({
+                'success': False,
+                'message': f'Server is busy. Please retry later. {str(timeout)}'
+            }), 503, {'Retry-After': str(app.config['ASYNC_RETRY_AFTER'])}
             
         except Exception as parsing_error:
+            FAILURES_TOTAL.inc(reason='parse_error')
             logger.error(f"Error parsing resume: {str(parsing_error)}")
             return jsonify({
                 'success': False,
@@ -158,13 +532,10 @@ def parse_resume():
             
         finally:
             # Clean up temporary file
-            try:
-                os.remove(temp_filepath)
-                logger.info(f"Temporary file removed: {temp_filename}")
-            except:
-                pass
+            remove_upload(temp_filepath)
                 
     except Exception as error:
+        FAILURES_TOTAL.inc(reason='internal_error')
         logger.error(f"Unexpected error in parse_resume: {str(error)}")
         return jsonify({
             'success': False,
@@ -172,13 +543,15 @@ def parse_resume():
         }), 500
 
 @app.route('/api/match-job', methods=['POST'])
+@profiled
 def match_job():
     """
     Match resume data with job requirements
     
     Expected JSON payload:
     - resume_data: Parsed resume data
-    - job_requirements: Job requirements and skills
+    - job_requirements: Job requirements and skills, or
+    - job_id: Job whose requirements were registered with PUT /api/jobs/<job_id>/requirements
     
     Returns:
     - Matching score and detailed breakdown
@@ -186,33 +559,287 @@ def match_job():
     try:
         data = request.get_json()
         
-        if not data or 'resume_data' not in data or 'job_requirements' not in data:
+        if not data or 'resume_data' not in data or ('job_requirements' not in data and 'job_id' not in data):
+            FAILURES_TOTAL.inc(reason='invalid_payload')
             return jsonify({
                 'success': False,
-                'message': 'Missing resume_data or job_requirements in request'
+                'message': 'Missing resume_data, or job_requirements or job_id, in request'
             }), 400
         
         resume_data = data['resume_data']
-        job_requirements = data['job_requirements']
         
-        # Calculate matching score
-        matching_result = resume_parser.calculate_job_match(resume_data, job_requirements)
+        if 'job_id' in data:
+            profile = job_profiles.get(str(data['job_id']))
+            if profile is None:
+                return unknown_job(data['job_id'])
+            
+            with MATCH_SECONDS.time():
+                matching_result = resume_parser.match_job_profile(resume_data, profile)
+            matching_result.update({'job_id': profile.job_id, 'job_version': profile.version})
+        else:
+            # Calculate matching score
+            with MATCH_SECONDS.time():
+                matching_result = resume_parser.calculate_job_match(resume_data, data['job_requirements'])
         
         logger.info(f"Job matching calculated with score: {matching_result.get('overall_score', 0)}")
         
-        return jsonify({
+        return negotiated_response({
             'success': True,
             'message': 'Job matching completed',
             'data': matching_result
-        }), 200
+        }, 200)
         
     except Exception as error:
+        FAILURES_TOTAL.inc(reason='match_error')
         logger.error(f"Error in job matching: {str(error)}")
         return jsonify({
             'success': False,
             'message': f'Error calculating job match: {str(error)}'
         }), 500
 
+def parse_upload_item(index, file, user_id=None, job_id=None, pdf_profile=None, tenant=''):
+    """Parse one file of a multi-file upload into a stream item, in the bulk lane"""
+    item = {'index': index, 'filename': file.filename}
+    
+    if file.filename == '' or not allowed_file(file.filename):
+        FAILURES_TOTAL.inc(reason='invalid_format')
+        item.update({
+            'success': False,
+            'message': 'Invalid file format. Only PDF, DOC, DOCX and TXT are allowed.'
+        })
+        return item
+    
+    filename, temp_filepath = save_upload(file)
+    
+    try:
+        with parse_scheduler.slot(tenant, BULK):
+            cleaned_data, extracted_text, extraction = resume_pipeline.process(temp_filepath, pdf_profile)
+        item.update({
+            'success': True,
+            'data': build_parse_data(
+                cleaned_data, extracted_text, filename, temp_filepath, user_id, job_id, extraction,
+                resume_parser.EXTRACTOR_VERSIONS
+            )
+        })
+        store_parse_result(item['data'], extracted_text, temp_filepath)
+        
+    except InsufficientTextError as text_error:
+        FAILURES_TOTAL.inc(reason='insufficient_text')
+        item.update({'success': False, 'message': str(text_error)})
+        
+    except DocumentRejectedError as rejected:
+        FAILURES_TOTAL.inc(reason=rejected.code)
+        item.update({'success': False, 'error_code': rejected.code, 'message': str(rejected)})
+        
+    except SchedulerTimeoutError as timeout:
+        FAILURES_TOTAL.inc(reason='queue_timeout')
+        item.update({'success': False, 'message': str(timeout)})
+        
+    except Exception as parsing_error:
+        FAILURES_TOTAL.inc(reason='parse_error')
+        logger.error(f"Error parsing resume {filename}: {str(parsing_error)}")
+        item.update({'success': False, 'message': f'Error parsing resume: {str(parsing_error)}'})
+        
+    finally:
+        remove_upload(temp_filepath)
+    
+    return item
+
+@app.route('/api/parse-resumes', methods=['POST'])
+def parse_resumes():
+    """
+    Parse several resumes, streaming each result as soon as it is ready
+    
+    Expected form data:
+    - files: Resume files (PDF, DOC, DOCX, TXT), one form field per file
+    - user_id: User ID (optional)
+    - job_id: Job ID for matching (optional)
+    - pdf_profile: PDF extraction profile, fast, balanced or accurate (optional)
+    
+    Each file is parsed in the bulk lane of the parse scheduler, so
+    interactive uploads are served between the files of a large import.
+    
+    Returns:
+    - application/x-ndjson stream with one object per file, in upload order
+    """
+    files = request.files.getlist('files')
+    
+    if not files:
+        FAILURES_TOTAL.inc(reason='no_file')
+        return jsonify({
+            'success': False,
+            'message': 'No files provided'
+        }), 400
+    
+    user_id = request.form.get('user_id')
+    job_id = request.form.get('job_id')
+    pdf_profile = request.form.get('pdf_profile') or None
+    
+    if pdf_profile is not None and pdf_profile not in PDF_PROFILES:
+        FAILURES_TOTAL.inc(reason='invalid_profile')
+        return jsonify({
+            'success': False,
+            'message': f"Invalid pdf_profile. Expected one of: {', '.join(PDF_PROFILES)}"
+        }), 400
+    
+    tenant = request_tenant(user_id)
+    
+    def results():
+        for index, file in enumerate(files):
+            yield parse_upload_item(index, file, user_id, job_id, pdf_profile, tenant)
+    
+    return ndjson_response(results())
+
+@app.route('/api/match-jobs', methods=['POST'])
+def match_jobs():
+    """
+    Match in bulk, streaming each result as soon as it is ready
+    
+    Expected JSON payload, either:
+    - job_requirements (or job_id) + resumes: one job against a list of parsed resumes
+    - resume_data + jobs: one parsed resume against a list of job requirements
+    - resume_data + job_ids: one parsed resume against a list of registered jobs
+    
+    Returns:
+    - application/x-ndjson stream with one object per list item, in order
+    """
+    data = request.get_json(silent=True) or {}
+    
+    if isinstance(data.get('resumes'), list) and ('job_requirements' in data or 'job_id' in data):
+        if 'job_id' in data:
+            job = job_profiles.get(str(data['job_id']))
+            if job is None:
+                return unknown_job(data['job_id'])
+        else:
+            # Compile once for the whole list; malformed requirements fail per item as before
+            try:
+                job = compile_job_requirements(data['job_requirements'])
+            except InvalidJobRequirementsError:
+                job = data['job_requirements']
+        pairs = ((resume_data, job, None) for resume_data in data['resumes'])
+    elif isinstance(data.get('jobs'), list) and 'resume_data' in data:
+        resume_data = data['resume_data']
+        resume_vector = EMBEDDER.embed_resume(resume_data) if isinstance(resume_data, dict) else None
+        pairs = ((resume_data, job_requirements, resume_vector) for job_requirements in data['jobs'])
+    elif isinstance(data.get('job_ids'), list) and 'resume_data' in data:
+        resume_data = data['resume_data']
+        resume_vector = EMBEDDER.embed_resume(resume_data) if isinstance(resume_data, dict) else None
+        pairs = ((resume_data, str(job_id), resume_vector) for job_id in data['job_ids'])
+    else:
+        FAILURES_TOTAL.inc(reason='invalid_payload')
+        return jsonify({
+            'success': False,
+            'message': 'Expected job_requirements or job_id with a resumes list, '
+                       'or resume_data with a jobs or job_ids list'
+        }), 400
+    
+    def results():
+        for index, (resume_data, job, resume_vector) in enumerate(pairs):
+            try:
+                if isinstance(job, str):
+                    profile = job_profiles.get(job)
+                    if profile is None:
+                        FAILURES_TOTAL.inc(reason='unknown_job')
+                        yield {'index': index, 'success': False, 'message': f'Job {job} has no registered requirements'}
+                        continue
+                    job = profile
+                
+                with MATCH_SECONDS.time():
+                    if isinstance(job, JobProfile):
+                        matching_result = resume_parser.match_job_profile(resume_data, job, resume_vector)
+                    else:
+                        matching_result = resume_parser.calculate_job_match(resume_data, job, resume_vector)
+                if isinstance(job, JobProfile) and job.job_id is not None:
+                    matching_result.update({'job_id': job.job_id, 'job_version': job.version})
+                yield {'index': index, 'success': True, 'data': matching_result}
+            except Exception as error:
+                FAILURES_TOTAL.inc(reason='match_error')
+                yield {'index': index, 'success': False, 'message': f'Error calculating job match: {str(error)}'}
+    
+    return ndjson_response(results())
+
+def unknown_job(job_id):
+    FAILURES_TOTAL.inc(reason='unknown_job')
+    return jsonify({
+        'success': False,
+        'message': f'Job {job_id} has no registered requirements'
+    }), 404
+
+@app.route('/api/jobs/<job_id>/requirements', methods=['PUT'])
+def register_job_requirements(job_id):
+    """
+    Register or replace a job's requirements, so matches can refer to its job_id
+    
+    Expected JSON payload:
+    - job_requirements: required_skills, min_experience and education_required
+    - version: Version of the requirements (optional; must be newer than the
+      registered one, defaults to the registered version plus one)
+    
+    Returns:
+    - The compiled profile with its version (409 if the version is stale)
+    """
+    data = request.get_json(silent=True) or {}
+    version = data.get('version')
+    
+    if 'job_requirements' not in data or (
+            version is not None and (isinstance(version, bool) or not isinstance(version, int) or version < 1)):
+        FAILURES_TOTAL.inc(reason='invalid_payload')
+        return jsonify({
+            'success': False,
+            'message': 'Expected job_requirements and an optional positive integer version'
+        }), 400
+    
+    try:
+        profile = job_profiles.register(job_id, data['job_requirements'], version)
+        
+    except StaleVersionError as stale:
+        FAILURES_TOTAL.inc(reason='stale_version')
+        return jsonify({
+            'success': False,
+            'message': str(stale),
+            'current_version': stale.current_version
+        }), 409
+        
+    except InvalidJobRequirementsError as error:
+        FAILURES_TOTAL.inc(reason='invalid_payload')
+        return jsonify({
+            'success': False,
+            'message': f'Invalid job requirements: {str(error)}'
+        }), 400
+        
+    except sqlite3.Error as error:
+        FAILURES_TOTAL.inc(reason='store_error')
+        logger.error(f"Error registering job {job_id}: {str(error)}")
+        return jsonify({
+            'success': False,
+            'message': f'Error registering job requirements: {str(error)}'
+        }), 500
+    
+    logger.info(f"Job requirements registered for job {job_id} (version {profile.version})")
+    return jsonify({
+        'success': True,
+        'message': 'Job requirements registered',
+        'data': profile.to_dict()
+    }), 200
+
+@app.route('/api/jobs/<job_id>/requirements', methods=['GET'])
+def get_job_requirements(job_id):
+    """Get a job's registered requirements as compiled for matching"""
+    try:
+        profile = job_profiles.get(job_id)
+    except sqlite3.Error as error:
+        FAILURES_TOTAL.inc(reason='store_error')
+        logger.error(f"Error reading job {job_id}: {str(error)}")
+        return jsonify({
+            'success': False,
+            'message': f'Error reading job requirements: {str(error)}'
+        }), 500
+    
+    if profile is None:
+        return unknown_job(job_id)
+    
+    return jsonify({'success': True, 'data': profile.to_dict()}), 200
+
 @app.route('/api/extract-skills', methods=['POST'])
 def extract_skills():
     """
@@ -228,6 +855,7 @@ def extract_skills():
         data = request.get_json()
         
         if not data or 'text' not in data:
+            FAILURES_TOTAL.inc(reason='invalid_payload')
             return jsonify({
                 'success': False,
                 'message': 'Missing text in request'
@@ -248,12 +876,437 @@ def extract_skills():
         }), 200
         
     except Exception as error:
+        FAILURES_TOTAL.inc(reason='extract_error')
         logger.error(f"Error extracting skills: {str(error)}")
         return jsonify({
             'success': False,
             'message': f'Error extracting skills: {str(error)}'
         }), 500
 
+@app.route('/api/extract-skills/batch', methods=['POST'])
+def extract_skills_batch():
+    """
+    Extract skills from many texts, e.g. job descriptions posted in bulk
+    
+    Expected JSON payload:
+    - texts: List of texts (at most SKILLS_BATCH_MAX_TEXTS)
+    - frequencies: Whether to return the batch's skill frequency table (default true)
+    
+    Returns:
+    - results: Per text, in order, its skills and their canonical skill_ids
+    - frequencies: skill_id, skill and the number of texts mentioning it, most frequent first
+    """
+    try:
+        data = request.get_json(silent=True)
+        texts = data.get('texts') if isinstance(data, dict) else None
+        
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            FAILURES_TOTAL.inc(reason='invalid_payload')
+            return jsonify({
+                'success': False,
+                'message': 'texts must be a list of strings'
+            }), 400
+        
+        if len(texts) > app.config['SKILLS_BATCH_MAX_TEXTS']:
+            FAILURES_TOTAL.inc(reason='invalid_payload')
+            return jsonify({
+                'success': False,
+                'message': f"At most {app.config['SKILLS_BATCH_MAX_TEXTS']} texts per batch"
+            }), 400
+        
+        results = skill_batch_extractor.extract(texts)
+        
+        payload = {
+            'results': [
+                {
+                    'skills': [skill for skill, _ in skills],
+                    'skill_ids': [skill_id for _, skill_id in skills],
+                    'count': len(skills)
+                }
+                for skills in results
+            ],
+            'count': len(results)
+        }
+        if data.get('frequencies', True):
+            payload['frequencies'] = skill_frequencies(results)
+        
+        return negotiated_response({
+            'success': True,
+            'message': 'Skills extracted successfully',
+            'data': payload
+        }, 200)
+        
+    except Exception as error:
+        FAILURES_TOTAL.inc(reason='extract_error')
+        logger.error(f"Error extracting skills from batch: {str(error)}")
+        return jsonify({
+            'success': False,
+            'message': f'Error extracting skills: {str(error)}'
+        }), 500
+
+@app.route('/api/quality-report', methods=['POST'])
+def quality_report():
+    """
+    Score data quality across many parsed resumes
+    
+    Expected JSON payload:
+    - resumes: List of parsed resumes, each either cleaned resume data or a
+      parse result with parsed_data (and optionally metadata.filename or id)
+    - worst: Number of lowest-scoring resumes to return, 0 to SEARCH_MAX_LIMIT
+      (default: 10)
+    
+    Returns:
+    - Score distributions, quality levels, per-field fill rates and the
+      worst-scoring resumes
+    """
+    data = request.get_json(silent=True) or {}
+    resumes = data.get('resumes')
+    
+    if not isinstance(resumes, list):
+        FAILURES_TOTAL.inc(reason='invalid_payload')
+        return jsonify({
+            'success': False,
+            'message': 'Missing resumes list in request'
+        }), 400
+    
+    worst = data.get('worst', 10)
+    if isinstance(worst, bool) or not isinstance(worst, int) or not 0 <= worst <= app.config['SEARCH_MAX_LIMIT']:
+        FAILURES_TOTAL.inc(reason='invalid_payload')
+        return jsonify({
+            'success': False,
+            'message': f"worst must be between 0 and {app.config['SEARCH_MAX_LIMIT']}"
+        }), 400
+    
+    def documents():
+        for index, item in enumerate(resumes):
+            if isinstance(item, dict) and 'parsed_data' in item:
+                document_id = item.get('id') or (item.get('metadata') or {}).get('filename') or index
+                yield document_id, item['parsed_data']
+            else:
+                yield index, item
+    
+    try:
+        report = data_cleaner.get_quality_report(documents(), worst_n=worst)
+        
+        return negotiated_response({
+            'success': True,
+            'message': 'Quality report generated',
+            'data': report
+        }, 200)
+        
+    except Exception as error:
+        FAILURES_TOTAL.inc(reason='quality_error')
+        logger.error(f"Error generating quality report: {str(error)}")
+        return jsonify({
+            'success': False,
+            'message': f'Error generating quality report: {str(error)}'
+        }), 500
+
+def store_unavailable():
+    FAILURES_TOTAL.inc(reason='store_disabled')
+    return jsonify({
+        'success': False,
+        'message': 'Resume store is disabled (set RESUME_STORE_PATH to enable it)'
+    }), 503
+
+def paging_args():
+    """limit and offset query parameters, capped at SEARCH_MAX_LIMIT"""
+    limit = min(max(int(request.args.get('limit', 20)), 1), app.config['SEARCH_MAX_LIMIT'])
+    offset = max(int(request.args.get('offset', 0)), 0)
+    return limit, offset
+
+@app.route('/api/resumes/search', methods=['GET'])
+def search_resumes():
+    """
+    Full-text search over stored resumes
+    
+    Query parameters:
+    - q: Words (all must match), "quoted phrases" and prefixes such as pyth*
+    - user_id: Only search this user's resumes (optional)
+    - sort: relevance (default) or recent
+    - limit, offset: Paging (default: 20, 0)
+    
+    Returns:
+    - Matching resumes with a highlighted snippet and relevance score
+    """
+    if resume_store is None:
+        return store_unavailable()
+    
+    try:
+        limit, offset = paging_args()
+        results = resume_store.search(
+            request.args.get('q', ''), request.args.get('user_id'), limit, offset,
+            sort=request.args.get('sort', 'relevance')
+        )
+        
+        return negotiated_response({
+            'success': True,
+            'data': {
+                'results': results,
+                'count': len(results),
+                'limit': limit,
+                'offset': offset
+            }
+        }, 200)
+        
+    except ValueError as error:  # InvalidQueryError, or a malformed sort/limit/offset
+        FAILURES_TOTAL.inc(reason='invalid_query')
+        return jsonify({
+            'success': False,
+            'message': f'Invalid search request: {str(error)}'
+        }), 400
+        
+    except sqlite3.Error as error:
+        FAILURES_TOTAL.inc(reason='store_error')
+        logger.error(f"Error searching resumes: {str(error)}")
+        return jsonify({
+            'success': False,
+            'message': f'Error searching resumes: {str(error)}'
+        }), 500
+
+@app.route('/api/resumes/semantic-search', methods=['POST'])
+def semantic_search_resumes():
+    """
+    Stored resumes closest in meaning to a job or a text
+    
+    Expected JSON payload, one of:
+    - job_id: A job registered with PUT /api/jobs/<job_id>/requirements
+    - job_requirements: required_skills, title and description
+    - text: Free text
+    and optionally:
+    - user_id: Only search this user's resumes
+    - limit: Results to return (default: 20)
+    
+    Returns:
+    - Resumes with their semantic score (cosine similarity x100), best first
+    """
+    if resume_store is None:
+        return store_unavailable()
+    
+    data = request.get_json(silent=True) or {}
+    limit = data.get('limit', 20)
+    if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= app.config['SEARCH_MAX_LIMIT']:
+        FAILURES_TOTAL.inc(reason='invalid_query')
+        return jsonify({
+            'success': False,
+            'message': f"limit must be between 1 and {app.config['SEARCH_MAX_LIMIT']}"
+        }), 400
+    
+    try:
+        if 'job_id' in data:
+            profile = job_profiles.get(str(data['job_id']))
+            if profile is None:
+                return unknown_job(data['job_id'])
+            query = profile.embedding
+        elif 'job_requirements' in data:
+            query = compile_job_requirements(data['job_requirements']).embedding
+        elif isinstance(data.get('text'), str):
+            query = EMBEDDER.embed([data['text']]).tobytes()
+        else:
+            FAILURES_TOTAL.inc(reason='invalid_query')
+            return jsonify({
+                'success': False,
+                'message': 'Expected job_id, job_requirements or text'
+            }), 400
+        
+        if query is None:
+            FAILURES_TOTAL.inc(reason='invalid_query')
+            return jsonify({
+                'success': False,
+                'message': 'The job has no title, description or skills to search with'
+            }), 400
+        
+        user_id = data.get('user_id')
+        with MATCH_SECONDS.time():
+            matches, method = resume_vectors.search(
+                vector_from_bytes(query), limit, user_id=str(user_id) if user_id is not None else None
+            )
+        summaries = resume_store.summaries([resume_id for resume_id, _ in matches])
+        
+        results = []
+        for resume_id, score in matches:
+            if resume_id in summaries:
+                results.append(dict(summaries[resume_id], score=round(score * 100, 1)))
+        
+        return negotiated_response({
+            'success': True,
+            'data': {
+                'results': results,
+                'count': len(results),
+                'limit': limit,
+                'method': method
+            }
+        }, 200)
+        
+    except InvalidJobRequirementsError as error:
+        FAILURES_TOTAL.inc(reason='invalid_query')
+        return jsonify({
+            'success': False,
+            'message': f'Invalid job requirements: {str(error)}'
+        }), 400
+        
+    except sqlite3.Error as error:
+        FAILURES_TOTAL.inc(reason='store_error')
+        logger.error(f"Error in semantic search: {str(error)}")
+        return jsonify({
+            'success': False,
+            'message': f'Error searching resumes: {str(error)}'
+        }), 500
+
+@app.route('/api/resumes/facets', methods=['POST'])
+def resume_facets_query():
+    """
+    Facet counts over the stored resumes, optionally filtered
+    
+    Expected JSON payload (all optional):
+    - filter: Filter expression over skill, experience, education,
+      certifications, language and user (see utils/facets.py), e.g.
+      {"and": [{"skill": "python"}, {"not": {"experience": "0-1"}}]}
+    - facets: Facets to count (default: all)
+    - limit: Values to return per facet, most frequent first (default: 20)
+    - results: Matching resumes to return, newest first (default: 0)
+    
+    Returns:
+    - total matching resumes, the indexed candidates, per facet the values
+      with their counts among the matching resumes, and the results asked for
+    """
+    if resume_store is None:
+        return store_unavailable()
+    
+    data = request.get_json(silent=True) or {}
+    limit = data.get('limit', 20)
+    if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= app.config['FACETS_MAX_LIMIT']:
+        FAILURES_TOTAL.inc(reason='invalid_query')
+        return jsonify({
+            'success': False,
+            'message': f"limit must be between 1 and {app.config['FACETS_MAX_LIMIT']}"
+        }), 400
+    
+    results = data.get('results', 0)
+    if isinstance(results, bool) or not isinstance(results, int) or not 0 <= results <= app.config['SEARCH_MAX_LIMIT']:
+        FAILURES_TOTAL.inc(reason='invalid_query')
+        return jsonify({
+            'success': False,
+            'message': f"results must be between 0 and {app.config['SEARCH_MAX_LIMIT']}"
+        }), 400
+    
+    facets = data.get('facets')
+    if facets is not None and (not isinstance(facets, list) or not all(isinstance(facet, str) for facet in facets)):
+        FAILURES_TOTAL.inc(reason='invalid_query')
+        return jsonify({
+            'success': False,
+            'message': 'facets must be a list of facet names'
+        }), 400
+    
+    try:
+        counts = resume_facets.query(data.get('filter'), facets, limit, ids=results)
+        
+        response = {
+            'total': counts['total'],
+            'candidates': counts['candidates'],
+            'facets': counts['facets'],
+            'limit': limit
+        }
+        if results:
+            summaries = resume_store.summaries(counts['resume_ids'])
+            response['results'] = [
+                summaries[resume_id] for resume_id in counts['resume_ids'] if resume_id in summaries
+            ]
+        
+        return negotiated_response({
+            'success': True,
+            'data': response
+        }, 200)
+        
+    except InvalidFacetQueryError as error:
+        FAILURES_TOTAL.inc(reason='invalid_query')
+        return jsonify({
+            'success': False,
+            'message': f'Invalid facet query: {str(error)}'
+        }), 400
+        
+    except sqlite3.Error as error:
+        FAILURES_TOTAL.inc(reason='store_error')
+        logger.error(f"Error counting resume facets: {str(error)}")
+        return jsonify({
+            'success': False,
+            'message': f'Error counting resume facets: {str(error)}'
+        }), 500
+
+@app.route('/api/resumes', methods=['GET'])
+def list_resumes():
+    """
+    Look up stored resumes by user or file hash
+    
+    Query parameters (one of):
+    - user_id: The user's resumes, newest first (with limit, offset)
+    - resume_hash: Resumes stored for a file's SHA-256 (optionally with user_id)
+    """
+    if resume_store is None:
+        return store_unavailable()
+    
+    user_id = request.args.get('user_id')
+    resume_hash = request.args.get('resume_hash')
+    
+    try:
+        if resume_hash:
+            results = resume_store.find_by_hash(resume_hash, user_id)
+        elif user_id:
+            results = resume_store.find_by_user(user_id, *paging_args())
+        else:
+            FAILURES_TOTAL.inc(reason='invalid_query')
+            return jsonify({
+                'success': False,
+                'message': 'Expected a user_id or resume_hash query parameter'
+            }), 400
+        
+        return negotiated_response({
+            'success': True,
+            'data': {
+                'results': results,
+                'count': len(results)
+            }
+        }, 200)
+        
+    except ValueError as error:
+        FAILURES_TOTAL.inc(reason='invalid_query')
+        return jsonify({
+            'success': False,
+            'message': f'Invalid lookup request: {str(error)}'
+        }), 400
+        
+    except sqlite3.Error as error:
+        FAILURES_TOTAL.inc(reason='store_error')
+        logger.error(f"Error looking up resumes: {str(error)}")
+        return jsonify({
+            'success': False,
+            'message': f'Error looking up resumes: {str(error)}'
+        }), 500
+
+@app.route('/api/resumes/<int:resume_id>', methods=['GET'])
+def get_resume(resume_id):
+    """Get a stored resume with its parsed data, extracted text and metadata"""
+    if resume_store is None:
+        return store_unavailable()
+    
+    try:
+        resume = resume_store.get(resume_id)
+    except sqlite3.Error as error:
+        FAILURES_TOTAL.inc(reason='store_error')
+        logger.error(f"Error reading resume {resume_id}: {str(error)}")
+        return jsonify({
+            'success': False,
+            'message': f'Error reading resume: {str(error)}'
+        }), 500
+    
+    if resume is None:
+        return jsonify({
+            'success': False,
+            'message': 'Resume not found'
+        }), 404
+    
+    return negotiated_response({'success': True, 'data': resume}, 200)
+
 @app.route('/api/supported-formats', methods=['GET'])
 def supported_formats():
     """Get supported file formats"""
@@ -262,6 +1315,8 @@ def supported_formats():
         'data': {
             'formats': list(app.config['ALLOWED_EXTENSIONS']),
             'max_size': '10MB',
+            'pdf_profiles': list(PDF_PROFILES),
+            'default_pdf_profile': file_handler.pdf_profile,
             'recommendations': [
                 'PDF files provide the best parsing accuracy',
                 'Ensure text is selectable (not scanned images)',
@@ -271,9 +1326,29 @@ def supported_formats():
         }
     }), 200
 
+@app.route('/api/serving-stats', methods=['GET'])
+def serving_stats():
+    """Get admission queue depth for the async serving mode, and parse scheduler lanes"""
+    admission = app.extensions.get('admission')
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'mode': 'asgi' if admission else 'wsgi',
+            'admission': admission.snapshot() if admission else None,
+            'scheduler': parse_scheduler.snapshot()
+        }
+    }), 200
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Expose metrics in the Prometheus text format"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.errorhandler(413)
 def file_too_large(error):
     """Handle file too large error"""
+    FAILURES_TOTAL.inc(reason='file_too_large')
     return jsonify({
         'success': False,
         'message': 'File too large. Maximum size allowed is 10MB.'
@@ -320,5 +1395,7 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8000))
     debug = os.environ.get('FLASK_ENV') == 'development'
     
+    warmup.start()
+    
     logger.info(f"Starting Resume Parser Service on port {port}")
     app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
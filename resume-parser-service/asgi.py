@@ -0,0 +1,255 @@
+"""
+ASGI entry point for the Resume Parser Service
+
+Run with an ASGI server, for example:
+
+    uvicorn asgi:application --host 0.0.0.0 --port 8000 --workers 4
+
+The event loop only receives request bodies and sends responses. The Flask
+application itself runs on a bounded thread pool, and an admission limit
+answers 429 with ``Retry-After`` once the pending-work queue is full. Health
+checks and metrics skip admission and run on a small pool of their own, so
+they are answered while every parse slot is busy.
+"""
+import asyncio
+import io
+import json
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from app import app
+from utils.admission import AdmissionController
+from utils.metrics import REGISTRY, CallbackGauge
+
+logger = logging.getLogger(__name__)
+
+# Returned by _read_body() when the client disconnects before the body is complete
+DISCONNECTED = object()
+
+
+class AsyncServingApp:
+    """Serve a WSGI application over ASGI with bounded concurrency"""
+
+    def __init__(self, wsgi_app, controller: AdmissionController, max_body_size: int,
+                 exempt_paths=(), exempt_workers: int = 2):
+        self.wsgi_app = wsgi_app
+        self.controller = controller
+        self.max_body_size = max_body_size
+        self.exempt_paths = set(exempt_paths)
+        self.executor = ThreadPoolExecutor(
+            max_workers=controller.max_concurrency,
+            thread_name_prefix='parser-worker'
+        )
+        self.exempt_executor = ThreadPoolExecutor(
+            max_workers=exempt_workers,
+            thread_name_prefix='probe-worker'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+
+        if scope['type'] != 'http':
+            return
+
+        exempt = scope['path'] in self.exempt_paths
+
+        if not exempt and not self.controller.try_enter():
+            await self._send_json(send, 429, {
+                'success': False,
+                'message': 'Server is busy. Please retry later.'
+            }, extra_headers=[(b'retry-after', str(self.controller.retry_after).encode('latin-1'))])
+            return
+
+        try:
+            body = await self._read_body(receive)
+            if body is DISCONNECTED:
+                return
+
+            if body is None:
+                await self._send_json(send, 413, {
+                    'success': False,
+                    'message': 'File too large. Maximum size allowed is 10MB.'
+                })
+                return
+
+            if exempt:
+                await self._dispatch(scope, body, send, self.exempt_executor)
+                return
+
+            await self.controller.acquire()
+            try:
+                await self._dispatch(scope, body, send, self.executor)
+            finally:
+                self.controller.release()
+
+        finally:
+            if not exempt:
+                self.controller.leave()
+
+    async def _lifespan(self, receive, send):
+        """Handle ASGI lifespan startup/shutdown events"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                logger.info(f"Async serving mode started (concurrency={self.controller.max_concurrency}, "
+                            f"queue={self.controller.max_queue})")
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                self.exempt_executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _read_body(self, receive):
+        """
+        Buffer the request body
+
+        Returns None once the body exceeds the size limit, and DISCONNECTED
+        if the client goes away before sending all of it.
+        """
+        buffer = io.BytesIO()
+        size = 0
+        more_body = True
+
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                # Nobody is left to answer; don't spend a parse slot on a partial upload
+                return DISCONNECTED
+
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > self.max_body_size:
+                return None
+
+            buffer.write(chunk)
+            more_body = message.get('more_body', False)
+
+        buffer.seek(0)
+        return buffer
+
+    async def _dispatch(self, scope, body, send, executor: ThreadPoolExecutor):
+        """Run the WSGI application for one request on the given executor"""
+        loop = asyncio.get_running_loop()
+        environ = self._build_environ(scope, body)
+        await loop.run_in_executor(executor, self._run_wsgi, environ, loop, send)
+
+    def _run_wsgi(self, environ, loop, send):
+        """
+        Call the WSGI application and relay its response
+
+        Runs on an executor thread. Every ASGI send is awaited before the next
+        chunk is produced, so slow clients apply backpressure to streaming
+        responses instead of growing an in-memory buffer.
+        """
+        response_start = {}
+
+        def start_response(status, headers, exc_info=None):
+            response_start['status'] = int(status.split(' ', 1)[0])
+            response_start['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+
+        def send_sync(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        started = False
+        result = self.wsgi_app(environ, start_response)
+
+        try:
+            for chunk in result:
+                if not chunk:
+                    continue
+                if not started:
+                    send_sync({'type': 'http.response.start', **response_start})
+                    started = True
+                send_sync({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+
+            if not started:
+                send_sync({'type': 'http.response.start', **response_start})
+            send_sync({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+        finally:
+            close = getattr(result, 'close', None)
+            if close:
+                close()
+
+    def _build_environ(self, scope, body) -> dict:
+        """Translate an ASGI HTTP scope into a WSGI environ"""
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': str(server[0]),
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False
+        }
+
+        for raw_name, raw_value in scope.get('headers', []):
+            name = raw_name.decode('latin-1').upper().replace('-', '_')
+            value = raw_value.decode('latin-1')
+
+            if name == 'CONTENT_TYPE' or name == 'CONTENT_LENGTH':
+                key = name
+            else:
+                key = f"HTTP_{name}"
+
+            if key in environ:
+                environ[key] = f"{environ[key]},{value}"
+            else:
+                environ[key] = value
+
+        return environ
+
+    async def _send_json(self, send, status: int, payload: dict, extra_headers=None):
+        """Send a small JSON response directly from the event loop"""
+        body = json.dumps(payload).encode('utf-8')
+        headers = [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('latin-1'))
+        ]
+        headers.extend(extra_headers or [])
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+admission_controller = AdmissionController(
+    max_concurrency=app.config['ASYNC_MAX_CONCURRENCY'],
+    max_queue=app.config['ASYNC_MAX_QUEUE'],
+    retry_after=app.config['ASYNC_RETRY_AFTER']
+)
+app.extensions['admission'] = admission_controller
+
+REGISTRY.register(CallbackGauge(
+    'resume_parser_admission_queue_depth', 'Requests admitted and waiting for an executor slot',
+    lambda: admission_controller.queued
+))
+REGISTRY.register(CallbackGauge(
+    'resume_parser_admission_active', 'Requests currently running on the executor',
+    lambda: admission_controller.snapshot()['active']
+))
+
+application = AsyncServingApp(
+    app,
+    admission_controller,
+    max_body_size=app.config['MAX_CONTENT_LENGTH'],
+    exempt_paths=['/', '/ready', '/api/serving-stats', '/metrics']
+)
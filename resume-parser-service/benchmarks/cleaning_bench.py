@@ -0,0 +1,119 @@
+"""
+Compare per-resume and batch cleaning of parsed resumes
+
+Runs DataCleaner.clean_resume_data over every resume (today's path) and
+DataCleaner.clean_resumes_batch over the whole set, checks that both give
+identical output, and reports the time per resume and the speedup.
+
+Usage (from resume-parser-service/):
+
+    python benchmarks/cleaning_bench.py [--sizes 1000 100000]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_cleaner import DataCleaner  # noqa: E402
+
+FIRST_NAMES = ['jane', 'JOHN', 'María', 'Dr. Wei', 'mr. ahmed', 'Zoë', 'o\'brien', 'Ana-Lucía']
+LAST_NAMES = ['doe', 'SMITH Jr.', 'García', 'Chen', 'Khan III', 'Müller', 'Nakamura', 'Okafor']
+SKILLS = [
+    'python', 'Java', 'experience with docker', 'knowledge of kubernetes', 'proficient in SQL',
+    'react', 'node.js', 'c++', 'c#', 'machine learning', 'aws', 'and', 'git', 'x', 'data-analysis',
+    'Experience in  Spark', 'project   management', 'tensorflow!', 'ci/cd', 'excel'
+]
+COMPANIES = ['at Acme Corp', 'Globex, Inc.', 'Initech LLC', 'Umbrella  Corporation', 'Soylent & Co', 'Stark Industries']
+POSITIONS = ['as a software engineer', 'Senior Data Analyst', 'as Lead Developer', 'product manager', 'INTERN']
+WORDS = (
+    'designed built led migrated optimized scalable distributed services team customers '
+    'python java react docker kubernetes aws pipelines latency throughput reliability '
+    'analytics dashboards stakeholders delivered reduced improved automated platform'
+).split()
+PUNCTUATION = ['', '.', ',', ';', '!', ' *', ' - ', ' (50%)', ' @scale', ' ->', '\t', '\n']
+
+
+def text(rng: random.Random, length: int) -> str:
+    return ''.join(rng.choice(WORDS) + rng.choice(PUNCTUATION) + ' ' for _ in range(length))
+
+
+def date(rng: random.Random):
+    return rng.choice([
+        f"{rng.randint(2000, 2023)}-{rng.randint(1, 12):02d}-01",
+        f"{rng.randint(2000, 2023)}-{rng.randint(1, 12):02d}-01",
+        'Present', None, ''
+    ])
+
+
+def parsed_resume(rng: random.Random) -> dict:
+    """Synthetic ResumeParser output"""
+    return {
+        'personal_info': {
+            'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'email': rng.choice(['Jane.Doe@Example.com ', 'bad-email', 'dev@corp.io']),
+            'phone': rng.choice(['+1 (555) 010-0100', '12345', '555.010.0199']),
+            'linkedin': rng.choice(['linkedin.com/in/someone', None])
+        },
+        'skills': rng.sample(SKILLS, rng.randint(0, 12)),
+        'experience': [{
+            'company': rng.choice(COMPANIES),
+            'position': rng.choice(POSITIONS),
+            # A missing start date makes the sort fail, as it does in production
+            'start_date': date(rng) if rng.random() < 0.2 else f"{rng.randint(2000, 2023)}-01-01",
+            'end_date': date(rng),
+            'is_current': rng.random() < 0.2,
+            'description': text(rng, rng.randint(10, 60))
+        } for _ in range(rng.randint(1, 4))],
+        'education': [{
+            'institution': rng.choice(['state university', 'MIT', 'Universität Wien']),
+            'degree': rng.choice(['b.s.', 'Master of Science', 'PhD']),
+            'field_of_study': rng.choice(['computer science', 'Mathematics', '']),
+            'start_date': None,
+            'end_date': date(rng)
+        } for _ in range(rng.randint(0, 2))],
+        'certifications': [{
+            'name': rng.choice(['aws certified solutions architect', 'PMP', 'cka']),
+            'issuer': rng.choice(['amazon', 'PMI', None]),
+            'issue_date': date(rng)
+        } for _ in range(rng.randint(0, 2))],
+        'languages': [{
+            'language': rng.choice(['english', 'Spanish', 'mandarin']),
+            'proficiency': rng.choice(['native', 'Advanced', 'fluent'])
+        } for _ in range(rng.randint(0, 2))],
+        'summary': rng.choice(['Summary: ', 'I am a ', 'Professional summary - ', '']) + text(rng, rng.randint(10, 40)),
+        'total_experience': round(rng.uniform(-1, 60), 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000], help='resumes per run')
+    args = parser.parse_args()
+
+    # Cleaning failures are logged per resume; keep them out of the timings
+    logging.disable(logging.ERROR)
+
+    cleaner = DataCleaner()
+    rng = random.Random(42)
+
+    print(f"{'resumes':>10}{'per-resume us':>16}{'batch us':>12}{'speedup':>10}  identical")
+    for size in args.sizes:
+        resumes = [parsed_resume(rng) for _ in range(size)]
+
+        started = time.perf_counter()
+        expected = [cleaner.clean_resume_data(resume) for resume in resumes]
+        single = (time.perf_counter() - started) / size
+
+        started = time.perf_counter()
+        actual = cleaner.clean_resumes_batch(resumes)
+        batch = (time.perf_counter() - started) / size
+
+        print(f"{size:>10}{single * 1e6:>16.1f}{batch * 1e6:>12.1f}{single / batch:>9.2f}x  {actual == expected}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""
+Concurrency stress test of the shared parsing core
+
+Builds one FileHandler, ResumeParser and DataCleaner, exactly as the app
+shares them between requests, and runs every input file through the
+pipeline once serially to record the expected output. It then runs
+thousands of parses of the same files from a thread pool, with a short
+thread switch interval to force interleaving, and checks every result
+(or error) against the serial one. Exits with status 1 on any mismatch.
+
+Inputs are the resumes in --input plus --synthetic generated text
+resumes, written in a mix of encodings. The defaults are small enough to
+run as a check (tests/test_concurrency_stress.py runs the synthetic corpus
+alone); raise --parses and --synthetic for a real stress run.
+
+Usage (from resume-parser-service/):
+
+    python benchmarks/concurrency_stress.py [--parses 400] [--threads 8] [--input samples/]
+    python benchmarks/concurrency_stress.py --input '' --synthetic 500 --parses 20000
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers.resume_parser import ResumeParser  # noqa: E402
+from utils.data_cleaner import DataCleaner  # noqa: E402
+from utils.file_handler import FileHandler  # noqa: E402
+from utils.pipeline import ResumePipeline  # noqa: E402
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'samples')
+ENCODINGS = ('utf-8', 'utf-8-sig', 'utf-16', 'cp1252')
+
+NAMES = ['Jane Doe', 'John Smith', 'María García', 'Wei Chen', 'Ahmed Khan', 'Zoë Müller']
+SKILLS = [
+    'Python', 'Java', 'SQL', 'Docker', 'Kubernetes', 'AWS', 'React', 'Node.js', 'C++', 'C#',
+    'Machine Learning', 'Git', 'Agile', 'TensorFlow', 'PostgreSQL', 'Terraform', 'Scrum'
+]
+POSITIONS = ['Senior Software Engineer', 'Data Analyst', 'Lead Developer', 'Product Manager', 'Intern']
+COMPANIES = ['Acme Corp', 'Globex Inc', 'Initech LLC', 'Umbrella Corporation', 'Stark Industries']
+DEGREES = ['Bachelor of Science in Computer Science', 'Master of Science in Mathematics', 'B.S. in Physics']
+LANGUAGES = ['English - Native', 'Spanish - Fluent', 'German - Basic', 'French - Conversational']
+
+
+def resume_text(rng: random.Random) -> str:
+    """A synthetic plain text resume"""
+    name = rng.choice(NAMES)
+    user = name.split()[0].lower()
+    lines = [
+        name,
+        f"{user}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        f"linkedin.com/in/{user}{rng.randint(1, 99)}",
+        '',
+        'SUMMARY',
+        f"Engineer with {rng.randint(1, 20)} years of experience building services and data pipelines.",
+        '',
+        'SKILLS',
+        ', '.join(rng.sample(SKILLS, rng.randint(3, 10))),
+        '',
+        'EXPERIENCE'
+    ]
+    year = rng.randint(2000, 2015)
+    for _ in range(rng.randint(1, 4)):
+        end = year + rng.randint(1, 4)
+        lines.append(f"{rng.choice(POSITIONS)} at {rng.choice(COMPANIES)} {year} - {end}")
+        lines.append('Designed and shipped features, reduced latency and mentored engineers.')
+        year = end
+    lines += ['', 'EDUCATION', f"{rng.choice(DEGREES)}, State University {rng.randint(1995, 2012)}"]
+    lines += ['', 'CERTIFICATIONS', f"AWS Certified Solutions Architect {rng.randint(2015, 2023)}"]
+    lines += ['', 'LANGUAGES'] + rng.sample(LANGUAGES, rng.randint(1, 3))
+    return '\n'.join(lines) + '\n'
+
+
+def outcome(pipeline: ResumePipeline, path: str) -> str:
+    """Canonical form of a parse result, or of the error it raised"""
+    try:
+        cleaned_data, extracted_text, extraction = pipeline.process(path)
+        return json.dumps([cleaned_data, extracted_text, extraction], sort_keys=True, default=str)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def run(input_dir: Optional[str] = SAMPLES_DIR, synthetic: int = 40, parses: int = 400, threads: int = 8,
+        switch_interval: float = 1e-5, seed: int = 42) -> Dict:
+    """
+    Parse the inputs serially, then concurrently, and compare the results
+
+    Args:
+        input_dir: Directory of resume files (None or empty for synthetic resumes only)
+
+    Returns:
+        Dict of inputs, serial and concurrent seconds, and mismatches (the
+        inputs of the concurrent parses that differed from the serial result)
+
+    Raises:
+        ValueError: If there is nothing to parse
+    """
+    file_handler = FileHandler(memory_headroom_mb=0)
+    pipeline = ResumePipeline(file_handler, ResumeParser(), DataCleaner())
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = [
+            os.path.join(input_dir, name) for name in sorted(os.listdir(input_dir))
+            if os.path.splitext(name)[1].lower().lstrip('.') in file_handler.supported_formats
+        ] if input_dir else []
+        for index in range(synthetic):
+            path = os.path.join(work_dir, f"synthetic_{index}.txt")
+            with open(path, 'wb') as file:
+                file.write(resume_text(rng).encode(ENCODINGS[index % len(ENCODINGS)]))
+            paths.append(path)
+        if not paths:
+            raise ValueError(f"No resume files in {input_dir} and no synthetic resumes requested")
+
+        started = time.perf_counter()
+        expected = {path: outcome(pipeline, path) for path in paths}
+        serial = time.perf_counter() - started
+
+        tasks = [paths[index % len(paths)] for index in range(parses)]
+        rng.shuffle(tasks)
+
+        previous_interval = sys.getswitchinterval()
+        sys.setswitchinterval(switch_interval)
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                results = list(executor.map(lambda path: outcome(pipeline, path), tasks))
+            concurrent = time.perf_counter() - started
+        finally:
+            sys.setswitchinterval(previous_interval)
+
+    return {
+        'inputs': len(paths),
+        'serial_seconds': serial,
+        'concurrent_seconds': concurrent,
+        'mismatches': [path for path, result in zip(tasks, results) if result != expected[path]]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', default=SAMPLES_DIR, help="directory of resume files ('' for none)")
+    parser.add_argument('--synthetic', type=int, default=40, help='generated text resumes to add')
+    parser.add_argument('--parses', type=int, default=400, help='concurrent parses to run')
+    parser.add_argument('--threads', type=int, default=8, help='threads sharing the pipeline')
+    parser.add_argument('--switch-interval', type=float, default=1e-5, help='sys.setswitchinterval seconds')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    try:
+        stats = run(args.input, args.synthetic, args.parses, args.threads, args.switch_interval, args.seed)
+    except ValueError as e:
+        sys.exit(str(e))
+    mismatches = stats['mismatches']
+
+    print(f"{stats['inputs']} distinct inputs, {args.parses} parses on {args.threads} threads, {os.cpu_count()} CPUs")
+    print(f"serial      {stats['serial_seconds'] / stats['inputs'] * 1000:8.2f} ms/parse")
+    print(f"concurrent  {stats['concurrent_seconds'] / args.parses * 1000:8.2f} ms/parse "
+          f"({args.parses / stats['concurrent_seconds']:.0f} parses/sec)")
+    print(f"mismatches  {len(mismatches)}")
+
+    for path in sorted(set(mismatches))[:10]:
+        print(f"  {os.path.basename(path)}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Sequential vs page-parallel extraction of long PDFs
+
+Extracts every PDF in a directory with at least --min-pages pages, once on
+one core and once split into page ranges across --workers processes,
+checks that both give identical text, and reports p50/p99 latency and the
+speedup. Worker processes are started before timing.
+
+Usage (from resume-parser-service/):
+
+    python benchmarks/pdf_parallel_bench.py --input corpus/ [--workers 4] [--min-pages 8]
+"""
+import argparse
+import glob
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_handler import FileHandler, PDF_PROFILES, pdf_page_count  # noqa: E402
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', required=True, help='directory of PDF files')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='page extraction processes')
+    parser.add_argument('--min-pages', type=int, default=8, help='page count threshold')
+    parser.add_argument('--profile', choices=list(PDF_PROFILES), default='accurate', help='extraction profile')
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    paths = [
+        path for path in sorted(glob.glob(os.path.join(args.input, '*.pdf')))
+        if pdf_page_count(path) >= args.min_pages
+    ]
+    if not paths:
+        sys.exit(f"No PDF files with at least {args.min_pages} pages in {args.input}")
+
+    sequential = FileHandler(max_text_chars=0, memory_headroom_mb=0, pdf_profile=args.profile)
+    parallel = FileHandler(max_text_chars=0, memory_headroom_mb=0, pdf_profile=args.profile,
+                           pdf_parallel_min_pages=args.min_pages, pdf_parallel_workers=args.workers)
+
+    # Start every worker process and let it import pdfminer before timing
+    pool = parallel._get_page_pool()
+    list(pool.map(pdf_page_count, paths[:1] * args.workers))
+
+    timings = {'sequential': [], 'parallel': []}
+    identical = True
+    for path in paths:
+        started = time.perf_counter()
+        expected = sequential.extract_text(path)
+        timings['sequential'].append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        actual = parallel.extract_text(path)
+        timings['parallel'].append((time.perf_counter() - started) * 1000)
+
+        identical = identical and actual == expected
+
+    print(f"{len(paths)} PDFs with >= {args.min_pages} pages, {args.workers} workers, {os.cpu_count()} CPUs\n")
+    print(f"{'mode':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, values in timings.items():
+        print(f"{mode:>12}{percentile(values, 0.5):>10.1f}{percentile(values, 0.99):>10.1f}")
+
+    speedup = percentile(timings['sequential'], 0.99) / percentile(timings['parallel'], 0.99)
+    print(f"\np99 speedup {speedup:.2f}x, identical text: {identical}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Compare PDF extraction profiles on latency and parsed field accuracy
+
+Extracts every PDF in a directory with each profile (fast, balanced,
+accurate), parses and cleans the text, and reports extraction latency and
+how often each field matches the reference. The reference is a truth file
+when given (JSON mapping file name to expected name, email, phone and
+skills), otherwise the accurate profile's output.
+
+Usage (from resume-parser-service/):
+
+    python benchmarks/pdf_profile_bench.py --input corpus/ [--truth corpus/truth.json] [--repeat 3]
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers.resume_parser import ResumeParser  # noqa: E402
+from utils.data_cleaner import DataCleaner  # noqa: E402
+from utils.file_handler import FileHandler, PDF_PROFILES  # noqa: E402
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'samples')
+FIELDS = ('name', 'email', 'phone', 'skills', 'experience', 'education')
+
+
+def fields(cleaned: dict) -> dict:
+    """The compared fields of a cleaned resume"""
+    personal_info = cleaned.get('personal_info') or {}
+    return {
+        'name': personal_info.get('name'),
+        'email': personal_info.get('email'),
+        'phone': personal_info.get('phone'),
+        'skills': cleaned.get('skills') or [],
+        'experience': len(cleaned.get('experience') or []),
+        'education': len(cleaned.get('education') or [])
+    }
+
+
+def normalize(field: str, value):
+    if field == 'phone':
+        return re.sub(r'\D', '', value or '')[-10:]
+    if field == 'skills':
+        return {skill.casefold() for skill in value}
+    if isinstance(value, str):
+        return ' '.join(value.casefold().split())
+    return value
+
+
+def score(field: str, expected, actual) -> float:
+    """1.0 for a match; F1 of the two sets for skills"""
+    expected, actual = normalize(field, expected), normalize(field, actual)
+    if field != 'skills':
+        return float(expected == actual)
+    if not expected and not actual:
+        return 1.0
+    overlap = len(expected & actual)
+    return 2 * overlap / (len(expected) + len(actual))
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', default=SAMPLES_DIR, help='directory of PDF resumes')
+    parser.add_argument('--truth', help='JSON file with the expected fields per file name')
+    parser.add_argument('--repeat', type=int, default=3, help='extractions per file and profile (median is used)')
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    paths = sorted(glob.glob(os.path.join(args.input, '*.pdf')))
+    if not paths:
+        sys.exit(f"No PDF files in {args.input}")
+
+    truth = {}
+    if args.truth:
+        with open(args.truth, 'r', encoding='utf-8') as file:
+            truth = json.load(file)
+
+    file_handler = FileHandler(max_text_chars=0, memory_headroom_mb=0)
+    resume_parser = ResumeParser()
+    data_cleaner = DataCleaner()
+
+    latencies = {}
+    results = {}
+    for profile in PDF_PROFILES:
+        latencies[profile] = []
+        results[profile] = {}
+        for path in paths:
+            samples = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                text = file_handler.extract_text(path, pdf_profile=profile)
+                samples.append((time.perf_counter() - started) * 1000)
+            latencies[profile].append(statistics.median(samples))
+
+            cleaned = data_cleaner.clean_resume_data(resume_parser.parse(text, path))
+            results[profile][path] = fields(cleaned)
+
+    reference_label = 'truth' if truth else 'accurate'
+    print(f"{len(paths)} PDFs, field accuracy against {reference_label}\n")
+    print(f"{'profile':>10}{'mean ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'speedup':>9}" + ''.join(f"{f:>12}" for f in FIELDS))
+
+    accurate_mean = statistics.mean(latencies['accurate'])
+    for profile in PDF_PROFILES:
+        totals = {field: [] for field in FIELDS}
+        for path in paths:
+            if truth:
+                expected = truth.get(os.path.basename(path), {})
+            else:
+                expected = results['accurate'][path]
+            for field in FIELDS:
+                if field in expected:
+                    totals[field].append(score(field, expected[field], results[profile][path][field]))
+
+        mean = statistics.mean(latencies[profile])
+        accuracy = ''.join(
+            f"{statistics.mean(values):>12.1%}" if values else f"{'-':>12}"
+            for values in totals.values()
+        )
+        print(
+            f"{profile:>10}{mean:>10.1f}{percentile(latencies[profile], 0.5):>9.1f}"
+            f"{percentile(latencies[profile], 0.95):>9.1f}{accurate_mean / mean:>8.2f}x{accuracy}"
+        )
+
+
+if __name__ == '__main__':
+    main()
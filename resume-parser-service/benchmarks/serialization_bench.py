@@ -0,0 +1,145 @@
+"""
+Compare response encodings for parse and match payloads
+
+Measures encoded size and encode CPU time of today's path (stdlib json with
+Flask's default options) against orjson and MessagePack, each uncompressed,
+gzip'd and zstd-compressed. Encoders that are not installed are skipped.
+
+Usage (from resume-parser-service/):
+
+    python benchmarks/serialization_bench.py [--items 200] [--repeat 20]
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+WORDS = (
+    'designed built led migrated optimized scalable distributed services team customers '
+    'python java react docker kubernetes aws pipelines latency throughput reliability '
+    'analytics dashboards stakeholders delivered reduced improved automated platform'
+).split()
+
+
+def sentence(rng: random.Random, length: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(length)).capitalize() + '.'
+
+
+def parse_payload(rng: random.Random) -> dict:
+    """Synthetic /api/parse-resume response"""
+    experience = [{
+        'company': f"Company {rng.randint(1, 500)} Inc",
+        'position': rng.choice(['Software Engineer', 'Data Analyst', 'Engineering Manager']),
+        'start_date': f"{rng.randint(2000, 2018)}-01-01",
+        'end_date': None,
+        'is_current': rng.random() < 0.3,
+        'description': ' '.join(sentence(rng, 20) for _ in range(rng.randint(3, 10)))
+    } for _ in range(rng.randint(1, 6))]
+
+    return {
+        'success': True,
+        'message': 'Resume parsed successfully',
+        'data': {
+            'parsed_data': {
+                'personal_info': {'name': 'Jane Doe', 'email': 'jane@example.com', 'phone': '+15555550100'},
+                'skills': sorted(rng.sample(WORDS, 12)),
+                'experience': experience,
+                'education': [{'institution': 'State University', 'degree': 'B.S.', 'field_of_study': 'Computer Science',
+                               'start_date': None, 'end_date': '2012-12-31'}],
+                'certifications': [],
+                'languages': [{'language': 'English', 'proficiency': 'native'}],
+                'summary': ' '.join(sentence(rng, 25) for _ in range(4)),
+                'total_experience': round(rng.uniform(0, 20), 1)
+            },
+            'metadata': {'filename': 'resume.pdf', 'file_size': 120000, 'text_length': 8000},
+            'parsing_stats': {'skills_found': 12, 'experience_entries': len(experience)}
+        }
+    }
+
+
+def match_payload(rng: random.Random) -> dict:
+    """Synthetic /api/match-job response"""
+    skills = rng.sample(WORDS, 10)
+    return {
+        'success': True,
+        'message': 'Job matching completed',
+        'data': {
+            'overall_score': 72.5,
+            'breakdown': {'skills': 60.0, 'experience': 100.0, 'education': 100.0},
+            'matched_skills': skills[:6],
+            'missing_skills': skills[6:],
+            'recommendation': 'Good match - Recommended'
+        }
+    }
+
+
+def encoders():
+    """Body encoders to compare, today's path first"""
+    found = [('json (today)', lambda obj: json.dumps(obj, ensure_ascii=True, sort_keys=True).encode('utf-8'))]
+    if orjson is not None:
+        found.append(('orjson', lambda obj: orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)))
+    if msgpack is not None:
+        found.append(('msgpack', lambda obj: msgpack.packb(obj, use_bin_type=True)))
+    return found
+
+
+def compressors():
+    found = [('none', lambda body: body), ('gzip-5', lambda body: gzip.compress(body, compresslevel=5))]
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=5)
+        found.append(('zstd-5', compressor.compress))
+    return found
+
+
+def run(payloads, repeat: int):
+    rows = []
+    for encoder_name, encode in encoders():
+        for compressor_name, compress in compressors():
+            started = time.process_time()
+            for _ in range(repeat):
+                total_bytes = sum(len(compress(encode(payload))) for payload in payloads)
+            cpu = (time.process_time() - started) / (repeat * len(payloads))
+            rows.append((encoder_name, compressor_name, total_bytes / len(payloads), cpu * 1e6))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=200, help='payloads per kind')
+    parser.add_argument('--repeat', type=int, default=20, help='timing repetitions')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    kinds = {
+        'parse-resume': [parse_payload(rng) for _ in range(args.items)],
+        'match-job': [match_payload(rng) for _ in range(args.items)]
+    }
+
+    for kind, payloads in kinds.items():
+        rows = run(payloads, args.repeat)
+        baseline_bytes, baseline_cpu = rows[0][2], rows[0][3]
+        print(f"\n{kind} ({args.items} payloads)")
+        print(f"{'encoder':<14}{'compression':<13}{'bytes':>10}{'vs today':>10}{'encode us':>12}{'vs today':>10}")
+        for encoder_name, compressor_name, size, cpu in rows:
+            print(f"{encoder_name:<14}{compressor_name:<13}{size:>10.0f}{size / baseline_bytes:>9.2f}x"
+                  f"{cpu:>12.1f}{cpu / baseline_cpu:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Bulk load and search latency of the resume store
+
+Loads synthetic resumes into a fresh ResumeStore in batched transactions,
+then times word, prefix and phrase searches and the indexed lookups by
+user_id and resume hash.
+
+Usage (from resume-parser-service/):
+
+    python benchmarks/store_bench.py [--documents 1000000] [--db /tmp/store_bench.db]
+"""
+import argparse
+import hashlib
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleaning_bench import parsed_resume, text  # noqa: E402
+from utils.resume_store import ResumeStore  # noqa: E402
+
+QUERIES = {
+    'word': ['python', 'kubernetes aws', 'latency', 'tensorflow'],
+    'prefix': ['pyth*', 'kube*', 'dist* serv*', 'analyt*'],
+    'phrase': ['"machine learning"', '"distributed services"', '"reduced latency"', '"data analyst"']
+}
+
+
+def records(rng: random.Random, count: int, users: int):
+    for index in range(count):
+        resume = parsed_resume(rng)
+        yield {
+            'resume_hash': hashlib.sha256(str(index).encode()).hexdigest(),
+            'user_id': f"user-{rng.randrange(users)}",
+            'filename': f"resume_{index}.pdf",
+            'parsed_data': resume,
+            'extracted_text': text(rng, rng.randint(200, 800)),
+            'metadata': {'filename': f"resume_{index}.pdf"}
+        }
+
+
+def timed(function, repeat: int):
+    """Median and p95 latency in ms"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--documents', type=int, default=100000, help='resumes to load')
+    parser.add_argument('--users', type=int, default=10000, help='distinct user_ids')
+    parser.add_argument('--batch-size', type=int, default=1000, help='resumes per transaction')
+    parser.add_argument('--db', default='/tmp/store_bench.db', help='database file (replaced)')
+    parser.add_argument('--repeat', type=int, default=50, help='runs per query')
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+
+    store = ResumeStore(args.db)
+    rng = random.Random(42)
+
+    started = time.perf_counter()
+    store.save_many(records(rng, args.documents, args.users), batch_size=args.batch_size)
+    load = time.perf_counter() - started
+    store.optimize()
+
+    size_mb = os.path.getsize(args.db) / (1024 * 1024)
+    print(f"loaded {args.documents} resumes in {load:.1f}s ({args.documents / load:.0f}/sec), {size_mb:.0f} MB")
+
+    print(f"{'query':>28}{'p50 ms':>10}{'p95 ms':>10}{'hits':>7}")
+    for kind, queries in QUERIES.items():
+        for query in queries:
+            p50, p95 = timed(lambda: store.search(query, limit=20), args.repeat)
+            hits = len(store.search(query, limit=20))
+            print(f"{kind + ' ' + query:>28}{p50:>10.2f}{p95:>10.2f}{hits:>7}")
+
+    resume_hash = hashlib.sha256(str(args.documents // 2).encode()).hexdigest()
+    for label, lookup in (
+        ('by user_id', lambda: store.find_by_user('user-1')),
+        ('by resume_hash', lambda: store.find_by_hash(resume_hash)),
+        ('user_id + search', lambda: store.search('pyth*', user_id='user-1'))
+    ):
+        p50, p95 = timed(lookup, args.repeat)
+        print(f"{label:>28}{p50:>10.2f}{p95:>10.2f}")
+
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,453 @@
+"""
+Command-line tools for the Resume Parser Service
+
+Bulk-parse a directory or manifest of resumes across worker processes:
+
+    python cli.py parse --input resumes/ --output parsed.jsonl --workers 8
+    python cli.py parse --manifest files.txt --output parsed.jsonl
+
+Results are appended to the output as JSON Lines. Progress is checkpointed
+next to the output, and re-running the same command resumes where an
+interrupted run stopped. With --store the parsed resumes and their text are
+also loaded into a resume store, in one transaction per batch:
+
+    python cli.py parse --input resumes/ --output parsed.jsonl --store data/resumes.db
+
+Report data quality across a parsed corpus:
+
+    python cli.py quality --input parsed.jsonl --worst 20 --output quality.json
+
+Export a parsed corpus to flat Parquet (or Feather) tables for analytics:
+
+    python cli.py export --input parsed.jsonl --output-dir export/
+
+Reprocess the resumes in a store after extractor versions were bumped,
+re-running only the changed extractors over the stored text (see
+utils/backfill.py):
+
+    python cli.py backfill --store data/resumes.db --cpu-budget 2
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from array import array
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Set
+
+from utils.file_handler import FileHandler, PDF_PROFILES
+
+logger = logging.getLogger('resume_parser.cli')
+
+# Per-process pipeline, built by _init_worker()
+_pipeline = None
+_include_text = False
+
+
+def _init_worker(include_text: bool = False, pdf_profile: str = 'accurate'):
+    """Build the parsing pipeline once in each worker process"""
+    global _pipeline, _include_text
+
+    from parsers.resume_parser import ResumeParser
+    from utils.data_cleaner import DataCleaner
+    from utils.pipeline import ResumePipeline
+
+    _pipeline = ResumePipeline(FileHandler(pdf_profile=pdf_profile), ResumeParser(), DataCleaner())
+    _include_text = include_text
+
+
+def _process_file(file_path: str) -> Dict:
+    """Parse one resume in a worker; never raises"""
+    from utils.guardrails import DocumentRejectedError
+    from utils.pipeline import build_parse_data
+    from utils.resume_store import file_hash
+
+    started = time.perf_counter()
+    record = {'path': file_path}
+
+    try:
+        cleaned_data, extracted_text, extraction = _pipeline.process(file_path)
+        record['success'] = True
+        record['resume_hash'] = file_hash(file_path)
+        record['data'] = build_parse_data(
+            cleaned_data, extracted_text, os.path.basename(file_path), file_path, extraction=extraction,
+            extractor_versions=_pipeline.resume_parser.EXTRACTOR_VERSIONS
+        )
+        if _include_text:
+            from utils.semantic import EMBEDDER
+
+            # Only needed by the store; removed before the record is written out
+            record['extracted_text'] = extracted_text
+            record['vector'] = EMBEDDER.embed_resume(record['data']['parsed_data']).tobytes()
+            record['vector_model'] = EMBEDDER.model
+    except DocumentRejectedError as e:
+        record['success'] = False
+        record['error_code'] = e.code
+        record['error'] = str(e)
+    except Exception as e:
+        record['success'] = False
+        record['error'] = f"{type(e).__name__}: {str(e)}"
+
+    record['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return record
+
+
+def iter_input_files(input_dir: Optional[str], manifest: Optional[str]) -> Iterator[str]:
+    """Yield resume paths from a directory tree or a manifest (one path per line)"""
+    if manifest:
+        with open(manifest, 'r', encoding='utf-8') as file:
+            for line in file:
+                path = line.strip()
+                if path and not path.startswith('#'):
+                    yield path
+        return
+
+    supported = set(FileHandler().supported_formats)
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.rsplit('.', 1)[-1].lower() in supported:
+                yield os.path.join(root, name)
+
+
+class Checkpoint:
+    """
+    Record of completed files, kept consistent with the output file
+
+    Each checkpoint line is ``<output offset>\\t<path>``, written only after
+    the corresponding output line has been flushed. On resume the output is
+    truncated back to the last checkpointed offset, so a crash between the
+    two writes never leaves duplicate or torn records behind.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        self.output_offset = 0
+        # Bytes of complete checkpoint lines
+        self.size = 0
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as file:
+            for line in file:
+                # A torn final line (crash mid-write) is not a completed file
+                if not line.endswith(b'\n'):
+                    break
+                offset, _, done_path = line.decode('utf-8').rstrip('\r\n').partition('\t')
+                if done_path:
+                    self.done.add(done_path)
+                    self.output_offset = int(offset)
+                self.size += len(line)
+
+    def open(self):
+        # New lines go after the last complete one
+        if os.path.exists(self.path):
+            os.truncate(self.path, self.size)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def mark(self, output_offset: int, file_path: str):
+        self._file.write(f"{output_offset}\t{file_path}\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class Progress:
+    """Report files/sec and p95 per-file latency while a run progresses"""
+
+    def __init__(self, total: int, interval: float = 5.0, window: int = 10000, unit: str = 'files'):
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.last_report = self.started
+        self.done = 0
+        self.failed = 0
+        self.recent = deque(maxlen=window)
+        self.latencies = array('d')
+
+    def record(self, elapsed_ms: float, success: bool):
+        self.done += 1
+        self.failed += 0 if success else 1
+        self.recent.append(elapsed_ms)
+        self.latencies.append(elapsed_ms)
+
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report(self.recent)
+
+    @staticmethod
+    def percentile(values, fraction: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def report(self, values, final: bool = False):
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        remaining = (self.total - self.done) / rate if rate else 0.0
+        label = 'done' if final else 'progress'
+        logger.info(
+            f"{label}: {self.done}/{self.total} {self.unit}, {self.failed} failed, {rate:.1f} {self.unit}/sec, "
+            f"p95 {self.percentile(values, 0.95):.0f} ms, eta {remaining:.0f}s"
+        )
+
+
+def run_parse(args) -> int:
+    """Bulk-parse resumes into JSON Lines with resumable checkpoints"""
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output}.checkpoint")
+
+    if (not args.overwrite and not os.path.exists(checkpoint.path)
+            and os.path.exists(args.output) and os.path.getsize(args.output) > 0):
+        logger.error(f"{args.output} exists but has no checkpoint; pass --overwrite to start over")
+        return 2
+
+    if args.overwrite and os.path.exists(checkpoint.path):
+        os.remove(checkpoint.path)
+
+    checkpoint.load()
+
+    pending: List[str] = [
+        path for path in iter_input_files(args.input, args.manifest)
+        if path not in checkpoint.done
+    ]
+    if checkpoint.done:
+        logger.info(f"Resuming: {len(checkpoint.done)} files already done, {len(pending)} remaining")
+
+    # Drop anything written after the last checkpoint (e.g. a torn final line)
+    mode = 'r+b' if os.path.exists(args.output) else 'wb'
+    output = open(args.output, mode)
+    output.truncate(checkpoint.output_offset)
+    output.seek(checkpoint.output_offset)
+
+    checkpoint.open()
+    progress = Progress(total=len(pending), interval=args.progress_interval)
+
+    store = None
+    if args.store:
+        from utils.resume_store import ResumeStore
+        store = ResumeStore(args.store)
+
+    # Records reach the output and checkpoint only after the store has
+    # committed them, so a resumed run never skips an unstored file
+    batch: List[Dict] = []
+    batch_size = args.store_batch_size if store is not None else 1
+
+    def flush():
+        if store is not None:
+            store.save_many(
+                ({
+                    'resume_hash': record['resume_hash'],
+                    'parsed_data': record['data']['parsed_data'],
+                    'extracted_text': record.pop('extracted_text'),
+                    'metadata': record['data']['metadata'],
+                    'filename': record['data']['metadata']['filename'],
+                    'vector': record.pop('vector'),
+                    'vector_model': record.pop('vector_model')
+                } for record in batch if record['success']),
+                batch_size=len(batch)
+            )
+        for record in batch:
+            output.write(json.dumps(record, default=str).encode('utf-8') + b'\n')
+            output.flush()
+            checkpoint.mark(output.tell(), record['path'])
+        batch.clear()
+
+    pool = multiprocessing.Pool(processes=args.workers, initializer=_init_worker,
+                                initargs=(store is not None, args.pdf_profile))
+    try:
+        for record in pool.imap_unordered(_process_file, pending, chunksize=args.chunksize):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                flush()
+            progress.record(record['elapsed_ms'], record['success'])
+
+        flush()
+        pool.close()
+
+    except KeyboardInterrupt:
+        logger.warning('Interrupted; re-run the same command to resume')
+        pool.terminate()
+        flush()
+        return 130
+
+    except BaseException:
+        # A running pool can't be joined; stop it so the real error surfaces
+        pool.terminate()
+        raise
+
+    finally:
+        pool.join()
+        output.close()
+        checkpoint.close()
+        if store is not None:
+            store.close()
+
+    progress.report(progress.latencies, final=True)
+    return 0
+
+
+def iter_parsed_records(path: str, stats: Dict) -> Iterator:
+    """Yield (path, parse data) for each successful record of a parse output"""
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not record.get('success'):
+                stats['failed'] += 1
+                continue
+            yield record['path'], record['data']
+
+
+def run_quality(args) -> int:
+    """Score data quality across a JSON Lines parse output"""
+    from utils.data_cleaner import DataCleaner
+
+    stats = {'failed': 0}
+    documents = (
+        (path, data['parsed_data']) for path, data in iter_parsed_records(args.input, stats)
+    )
+    report = DataCleaner().get_quality_report(documents, worst_n=args.worst)
+    report['failed_documents'] = stats['failed']
+
+    body = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(body + '\n')
+        logger.info(f"Quality report for {report['documents']} documents written to {args.output}")
+    else:
+        print(body)
+
+    return 0
+
+
+def run_export(args) -> int:
+    """Export a JSON Lines parse output to flat columnar tables"""
+    from utils.columnar_export import ColumnarExporter
+
+    stats = {'failed': 0}
+    exporter = ColumnarExporter(
+        args.output_dir, file_format=args.format, row_group_size=args.row_group_size,
+        compression=args.compression
+    )
+    with exporter:
+        for path, data in iter_parsed_records(args.input, stats):
+            exporter.add(path, data['parsed_data'], data.get('metadata'))
+
+    rows = ', '.join(f"{table} {count}" for table, count in exporter.rows_written.items())
+    logger.info(f"Exported to {args.output_dir} ({rows} rows; {stats['failed']} failed documents skipped)")
+    return 0
+
+
+def run_backfill(args) -> int:
+    """Reprocess stored resumes whose extractor versions are out of date"""
+    from parsers.resume_parser import ResumeParser
+    from utils.backfill import Backfill
+    from utils.resume_store import ResumeStore
+
+    if not os.path.exists(args.store):
+        logger.error(f"{args.store} does not exist")
+        return 2
+
+    store = ResumeStore(args.store)
+    try:
+        backfill = Backfill(
+            store, ResumeParser.EXTRACTOR_VERSIONS, ResumeParser.EXTRACTOR_INPUTS, cpu_budget=args.cpu_budget,
+            embed=not args.no_embed, batch_size=args.batch_size, nice=args.nice
+        )
+        pending = backfill.pending()
+        logger.info(
+            f"{pending} of {store.count()} resumes to reprocess on {backfill.workers} workers "
+            f"at {backfill.cpu_share:.0%} CPU each"
+        )
+        if args.dry_run or not pending:
+            return 0
+
+        progress = Progress(total=pending, interval=args.progress_interval, unit='resumes')
+        try:
+            stats = backfill.run(progress)
+        except KeyboardInterrupt:
+            logger.warning('Interrupted; re-run the same command to continue')
+            return 130
+
+        progress.report(progress.latencies, final=True)
+        runs = ', '.join(f"{name} {count}" for name, count in stats['extractor_runs'].items() if count)
+        logger.info(
+            f"{stats['written']} written, {stats['skipped']} changed meanwhile and skipped, "
+            f"{stats['failed']} failed; extractor runs: {runs or 'none'}"
+        )
+        return 1 if stats['failed'] else 0
+    finally:
+        store.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Resume Parser Service command-line tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parse = subparsers.add_parser('parse', help='bulk-parse resumes into JSON Lines')
+    source = parse.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input', help='directory to walk for resume files')
+    source.add_argument('--manifest', help='file listing one resume path per line')
+    parse.add_argument('--output', required=True, help='JSON Lines file to append results to')
+    parse.add_argument('--checkpoint', help='checkpoint file (default: <output>.checkpoint)')
+    parse.add_argument('--overwrite', action='store_true', help='replace an output that has no checkpoint')
+    parse.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='worker processes')
+    parse.add_argument('--chunksize', type=int, default=4, help='files handed to a worker at a time')
+    parse.add_argument('--progress-interval', type=float, default=5.0, help='seconds between progress reports')
+    parse.add_argument('--pdf-profile', choices=list(PDF_PROFILES), default='accurate',
+                       help='PDF extraction profile')
+    parse.add_argument('--store', help='also load results into this resume store database')
+    parse.add_argument('--store-batch-size', type=int, default=500, help='resumes per store transaction')
+    parse.set_defaults(handler=run_parse)
+
+    quality = subparsers.add_parser('quality', help='report data quality across parsed resumes')
+    quality.add_argument('--input', required=True, help='JSON Lines output of the parse command')
+    quality.add_argument('--worst', type=int, default=10, help='lowest-scoring documents to list')
+    quality.add_argument('--output', help='write the JSON report here instead of stdout')
+    quality.set_defaults(handler=run_quality)
+
+    export = subparsers.add_parser('export', help='export parsed resumes to Parquet/Feather tables')
+    export.add_argument('--input', required=True, help='JSON Lines output of the parse command')
+    export.add_argument('--output-dir', required=True, help='directory for the table files')
+    export.add_argument('--format', choices=['parquet', 'feather'], default='parquet', help='file format')
+    export.add_argument('--row-group-size', type=int, default=50000, help='rows per row group')
+    export.add_argument('--compression', default='zstd', help='compression codec')
+    export.set_defaults(handler=run_export)
+
+    backfill = subparsers.add_parser('backfill', help='reprocess stored resumes after extractor version bumps')
+    backfill.add_argument('--store', required=True, help='resume store database')
+    backfill.add_argument('--cpu-budget', type=float, default=max(1, (os.cpu_count() or 1) // 2),
+                          help='CPUs the workers may use between them, e.g. 0.5 or 3')
+    backfill.add_argument('--batch-size', type=int, default=200, help='resumes per read and write transaction')
+    backfill.add_argument('--nice', type=int, default=10, help='niceness added to the worker processes')
+    backfill.add_argument('--no-embed', action='store_true', help='leave resume embeddings as they are')
+    backfill.add_argument('--dry-run', action='store_true', help='only count the resumes to reprocess')
+    backfill.add_argument('--progress-interval', type=float, default=5.0, help='seconds between progress reports')
+    backfill.set_defaults(handler=run_backfill)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+    # Per-file parser warnings would drown the progress output
+    logging.getLogger('parsers').setLevel(logging.ERROR)
+    logging.getLogger('utils').setLevel(logging.ERROR)
+
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
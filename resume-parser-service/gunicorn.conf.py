@@ -0,0 +1,49 @@
+"""
+Gunicorn configuration for the Resume Parser Service
+
+    gunicorn -c gunicorn.conf.py app:app
+
+The application is preloaded in the master so that the parsers, compiled
+patterns, skill vocabulary and spaCy model are built once and shared
+copy-on-write by every worker.
+"""
+import multiprocessing
+import os
+
+from utils.lifecycle import prepare_master, freeze_shared_state, after_fork
+
+# The config file is read before the preloaded application is imported
+prepare_master()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+
+# Parsing is CPU bound, so one worker per core is the sensible default
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Recycle workers periodically; with preloading a new worker is a cheap fork
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+
+def when_ready(server):
+    """Runs in the master once the server is set up, before any worker is forked"""
+    if server.cfg.preload_app:
+        # Warm up once in the master so every worker starts ready and
+        # shares the warmed pages copy-on-write
+        from app import warmup
+        warmup.run()
+
+
+def pre_fork(server, worker):
+    """Runs in the master right before each worker is forked"""
+    freeze_shared_state()
+
+
+def post_fork(server, worker):
+    """Runs in each worker right after it is forked"""
+    after_fork()
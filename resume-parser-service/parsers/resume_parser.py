@@ -4,24 +4,62 @@ import nltk
 from datetime import datetime
 from dateutil import parser as date_parser
 import logging
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Tuple
 import json
 
+from parsers.skill_extractor import SkillExtractor
+from utils.job_profiles import JobProfile, compile_job_requirements, normalize_skill
+from utils.metrics import PARSE_SECONDS
+from utils.semantic import EMBEDDER, similarity, vector_from_bytes
+
 logger = logging.getLogger(__name__)
 
 class ResumeParser:
+    """
+    Extract structured resume data from plain text
+    
+    One instance is shared by every request and thread. All state is built
+    in __init__ and held in immutable containers (tuples, read-only
+    mappings); parsing only reads it and keeps per-call data in locals, so
+    concurrent parse() calls need no locking.
+    
+    Each extractor carries a version in EXTRACTOR_VERSIONS, stamped into
+    the metadata of every parse result. Bump an extractor's version
+    whenever a change alters its output; the backfill (utils/backfill.py)
+    then re-runs just that extractor over the stored resumes.
+    """
+    
+    EXTRACTOR_VERSIONS = MappingProxyType({
+        'personal_info': 1,
+        'skills': 1,
+        'experience': 1,
+        'education': 1,
+        'certifications': 1,
+        'languages': 1,
+        'summary': 1,
+        'total_experience': 1
+    })
+    # Extractors computed from another extractor's output rather than the text
+    EXTRACTOR_INPUTS = MappingProxyType({
+        'total_experience': ('experience',)
+    })
+    
     def __init__(self):
         """Initialize the resume parser with NLP models and skill datasets"""
         try:
-            # Load spaCy model
+            # Load spaCy model (not used by parse(); a spaCy pipeline must not
+            # be called from several threads at once)
             self.nlp = spacy.load("en_core_web_sm")
             logger.info("spaCy model loaded successfully")
         except OSError:
             logger.error("spaCy model not found. Please install with: python -m spacy download en_core_web_sm")
             self.nlp = None
         
-        # Initialize skill keywords (you can expand this list)
-        self.skill_keywords = self._load_skill_keywords()
+        # Initialize skill keywords (you can expand this list), compiled into
+        # one matcher (see parsers/skill_extractor.py)
+        self.skill_extractor = SkillExtractor(self._load_skill_keywords())
+        self.skill_keywords = self.skill_extractor.keywords
         
         # Initialize patterns
         self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
@@ -29,6 +67,69 @@ class ResumeParser:
         self.linkedin_pattern = re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE)
         self.github_pattern = re.compile(r'github\.com/[\w-]+', re.IGNORECASE)
         
+        # Precompile every pattern used while parsing so that the compiled state
+        # is built once (in the gunicorn master when preloading) and shared
+        # read-only by all workers instead of being rebuilt in each re cache
+        self.experience_section_patterns = (
+            re.compile(r'(?:work\s+)?experience[:\-\s]*(.*?)(?=\n\s*(?:education|skills|projects|certifications)|$)', re.IGNORECASE | re.DOTALL),
+            re.compile(r'(?:professional\s+)?(?:work\s+)?(?:employment\s+)?history[:\-\s]*(.*?)(?=\n\s*(?:education|skills|projects|certifications)|$)', re.IGNORECASE | re.DOTALL),
+            re.compile(r'career\s+(?:summary|history)[:\-\s]*(.*?)(?=\n\s*(?:education|skills|projects|certifications)|$)', re.IGNORECASE | re.DOTALL)
+        )
+        self.education_section_patterns = (
+            re.compile(r'education[:\-\s]*(.*?)(?=\n\s*(?:experience|skills|projects|certifications)|$)', re.IGNORECASE | re.DOTALL),
+            re.compile(r'academic\s+(?:background|qualifications?)[:\-\s]*(.*?)(?=\n\s*(?:experience|skills|projects|certifications)|$)', re.IGNORECASE | re.DOTALL),
+            re.compile(r'qualifications?[:\-\s]*(.*?)(?=\n\s*(?:experience|skills|projects|certifications)|$)', re.IGNORECASE | re.DOTALL)
+        )
+        self.certification_section_patterns = (
+            re.compile(r'certifications?[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)', re.IGNORECASE | re.DOTALL),
+            re.compile(r'licenses?\s+(?:and\s+)?certifications?[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)', re.IGNORECASE | re.DOTALL),
+            re.compile(r'professional\s+certifications?[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)', re.IGNORECASE | re.DOTALL)
+        )
+        self.language_section_patterns = (
+            re.compile(r'languages?[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects|certifications)|$)', re.IGNORECASE | re.DOTALL),
+            re.compile(r'linguistic?\s+(?:skills?|abilities?)[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects|certifications)|$)', re.IGNORECASE | re.DOTALL)
+        )
+        self.summary_section_patterns = (
+            re.compile(r'(?:professional\s+)?summary[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)', re.IGNORECASE | re.DOTALL),
+            re.compile(r'(?:career\s+)?objective[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)', re.IGNORECASE | re.DOTALL),
+            re.compile(r'(?:professional\s+)?profile[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)', re.IGNORECASE | re.DOTALL),
+            re.compile(r'about\s+(?:me|myself)[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)', re.IGNORECASE | re.DOTALL)
+        )
+        
+        # Entry-level patterns
+        self.date_range_pattern = re.compile(r'(\d{4})\s*[-–—]\s*(\d{4}|present|current)', re.IGNORECASE)
+        self.date_range_strip_pattern = re.compile(r'\d{4}\s*[-–—]\s*(?:\d{4}|present|current)', re.IGNORECASE)
+        self.degree_patterns = (
+            re.compile(r'(?:bachelor|master|phd|doctorate|associate|diploma|certificate).*?(?:in|of)\s+([^,\n]+)', re.IGNORECASE),
+            re.compile(r'(b\.?s\.?|m\.?s\.?|m\.?a\.?|b\.?a\.?|ph\.?d\.?|m\.?b\.?a\.?)\s+(?:in\s+)?([^,\n]+)', re.IGNORECASE),
+        )
+        self.year_pattern = re.compile(r'\b(19|20)\d{2}\b')
+        self.proficiency_keywords = MappingProxyType({
+            'native': 'native',
+            'fluent': 'advanced',
+            'advanced': 'advanced',
+            'intermediate': 'intermediate',
+            'basic': 'beginner',
+            'beginner': 'beginner',
+            'conversational': 'intermediate'
+        })
+        self.proficiency_patterns = MappingProxyType({
+            keyword: re.compile(r'\b' + keyword + r'\b', re.IGNORECASE)
+            for keyword in self.proficiency_keywords
+        })
+        self.non_word_pattern = re.compile(r'[^\w\s]')
+        
+        # Text extractors by name (total_experience is computed in extract())
+        self.extractors = MappingProxyType({
+            'personal_info': self._extract_personal_info,
+            'skills': self._extract_skills,
+            'experience': self._extract_experience,
+            'education': self._extract_education,
+            'certifications': self._extract_certifications,
+            'languages': self._extract_languages,
+            'summary': self._extract_summary
+        })
+        
     def _load_skill_keywords(self) -> List[str]:
         """Load programming languages, frameworks, and technical skills"""
         skills = [
@@ -89,46 +190,55 @@ class ResumeParser:
             Dictionary containing parsed resume data
         """
         try:
-            # Basic information extraction
-            personal_info = self._extract_personal_info(text)
-            
-            # Skills extraction
-            skills = self._extract_skills(text)
-            
-            # Experience extraction
-            experience = self._extract_experience(text)
-            
-            # Education extraction
-            education = self._extract_education(text)
-            
-            # Certifications extraction
-            certifications = self._extract_certifications(text)
-            
-            # Languages extraction
-            languages = self._extract_languages(text)
-            
-            # Summary/Objective extraction
-            summary = self._extract_summary(text)
-            
-            # Calculate total experience
-            total_experience = self._calculate_total_experience(experience)
-            
-            return {
-                'personal_info': personal_info,
-                'skills': skills,
-                'experience': experience,
-                'education': education,
-                'certifications': certifications,
-                'languages': languages,
-                'summary': summary,
-                'total_experience': total_experience,
-                'raw_text': text[:1000] if text else None  # First 1000 chars for reference
-            }
+            parsed_data = self.extract(text)
+            parsed_data['raw_text'] = text[:1000] if text else None  # First 1000 chars for reference
+            return parsed_data
             
         except Exception as error:
             logger.error(f"Error parsing resume: {str(error)}")
             raise error
     
+    def extract(self, text: str, extractors: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Run some or all of the extractors over resume text
+        
+        An extractor also runs the extractors it reads from
+        (EXTRACTOR_INPUTS), so its result never depends on stored data.
+        
+        Args:
+            text: Extracted text from resume
+            extractors: Names from EXTRACTOR_VERSIONS (default: all)
+            
+        Returns:
+            Result of each extractor that ran, by name, in EXTRACTOR_VERSIONS order
+            
+        Raises:
+            KeyError: If an extractor name is unknown
+        """
+        if extractors is None:
+            selected = set(self.EXTRACTOR_VERSIONS)
+        else:
+            selected = set()
+            pending = list(extractors)
+            while pending:
+                name = pending.pop()
+                if name not in self.EXTRACTOR_VERSIONS:
+                    raise KeyError(f"Unknown extractor: {name}")
+                if name not in selected:
+                    selected.add(name)
+                    pending.extend(self.EXTRACTOR_INPUTS.get(name, ()))
+        
+        results = {}
+        for name in self.EXTRACTOR_VERSIONS:
+            if name not in selected:
+                continue
+            with PARSE_SECONDS.time(extractor=name):
+                if name == 'total_experience':
+                    results[name] = self._calculate_total_experience(results['experience'])
+                else:
+                    results[name] = self.extractors[name](text)
+        return results
+    
     def _extract_personal_info(self, text: str) -> Dict:
         """Extract personal information like name, email, phone, etc."""
         info = {}
@@ -172,57 +282,12 @@ class ResumeParser:
     
     def _extract_skills(self, text: str) -> List[str]:
         """Extract technical and professional skills"""
-        skills_found = []
-        text_lower = text.lower()
-        
         try:
-            # Find skills from predefined list
-            for skill in self.skill_keywords:
-                if skill in text_lower:
-                    # Check for whole word match to avoid partial matches
-                    pattern = r'\b' + re.escape(skill) + r'\b'
-                    if re.search(pattern, text_lower):
-                        skills_found.append(skill.title())
-            
-            # Look for skills in specific sections
-            skills_section_patterns = [
-                r'(?:skills?|technical skills?|core competencies)[:\-\s]*(.*?)(?:\n\s*\n|\n[A-Z])',
-                r'(?:technologies?|tools?)[:\-\s]*(.*?)(?:\n\s*\n|\n[A-Z])',
-                r'(?:programming languages?)[:\-\s]*(.*?)(?:\n\s*\n|\n[A-Z])'
-            ]
-            
-            for pattern in skills_section_patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-                for match in matches:
-                    skills_text = match.group(1)
-                    # Extract individual skills from the section
-                    extracted_skills = self._parse_skills_from_text(skills_text)
-                    skills_found.extend(extracted_skills)
-            
-            # Remove duplicates and return
-            return list(set(skills_found))
+            return self.skill_extractor.extract(text)
             
         except Exception as e:
             logger.error(f"Error extracting skills: {str(e)}")
-            return skills_found
-    
-    def _parse_skills_from_text(self, text: str) -> List[str]:
-        """Parse skills from a specific text section"""
-        skills = []
-        
-        # Split by common delimiters
-        delimiters = [',', '•', '◦', '▪', '\n', '|', ';']
-        
-        for delimiter in delimiters:
-            if delimiter in text:
-                parts = text.split(delimiter)
-                for part in parts:
-                    skill = part.strip().strip('.,')
-                    if len(skill) > 1 and len(skill) < 30:  # Reasonable skill length
-                        skills.append(skill.title())
-                break
-        
-        return skills
+            return []
     
     def _extract_experience(self, text: str) -> List[Dict]:
         """Extract work experience information"""
@@ -230,15 +295,9 @@ class ResumeParser:
         
         try:
             # Look for experience section
-            exp_patterns = [
-                r'(?:work\s+)?experience[:\-\s]*(.*?)(?=\n\s*(?:education|skills|projects|certifications)|$)',
-                r'(?:professional\s+)?(?:work\s+)?(?:employment\s+)?history[:\-\s]*(.*?)(?=\n\s*(?:education|skills|projects|certifications)|$)',
-                r'career\s+(?:summary|history)[:\-\s]*(.*?)(?=\n\s*(?:education|skills|projects|certifications)|$)'
-            ]
-            
             exp_text = ""
-            for pattern in exp_patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+            for pattern in self.experience_section_patterns:
+                match = pattern.search(text)
                 if match:
                     exp_text = match.group(1)
                     break
@@ -267,7 +326,7 @@ class ResumeParser:
                 continue
                 
             # Check if line contains dates (potential job duration)
-            date_match = re.search(r'(\d{4})\s*[-–—]\s*(\d{4}|present|current)', line, re.IGNORECASE)
+            date_match = self.date_range_pattern.search(line)
             if date_match:
                 if current_entry:
                     entries.append(current_entry)
@@ -293,7 +352,7 @@ class ResumeParser:
                     current_entry['end_date'] = f"{end_year}-12-31"
                 
                 # Try to extract company and position from the same line
-                line_without_dates = re.sub(r'\d{4}\s*[-–—]\s*(?:\d{4}|present|current)', '', line, flags=re.IGNORECASE)
+                line_without_dates = self.date_range_strip_pattern.sub('', line)
                 parts = [part.strip() for part in line_without_dates.split('|') if part.strip()]
                 
                 if len(parts) >= 2:
@@ -325,15 +384,9 @@ class ResumeParser:
         
         try:
             # Look for education section
-            edu_patterns = [
-                r'education[:\-\s]*(.*?)(?=\n\s*(?:experience|skills|projects|certifications)|$)',
-                r'academic\s+(?:background|qualifications?)[:\-\s]*(.*?)(?=\n\s*(?:experience|skills|projects|certifications)|$)',
-                r'qualifications?[:\-\s]*(.*?)(?=\n\s*(?:experience|skills|projects|certifications)|$)'
-            ]
-            
             edu_text = ""
-            for pattern in edu_patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+            for pattern in self.education_section_patterns:
+                match = pattern.search(text)
                 if match:
                     edu_text = match.group(1)
                     break
@@ -351,12 +404,6 @@ class ResumeParser:
         """Parse individual education entries"""
         entries = []
         
-        # Common degree patterns
-        degree_patterns = [
-            r'(?:bachelor|master|phd|doctorate|associate|diploma|certificate).*?(?:in|of)\s+([^,\n]+)',
-            r'(b\.?s\.?|m\.?s\.?|m\.?a\.?|b\.?a\.?|ph\.?d\.?|m\.?b\.?a\.?)\s+(?:in\s+)?([^,\n]+)',
-        ]
-        
         lines = text.strip().split('\n')
         
         for line in lines:
@@ -374,8 +421,8 @@ class ResumeParser:
             }
             
             # Look for degree information
-            for pattern in degree_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
+            for pattern in self.degree_patterns:
+                match = pattern.search(line)
                 if match:
                     if len(match.groups()) == 1:
                         entry['field_of_study'] = match.group(1).strip()
@@ -385,7 +432,7 @@ class ResumeParser:
                     break
             
             # Extract year information
-            year_matches = re.findall(r'\b(19|20)\d{2}\b', line)
+            year_matches = self.year_pattern.findall(line)
             if year_matches:
                 if len(year_matches) >= 2:
                     entry['start_date'] = f"{year_matches[0]}-01-01"
@@ -396,11 +443,11 @@ class ResumeParser:
             # Try to extract institution name
             # Remove degree and year information to get institution
             clean_line = line
-            for pattern in degree_patterns:
-                clean_line = re.sub(pattern, '', clean_line, flags=re.IGNORECASE)
+            for pattern in self.degree_patterns:
+                clean_line = pattern.sub('', clean_line)
             
             # Remove years
-            clean_line = re.sub(r'\b(19|20)\d{2}\b', '', clean_line)
+            clean_line = self.year_pattern.sub('', clean_line)
             
             # Clean up and extract institution
             institution_parts = [part.strip() for part in clean_line.split(',') if part.strip()]
@@ -418,15 +465,9 @@ class ResumeParser:
         
         try:
             # Look for certifications section
-            cert_patterns = [
-                r'certifications?[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)',
-                r'licenses?\s+(?:and\s+)?certifications?[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)',
-                r'professional\s+certifications?[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)'
-            ]
-            
             cert_text = ""
-            for pattern in cert_patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+            for pattern in self.certification_section_patterns:
+                match = pattern.search(text)
                 if match:
                     cert_text = match.group(1)
                     break
@@ -460,12 +501,12 @@ class ResumeParser:
             }
             
             # Extract year information
-            year_matches = re.findall(r'\b(19|20)\d{2}\b', line)
+            year_matches = self.year_pattern.findall(line)
             if year_matches:
                 entry['issue_date'] = f"{year_matches[0]}-01-01"
             
             # Remove year and extract certification name and issuer
-            clean_line = re.sub(r'\b(19|20)\d{2}\b', '', line)
+            clean_line = self.year_pattern.sub('', line)
             
             # Try to split by common delimiters to separate name and issuer
             for delimiter in [' - ', ' | ', ' from ', ' by ', ', ']:
@@ -490,14 +531,9 @@ class ResumeParser:
         
         try:
             # Look for languages section
-            lang_patterns = [
-                r'languages?[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects|certifications)|$)',
-                r'linguistic?\s+(?:skills?|abilities?)[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects|certifications)|$)'
-            ]
-            
             lang_text = ""
-            for pattern in lang_patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+            for pattern in self.language_section_patterns:
+                match = pattern.search(text)
                 if match:
                     lang_text = match.group(1)
                     break
@@ -515,17 +551,6 @@ class ResumeParser:
         """Parse individual language entries"""
         entries = []
         
-        # Common proficiency levels
-        proficiency_keywords = {
-            'native': 'native',
-            'fluent': 'advanced',
-            'advanced': 'advanced',
-            'intermediate': 'intermediate',
-            'basic': 'beginner',
-            'beginner': 'beginner',
-            'conversational': 'intermediate'
-        }
-        
         lines = text.strip().split('\n')
         
         for line in lines:
@@ -540,15 +565,15 @@ class ResumeParser:
             
             # Check for proficiency indicators
             line_lower = line.lower()
-            for keyword, level in proficiency_keywords.items():
+            for keyword, level in self.proficiency_keywords.items():
                 if keyword in line_lower:
                     entry['proficiency'] = level
                     # Remove proficiency keyword to get language name
-                    line = re.sub(r'\b' + keyword + r'\b', '', line, flags=re.IGNORECASE).strip()
+                    line = self.proficiency_patterns[keyword].sub('', line).strip()
                     break
             
             # Clean up the language name
-            language = re.sub(r'[^\w\s]', '', line).strip()
+            language = self.non_word_pattern.sub('', line).strip()
             if language:
                 entry['language'] = language.title()
                 entries.append(entry)
@@ -561,15 +586,8 @@ class ResumeParser:
         
         try:
             # Look for summary section
-            summary_patterns = [
-                r'(?:professional\s+)?summary[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)',
-                r'(?:career\s+)?objective[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)',
-                r'(?:professional\s+)?profile[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)',
-                r'about\s+(?:me|myself)[:\-\s]*(.*?)(?=\n\s*(?:experience|education|skills|projects)|$)'
-            ]
-            
-            for pattern in summary_patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+            for pattern in self.summary_section_patterns:
+                match = pattern.search(text)
                 if match:
                     summary = match.group(1).strip()
                     # Clean up the summary
@@ -608,13 +626,38 @@ class ResumeParser:
         """Public method to extract skills from text"""
         return self._extract_skills(text)
     
-    def calculate_job_match(self, resume_data: Dict, job_requirements: Dict) -> Dict:
+    def calculate_job_match(self, resume_data: Dict, job_requirements: Dict, resume_vector=None) -> Dict:
         """
         Calculate matching score between resume and job requirements
         
         Args:
             resume_data: Parsed resume data
             job_requirements: Job requirements including skills, experience, etc.
+            resume_vector: The resume's embedding, when matching it against many jobs
+            
+        Returns:
+            Dictionary with matching scores and breakdown
+        """
+        try:
+            profile = compile_job_requirements(job_requirements)
+        except Exception as e:
+            logger.error(f"Error calculating job match: {str(e)}")
+            return self._failed_match()
+        
+        return self.match_job_profile(resume_data, profile, resume_vector)
+    
+    def match_job_profile(self, resume_data: Dict, profile: JobProfile, resume_vector=None) -> Dict:
+        """
+        Calculate matching score between resume and compiled job requirements
+        
+        The breakdown also has a semantic score: the cosine similarity (x100)
+        of the resume and job text embeddings. It is reported alongside the
+        others and does not count towards the overall score.
+        
+        Args:
+            resume_data: Parsed resume data
+            profile: Requirements compiled by compile_job_requirements
+            resume_vector: The resume's embedding, when matching it against many jobs
             
         Returns:
             Dictionary with matching scores and breakdown
@@ -626,22 +669,27 @@ class ResumeParser:
             education_score = 0
             overall_score = 0
             
-            # Skills matching
-            if 'skills' in resume_data and 'required_skills' in job_requirements:
-                resume_skills = [skill.lower() for skill in resume_data['skills']]
-                required_skills = [skill.lower() for skill in job_requirements['required_skills']]
-                
-                if required_skills:
-                    matched_skills = [skill for skill in required_skills if any(
-                        skill in resume_skill or resume_skill in skill 
-                        for resume_skill in resume_skills
-                    )]
-                    skills_score = (len(matched_skills) / len(required_skills)) * 100
+            resume_skill_ids = []
+            if profile.required_skills:
+                resume_skill_ids = [normalize_skill(skill) for skill in resume_data.get('skills', [])]
+            resume_skill_set = set(resume_skill_ids)
+            
+            # Skills matching: a required skill matches a resume skill containing it or contained in it
+            if 'skills' in resume_data and profile.required_skills is not None:
+                if profile.required_skills:
+                    matched_count = sum(
+                        1 for _, skill_id in profile.required_skills
+                        if skill_id in resume_skill_set or any(
+                            skill_id in resume_skill or resume_skill in skill_id
+                            for resume_skill in resume_skill_ids
+                        )
+                    )
+                    skills_score = (matched_count / len(profile.required_skills)) * 100
             
             # Experience matching
-            if 'total_experience' in resume_data and 'min_experience' in job_requirements:
+            if 'total_experience' in resume_data and profile.min_experience is not None:
                 candidate_exp = resume_data.get('total_experience', 0)
-                required_exp = job_requirements.get('min_experience', 0)
+                required_exp = profile.min_experience
                 
                 if required_exp == 0:
                     experience_score = 100
@@ -651,7 +699,7 @@ class ResumeParser:
                     experience_score = (candidate_exp / required_exp) * 100
             
             # Education matching (simplified)
-            if 'education' in resume_data and job_requirements.get('education_required', False):
+            if 'education' in resume_data and profile.education_required:
                 if resume_data['education']:
                     education_score = 100
                 else:
@@ -672,31 +720,47 @@ class ResumeParser:
                 education_score * weights['education']
             )
             
+            semantic_score = 0
+            if profile.embedding is not None:
+                if resume_vector is None:
+                    resume_vector = EMBEDDER.embed_resume(resume_data)
+                semantic_score = similarity(resume_vector, vector_from_bytes(profile.embedding)) * 100
+            
+            # Listed as matched when a resume skill contains the required one
+            matched_skills = []
+            missing_skills = []
+            for skill, skill_id in profile.required_skills or ():
+                if skill_id in resume_skill_set or any(skill_id in resume_skill for resume_skill in resume_skill_ids):
+                    matched_skills.append(skill)
+                else:
+                    missing_skills.append(skill)
+            
             return {
                 'overall_score': round(overall_score, 1),
                 'breakdown': {
                     'skills': round(skills_score, 1),
                     'experience': round(experience_score, 1),
-                    'education': round(education_score, 1)
+                    'education': round(education_score, 1),
+                    'semantic': round(semantic_score, 1)
                 },
-                'matched_skills': [skill for skill in job_requirements.get('required_skills', []) 
-                                 if any(skill.lower() in resume_skill.lower() 
-                                       for resume_skill in resume_data.get('skills', []))],
-                'missing_skills': [skill for skill in job_requirements.get('required_skills', [])
-                                 if not any(skill.lower() in resume_skill.lower() 
-                                           for resume_skill in resume_data.get('skills', []))],
+                'matched_skills': matched_skills,
+                'missing_skills': missing_skills,
                 'recommendation': self._get_match_recommendation(overall_score)
             }
             
         except Exception as e:
             logger.error(f"Error calculating job match: {str(e)}")
-            return {
-                'overall_score': 0,
-                'breakdown': {'skills': 0, 'experience': 0, 'education': 0},
-                'matched_skills': [],
-                'missing_skills': [],
-                'recommendation': 'Unable to calculate match'
-            }
+            return self._failed_match()
+    
+    @staticmethod
+    def _failed_match() -> Dict:
+        return {
+            'overall_score': 0,
+            'breakdown': {'skills': 0, 'experience': 0, 'education': 0, 'semantic': 0},
+            'matched_skills': [],
+            'missing_skills': [],
+            'recommendation': 'Unable to calculate match'
+        }
     
     def _get_match_recommendation(self, score: float) -> str:
         """Get recommendation based on matching score"""
@@ -0,0 +1,241 @@
+"""
+Skill extraction with a precompiled keyword matcher
+
+Skills come from two places: keywords of a known list found anywhere in
+the text as whole words, and the items of "Skills:" style sections. The
+keyword list used to be scanned one keyword at a time, a substring test
+and a regex search per keyword. SkillMatcher compiles the whole list into
+one regex shaped as a character trie instead, so a text is scanned once:
+at every word boundary the trie follows the text character by character
+and reports the longest keyword ending on a word boundary. Keywords that
+are prefixes of it ("react" in "react native") are checked at the same
+position, so the result is exactly the set the per-keyword scan found.
+
+SkillBatchExtractor runs many texts through the extractor for the batch
+endpoint, splitting large batches over a process pool.
+"""
+import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.job_profiles import normalize_skill
+from utils.lifecycle import register_post_fork
+
+logger = logging.getLogger(__name__)
+
+# (skill as reported, canonical skill id) pairs of one text
+SkillList = List[Tuple[str, str]]
+
+_SECTION_DELIMITERS = (',', '•', '◦', '▪', '\n', '|', ';')
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex matching any keyword, longest first, as a character trie"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[None] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(
+            (char, child) for char, child in node.items() if char is not None
+        )]
+        # A keyword ending here is tried after every longer one
+        if None in node:
+            branches.append(r'\b')
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """
+    Finds whole-word occurrences of lower-case keywords in one pass
+
+    Args:
+        keywords: Keywords in lower case
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keywords))
+        self.pattern = re.compile(r'\b(?=(' + _trie_pattern(self.keywords) + '))') if self.keywords else None
+        # Shorter keywords that can match where a longer one did
+        self.prefixes = MappingProxyType({
+            keyword: tuple(
+                (other, re.compile(r'\b' + re.escape(other) + r'\b'))
+                for other in self.keywords if other != keyword and keyword.startswith(other)
+            )
+            for keyword in self.keywords
+        })
+
+    def find(self, text_lower: str) -> List[str]:
+        """Keywords occurring in lower-case text, in order of first occurrence"""
+        found = {}
+        if self.pattern is None:
+            return []
+
+        for match in self.pattern.finditer(text_lower):
+            keyword = match.group(1)
+            found[keyword] = None
+            for prefix, prefix_pattern in self.prefixes[keyword]:
+                if prefix not in found and prefix_pattern.match(text_lower, match.start()):
+                    found[prefix] = None
+        return list(found)
+
+
+class SkillExtractor:
+    """
+    Extract skills from text: known keywords and the items of skills sections
+
+    Immutable after construction and safe to share between threads.
+
+    Args:
+        keywords: Known skills in lower case
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.matcher = SkillMatcher(keywords)
+        self.keywords = self.matcher.keywords
+        self.section_patterns = (
+            re.compile(r'(?:skills?|technical skills?|core competencies)[:\-\s]*(.*?)(?:\n\s*\n|\n[A-Z])', re.IGNORECASE | re.DOTALL),
+            re.compile(r'(?:technologies?|tools?)[:\-\s]*(.*?)(?:\n\s*\n|\n[A-Z])', re.IGNORECASE | re.DOTALL),
+            re.compile(r'(?:programming languages?)[:\-\s]*(.*?)(?:\n\s*\n|\n[A-Z])', re.IGNORECASE | re.DOTALL)
+        )
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Skills in the text, title-cased and without duplicates
+
+        Keyword skills come first in order of occurrence, then section items.
+        """
+        skills_found = [skill.title() for skill in self.matcher.find(text.lower())]
+
+        # Look for skills in specific sections
+        for pattern in self.section_patterns:
+            for match in pattern.finditer(text):
+                skills_found.extend(self._split_section(match.group(1)))
+
+        return list(dict.fromkeys(skills_found))
+
+    def extract_with_ids(self, text: str) -> SkillList:
+        """Skills in the text with their canonical ids, one per id"""
+        skills = {}
+        for skill in self.extract(text):
+            skills.setdefault(normalize_skill(skill), skill)
+        return [(skill, skill_id) for skill_id, skill in skills.items()]
+
+    @staticmethod
+    def _split_section(text: str) -> List[str]:
+        """Parse skills from a specific text section"""
+        skills = []
+
+        # Split by the first common delimiter present
+        for delimiter in _SECTION_DELIMITERS:
+            if delimiter in text:
+                for part in text.split(delimiter):
+                    skill = part.strip().strip('.,')
+                    if 1 < len(skill) < 30:  # Reasonable skill length
+                        skills.append(skill.title())
+                break
+
+        return skills
+
+
+def skill_frequencies(results: Iterable[SkillList]) -> List[Dict]:
+    """
+    Number of texts mentioning each skill, most frequent first
+
+    Returns:
+        Dicts of skill_id, skill (as first reported) and count
+    """
+    counts = {}
+    names = {}
+    for skills in results:
+        for skill, skill_id in skills:
+            counts[skill_id] = counts.get(skill_id, 0) + 1
+            names.setdefault(skill_id, skill)
+
+    return [
+        {'skill_id': skill_id, 'skill': names[skill_id], 'count': count}
+        for skill_id, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+
+# Per-process extractor of the pool workers, built by _init_worker()
+_worker_extractor: Optional[SkillExtractor] = None
+
+
+def _init_worker(keywords: Tuple[str, ...]):
+    global _worker_extractor
+    _worker_extractor = SkillExtractor(keywords)
+
+
+def _extract_chunk(texts: Sequence[str]) -> List[SkillList]:
+    return [_worker_extractor.extract_with_ids(text) for text in texts]
+
+
+class SkillBatchExtractor:
+    """
+    Extract skills from many texts, over a process pool for large batches
+
+    Args:
+        extractor: Extractor used in process, and whose keywords the workers load
+        workers: Pool processes (fewer than 2 extracts every batch in process)
+        parallel_min_texts: Smaller batches are extracted in process
+    """
+
+    def __init__(self, extractor: SkillExtractor, workers: int = 0, parallel_min_texts: int = 64):
+        self.extractor = extractor
+        self.workers = workers
+        self.parallel_min_texts = parallel_min_texts
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        register_post_fork(self._after_fork)
+
+    def extract(self, texts: Sequence[str]) -> List[SkillList]:
+        """Skills with canonical ids for each text, in order"""
+        if self.workers < 2 or len(texts) < self.parallel_min_texts:
+            return [self.extractor.extract_with_ids(text) for text in texts]
+
+        # A few chunks per worker even out texts of different lengths
+        chunks = min(len(texts), self.workers * 4)
+        bounds = [len(texts) * index // chunks for index in range(chunks + 1)]
+
+        try:
+            pool = self._get_pool()
+            futures = [pool.submit(_extract_chunk, texts[start:end]) for start, end in zip(bounds, bounds[1:])]
+            return [skills for future in futures for skills in future.result()]
+
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool next time
+            with self._pool_lock:
+                self._pool = None
+            raise
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Process pool started on first use from a fork server (see FileHandler._get_page_pool)"""
+        with self._pool_lock:
+            if self._pool is None:
+                if 'forkserver' in multiprocessing.get_all_start_methods():
+                    context = multiprocessing.get_context('forkserver')
+                    context.set_forkserver_preload([__name__])
+                else:
+                    context = multiprocessing.get_context('spawn')
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context,
+                    initializer=_init_worker, initargs=(self.extractor.keywords,)
+                )
+                logger.info(f"Started skill extraction pool with {self.workers} processes")
+            return self._pool
+
+    def _after_fork(self):
+        """A pool started before fork belongs to the parent process"""
+        self._pool = None
+        self._pool_lock = threading.Lock()
@@ -0,0 +1,106 @@
+"""AsyncServingApp driven through the ASGI callable"""
+import asyncio
+import threading
+
+from asgi import AsyncServingApp
+from utils.admission import AdmissionController
+
+
+class BlockingApp:
+    """WSGI app echoing the body; /slow blocks until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.paths = []
+
+    def __call__(self, environ, start_response):
+        self.paths.append(environ['PATH_INFO'])
+        if environ['PATH_INFO'] == '/slow':
+            self.release.wait(5)
+        body = environ['wsgi.input'].read()
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'ok:' + body]
+
+
+async def call(app, path, chunks=(b'',), disconnect=False):
+    """Send a request in body chunks, optionally disconnecting before the last; returns the sent messages"""
+    messages = [
+        {'type': 'http.request', 'body': chunk, 'more_body': index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    if disconnect:
+        messages[-1] = {'type': 'http.disconnect'}
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({'type': 'http', 'method': 'POST', 'path': path, 'headers': []}, receive, send)
+    return sent
+
+
+def serving_app(wsgi_app, max_queue=0, max_body_size=100):
+    controller = AdmissionController(max_concurrency=1, max_queue=max_queue, retry_after=3)
+    return AsyncServingApp(wsgi_app, controller, max_body_size=max_body_size, exempt_paths=['/ready'])
+
+
+async def wait_until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError('condition not reached')
+
+
+def test_full_queue_answers_429_with_retry_after_and_exempt_paths_bypass_it():
+    async def scenario():
+        wsgi_app = BlockingApp()
+        app = serving_app(wsgi_app)
+        slow = asyncio.ensure_future(call(app, '/slow'))
+        await wait_until(lambda: wsgi_app.paths == ['/slow'])
+
+        rejected = await call(app, '/parse')
+        # Exempt paths get an answer while the only parse slot is taken
+        probe = await call(app, '/ready')
+
+        wsgi_app.release.set()
+        served = await slow
+        return rejected, probe, served, app.controller.snapshot()
+
+    rejected, probe, served, snapshot = asyncio.run(scenario())
+
+    assert rejected[0]['status'] == 429
+    assert (b'retry-after', b'3') in rejected[0]['headers']
+    assert probe[0]['status'] == 200
+    assert served[0]['status'] == 200
+    assert snapshot['rejected_total'] == 1
+    assert snapshot['admitted_total'] == 1
+
+
+def test_oversized_body_answers_413():
+    wsgi_app = BlockingApp()
+    sent = asyncio.run(call(serving_app(wsgi_app, max_body_size=10), '/parse', chunks=(b'x' * 8, b'x' * 8)))
+
+    assert sent[0]['status'] == 413
+    assert wsgi_app.paths == []
+
+
+def test_disconnect_mid_upload_releases_the_admission_slot():
+    async def scenario():
+        wsgi_app = BlockingApp()
+        app = serving_app(wsgi_app)
+        dropped = await call(app, '/parse', chunks=(b'ab', b'cd'), disconnect=True)
+        # The one admission place is free again
+        served = await call(app, '/parse', chunks=(b'ab', b'cd'))
+        return wsgi_app.paths, dropped, served, app.controller.snapshot()
+
+    paths, dropped, served, snapshot = asyncio.run(scenario())
+
+    assert dropped == []
+    assert paths == ['/parse']
+    assert served[1]['body'] == b'ok:abcd'
+    assert snapshot['active'] == 0 and snapshot['queued'] == 0
+    assert snapshot['rejected_total'] == 0
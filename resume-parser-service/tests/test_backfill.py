@@ -0,0 +1,85 @@
+"""Backfill of stored resumes after extractor version bumps"""
+import random
+
+import pytest
+
+from benchmarks.concurrency_stress import resume_text
+from parsers.resume_parser import ResumeParser
+from utils.backfill import Backfill, stale_extractors
+from utils.resume_store import ResumeStore
+
+VERSIONS = dict(ResumeParser.EXTRACTOR_VERSIONS)
+INPUTS = dict(ResumeParser.EXTRACTOR_INPUTS)
+
+
+def test_stale_extractor_marks_its_readers_stale():
+    recorded = dict(VERSIONS, experience=VERSIONS['experience'] - 1)
+    assert stale_extractors(recorded, VERSIONS, INPUTS) == ('experience', 'total_experience')
+
+    recorded = dict(VERSIONS, total_experience=VERSIONS['total_experience'] - 1)
+    assert stale_extractors(recorded, VERSIONS, INPUTS) == ('total_experience',)
+
+    assert stale_extractors(VERSIONS, VERSIONS, INPUTS) == ()
+    assert stale_extractors(None, VERSIONS, INPUTS) == tuple(VERSIONS)
+
+
+def test_readers_of_readers_are_stale():
+    versions = {'a': 2, 'b': 1, 'c': 1, 'd': 1}
+    inputs = {'c': ('b',), 'b': ('a',)}
+    assert stale_extractors({'a': 1, 'b': 1, 'c': 1, 'd': 1}, versions, inputs) == ('a', 'b', 'c')
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResumeStore(str(tmp_path / 'resumes.db'))
+    rng = random.Random(7)
+    # Parsed before the skills and experience extractors changed
+    recorded = dict(VERSIONS, skills=0, experience=0)
+    for index in range(6):
+        store.save(f'hash-{index}', {'skills': [], 'experience': []}, resume_text(rng),
+                   metadata={'extractor_versions': recorded})
+    yield store
+    store.close()
+
+
+def backfill(store):
+    return Backfill(store, VERSIONS, INPUTS, cpu_budget=1, embed=False, batch_size=4, nice=0)
+
+
+def test_run_reprocesses_stale_extractors_once(store):
+    assert backfill(store).pending() == 6
+
+    stats = backfill(store).run()
+    assert (stats['written'], stats['skipped'], stats['failed']) == (6, 0, 0)
+    assert {name: runs for name, runs in stats['extractor_runs'].items() if runs} == {
+        'skills': 6, 'experience': 6, 'total_experience': 6
+    }
+
+    stored = store.get(1)
+    assert stored['skills'] and stored['parsed_data']['skills'] == stored['skills']
+    assert 'total_experience' in stored['parsed_data']
+    assert stored['metadata']['extractor_versions'] == VERSIONS
+
+    # Idempotent: a second run finds nothing to do
+    assert backfill(store).pending() == 0
+    stats = backfill(store).run()
+    assert (stats['written'], stats['skipped'], stats['failed']) == (0, 0, 0)
+    assert not any(stats['extractor_runs'].values())
+
+
+def test_resume_uploaded_during_the_run_is_left_alone(store, monkeypatch):
+    save_backfill = store.save_backfill
+    uploaded = {'skills': ['Uploaded'], 'experience': []}
+
+    def upload_then_save(updates):
+        # Re-uploaded after the backfill read it, before the first batch is written
+        if store.get(1)['parsed_data'] != uploaded:
+            store.save('hash-0', uploaded, 'Uploaded', metadata={'extractor_versions': VERSIONS})
+        return save_backfill(updates)
+
+    monkeypatch.setattr(store, 'save_backfill', upload_then_save)
+    stats = backfill(store).run()
+
+    assert (stats['written'], stats['skipped']) == (5, 1)
+    assert store.get(1)['parsed_data'] == uploaded
+    assert backfill(store).pending() == 0
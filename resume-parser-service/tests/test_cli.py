@@ -0,0 +1,76 @@
+"""Bulk parse command: checkpointed resume and error handling"""
+import json
+import os
+import random
+import sqlite3
+
+import pytest
+
+import cli
+from benchmarks.concurrency_stress import resume_text
+from utils.resume_store import ResumeStore
+
+
+@pytest.fixture
+def resumes(tmp_path):
+    directory = tmp_path / 'resumes'
+    directory.mkdir()
+    rng = random.Random(1)
+    for index in range(5):
+        (directory / f'resume_{index}.txt').write_text(resume_text(rng), encoding='utf-8')
+    return str(directory)
+
+
+def parse(resumes, output, *extra):
+    return cli.main(['parse', '--input', resumes, '--output', output, '--workers', '1', *extra])
+
+
+def records(output):
+    with open(output, 'rb') as file:
+        return [json.loads(line) for line in file]
+
+
+def test_resume_after_torn_output_and_checkpoint_lines(resumes, tmp_path):
+    output = str(tmp_path / 'parsed.jsonl')
+    assert parse(resumes, output) == 0
+    expected = records(output)
+    assert len(expected) == 5 and all(record['success'] for record in expected)
+
+    # Crash while writing the third record: its output and checkpoint lines are torn
+    with open(output, 'rb') as file:
+        lines = file.readlines()
+    with open(output, 'wb') as file:
+        file.write(b''.join(lines[:3]) + lines[3][:20])
+    with open(f'{output}.checkpoint', 'rb') as file:
+        checkpoint_lines = file.readlines()
+    with open(f'{output}.checkpoint', 'wb') as file:
+        file.write(b''.join(checkpoint_lines[:2]) + checkpoint_lines[2][:3])
+
+    assert parse(resumes, output) == 0
+
+    resumed = records(output)
+    assert [record['path'] for record in resumed] == [record['path'] for record in expected]
+    assert [record['data']['parsed_data'] for record in resumed] == [
+        record['data']['parsed_data'] for record in expected
+    ]
+    checkpoint = cli.Checkpoint(f'{output}.checkpoint')
+    checkpoint.load()
+    assert checkpoint.done == {record['path'] for record in expected}
+    assert checkpoint.output_offset == os.path.getsize(output)
+    assert checkpoint.size == os.path.getsize(checkpoint.path)
+
+
+def test_store_error_surfaces_instead_of_pool_error(resumes, tmp_path, monkeypatch):
+    def fail(self, *args, **kwargs):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(ResumeStore, 'save_many', fail)
+    output = str(tmp_path / 'parsed.jsonl')
+
+    with pytest.raises(sqlite3.OperationalError, match='database is locked'):
+        parse(resumes, output, '--store', str(tmp_path / 'resumes.db'), '--store-batch-size', '2')
+
+    # Nothing unstored was checkpointed
+    checkpoint = cli.Checkpoint(f'{output}.checkpoint')
+    checkpoint.load()
+    assert checkpoint.done == set()
@@ -0,0 +1,15 @@
+"""Shared parsing core under concurrent use (see benchmarks/concurrency_stress.py)"""
+import logging
+
+from benchmarks.concurrency_stress import run
+
+
+def test_concurrent_parses_match_serial_results():
+    logging.disable(logging.ERROR)
+    try:
+        stats = run(input_dir=None, synthetic=20, parses=200, threads=8)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert stats['inputs'] == 20
+    assert stats['mismatches'] == []
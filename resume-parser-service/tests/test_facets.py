@@ -0,0 +1,118 @@
+"""FacetIndex counts and filters against a count over the raw candidates"""
+import random
+from collections import Counter
+
+import pytest
+
+from utils.facets import FACETS, SMALL_MAX, FacetIndex, InvalidFacetQueryError, experience_band
+
+SKILLS = [f'skill{index}' for index in range(40)]
+SKILL_WEIGHTS = [1 / (index + 1) for index in range(40)]
+LANGUAGES = ['english', 'spanish', 'german', 'french']
+BANDS = ['0-1', '1-3', '3-5', '5-10', '10+']
+
+# (filter, the same filter as a predicate over a candidate's facet values)
+FILTERS = [
+    (None, lambda values: True),
+    ({'skill': 'skill0'}, lambda values: 'skill0' in values['skill']),
+    ({'skill': 'Skill7'}, lambda values: 'skill7' in values['skill']),
+    ({'skill': ['free3', 'free5']}, lambda values: values['skill'] & {'free3', 'free5'}),
+    ({'user': 'u3'}, lambda values: 'u3' in values['user']),
+    (
+        {'and': [{'skill': 'skill1'}, {'or': [{'experience': '5-10'}, {'experience': '10+'}]},
+                 {'not': {'education': 'no'}}]},
+        lambda values: 'skill1' in values['skill'] and values['experience'] & {'5-10', '10+'}
+        and 'no' not in values['education']
+    ),
+    ([{'language': 'german'}, {'not': {'skill': 'skill0'}}],
+     lambda values: 'german' in values['language'] and 'skill0' not in values['skill']),
+    ({'skill': 'unknown'}, lambda values: False),
+]
+
+
+def candidate(rng):
+    return {
+        'skill': set(rng.choices(SKILLS, SKILL_WEIGHTS, k=6)) | {f'free{rng.randrange(500)}'},
+        'experience': {rng.choice(BANDS)},
+        'education': {'yes' if rng.random() < 0.8 else 'no'},
+        'certifications': {'yes' if rng.random() < 0.3 else 'no'},
+        'language': set(rng.sample(LANGUAGES, rng.randint(1, 2))),
+        'user': {f'u{rng.randrange(50)}'}
+    }
+
+
+def naive_counts(candidates, predicate, limit):
+    matched = [values for values in candidates.values() if predicate(values)]
+    counts = {}
+    for facet in FACETS:
+        counter = Counter(value for values in matched for value in values[facet])
+        ranked = sorted(counter.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        counts[facet] = [{'value': value, 'count': count} for value, count in ranked]
+    return len(matched), counts
+
+
+def check(index, candidates, limit=20):
+    for expression, predicate in FILTERS:
+        matched, counts = index.counts(expression, limit=limit)
+        total, expected = naive_counts(candidates, predicate, limit)
+        assert len(matched) == total, expression
+        assert sorted(matched.ids()) == sorted(i for i, values in candidates.items() if predicate(values))
+        assert counts == expected, expression
+
+
+@pytest.fixture(scope='module')
+def pool():
+    rng = random.Random(7)
+    # Ids spread over two 65536-id chunks
+    candidates = {1 + index * 7: candidate(rng) for index in range(12000)}
+    index = FacetIndex()
+    items = list(candidates.items())
+    for start in range(0, len(items), 1000):
+        index.update(items[start:start + 1000])
+    return rng, index, candidates
+
+
+def test_pool_has_bitmap_and_tail_values(pool):
+    _, index, _ = pool
+    # Both representations are exercised: common skills are bitmaps, the rest in the tail
+    assert any(len(bitmap) > SMALL_MAX for bitmap in index.bitmaps['skill'].values())
+    assert len(index.tails['skill']) > 0
+
+
+@pytest.mark.parametrize('limit', [1, 5, 20, None])
+def test_counts_match_naive_count(pool, limit):
+    _, index, candidates = pool
+    check(index, candidates, limit)
+
+
+def test_counts_follow_replacements_and_removals(pool):
+    rng, index, candidates = pool
+    replaced = {candidate_id: candidate(rng) for candidate_id in rng.sample(sorted(candidates), 300)}
+    added = {100000 + candidate_id: candidate(rng) for candidate_id in range(50)}
+    index.update(list(replaced.items()) + list(added.items()))
+    candidates.update(replaced)
+    candidates.update(added)
+
+    removed = rng.sample(sorted(candidates), 200)
+    index.remove(removed)
+    for candidate_id in removed:
+        del candidates[candidate_id]
+
+    assert len(index) == len(candidates)
+    check(index, candidates)
+
+
+@pytest.mark.parametrize('expression', [
+    {'bogus': 'x'}, {'skill': 1}, {'and': {}}, 'python', {'skill': 'a', 'user': 'b'}
+])
+def test_malformed_filters_are_rejected(pool, expression):
+    _, index, _ = pool
+    with pytest.raises(InvalidFacetQueryError):
+        index.counts(expression)
+
+
+def test_experience_bands_include_their_lower_bound():
+    years = [None, 'n/a', 0, 0.5, 1, 2.5, 3, 9.9, 10, 30]
+    assert [experience_band(value) for value in years] == [
+        '0-1', '0-1', '0-1', '0-1', '1-3', '1-3', '3-5', '5-10', '10+', '10+'
+    ]
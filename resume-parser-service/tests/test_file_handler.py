@@ -0,0 +1,81 @@
+"""Text file decoding: byte order marks, UTF-8 and single-byte code pages"""
+import codecs
+
+import pytest
+
+from utils import file_handler
+from utils.file_handler import FileHandler, TXT_MMAP_MIN_BYTES, decode_text
+
+POLISH = (
+    "Jan Kowalski\n"
+    "Programista Python, Kraków\n\n"
+    "Doświadczenie zawodowe\n"
+    "2019 - obecnie: Starszy programista w firmie Łódzkie Systemy Informatyczne sp. z o.o.\n"
+    "Odpowiedzialność za rozwój usług sieciowych, współpraca z zespołem analityków,\n"
+    "przeglądy kodu i wdrażanie rozwiązań chmurowych. Zarządzanie bazą danych PostgreSQL.\n\n"
+    "Wykształcenie\n"
+    "Politechnika Gdańska, Wydział Elektroniki, Telekomunikacji i Informatyki, magister inżynier.\n\n"
+    "Umiejętności: Python, Django, SQL, język angielski (biegły), język niemiecki (podstawowy).\n"
+    "Zainteresowania: żeglarstwo, góry, fotografia, książki źródłowe o historii ślązaków.\n"
+)
+SPANISH = "Experiencia: ingeniero de software en España, años de diseño, gestión de proyectos, niño.\n"
+FRENCH = "Expérience professionnelle : développeur « senior » à Montréal — équipe façade, naïve café.\n"
+
+requires_detector = pytest.mark.skipif(file_handler.detect_charset is None, reason='charset_normalizer not installed')
+
+
+@pytest.mark.parametrize('bom, encoding', [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+])
+def test_byte_order_mark(bom, encoding):
+    data = bom + POLISH.encode(encoding.replace('-sig', ''))
+    assert decode_text(data) == (POLISH, encoding)
+
+
+def test_utf8():
+    assert decode_text(POLISH.encode('utf-8')) == (POLISH, 'utf-8')
+    assert decode_text(b'') == ('', 'utf-8')
+
+
+@requires_detector
+@pytest.mark.parametrize('encoding', ['cp1250', 'iso8859_2'])
+def test_central_european_code_pages_are_kept(encoding):
+    assert decode_text(POLISH.encode(encoding)) == (POLISH, encoding)
+
+
+@requires_detector
+@pytest.mark.parametrize('text', [SPANISH, FRENCH])
+def test_western_text_is_cp1252(text):
+    assert decode_text(text.encode('cp1252')) == (text, 'cp1252')
+
+
+def test_fallback_without_detector(monkeypatch):
+    monkeypatch.setattr(file_handler, 'detect_charset', None)
+    assert decode_text(SPANISH.encode('cp1252')) == (SPANISH, 'cp1252')
+    # 0x81 is undefined in cp1252
+    assert decode_text(b'caf\xe9 \x81') == ('caf\xe9 \x81', 'latin-1')
+
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'cp1250'])
+def test_large_file_is_memory_mapped(tmp_path, monkeypatch, encoding):
+    if encoding != 'utf-8' and file_handler.detect_charset is None:
+        pytest.skip('charset_normalizer not installed')
+
+    buffers = []
+    real_decode = file_handler.decode_text
+
+    def decode(data):
+        buffers.append(type(data))
+        return real_decode(data)
+
+    monkeypatch.setattr(file_handler, 'decode_text', decode)
+    text = POLISH * (TXT_MMAP_MIN_BYTES // len(POLISH.encode(encoding)) + 1)
+    path = tmp_path / 'resume.txt'
+    path.write_bytes(text.encode(encoding))
+
+    assert FileHandler()._extract_from_txt(str(path)) == (text.strip(), encoding)
+    assert buffers == [file_handler.mmap.mmap]
@@ -0,0 +1,99 @@
+"""Zip archive checks and the extraction memory guard"""
+import cProfile
+import os
+import threading
+import time
+import zipfile
+
+import pytest
+
+from utils.guardrails import (
+    MEMORY_LIMIT, ZIP_ENTRY_SIZE, ZIP_RATIO, ZIP_TOTAL_SIZE, DocumentRejectedError, MemoryGuard, check_zip_archive
+)
+
+MB = 1024 * 1024
+
+
+def write_zip(path, entries):
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return str(path)
+
+
+@pytest.fixture
+def no_inflating(monkeypatch):
+    """Fail if a check reads any entry data instead of the central directory"""
+    def refuse(*args, **kwargs):
+        raise AssertionError('archive entry was inflated')
+
+    monkeypatch.setattr(zipfile.ZipExtFile, 'read', refuse)
+    monkeypatch.setattr(zipfile.ZipExtFile, 'read1', refuse)
+
+
+def check(path, max_ratio=100.0, max_entry_bytes=50 * MB, max_total_bytes=100 * MB):
+    with pytest.raises(DocumentRejectedError) as raised:
+        check_zip_archive(path, max_ratio, max_entry_bytes, max_total_bytes)
+    return raised.value.code
+
+
+def test_high_ratio_entry_is_rejected(tmp_path, no_inflating):
+    path = write_zip(tmp_path / 'bomb.docx', {'word/document.xml': b'\0' * (4 * MB)})
+    assert check(path) == ZIP_RATIO
+
+
+def test_oversized_entry_and_archive_are_rejected(tmp_path, no_inflating):
+    data = os.urandom(MB)
+    path = write_zip(tmp_path / 'large.docx', {f'word/media/image{index}.bin': data for index in range(3)})
+
+    assert check(path, max_entry_bytes=MB // 2) == ZIP_ENTRY_SIZE
+    assert check(path, max_total_bytes=2 * MB) == ZIP_TOTAL_SIZE
+
+
+def test_ordinary_archive_and_non_zip_pass(tmp_path, no_inflating):
+    path = write_zip(tmp_path / 'resume.docx', {'word/document.xml': b'<w:t>Jane Doe</w:t>' * 100})
+    check_zip_archive(path, 100.0, 50 * MB, 100 * MB)
+
+    legacy = tmp_path / 'resume.doc'
+    legacy.write_bytes(b'\xd0\xcf\x11\xe0' + b'\0' * 512)
+    check_zip_archive(str(legacy), 100.0, 50 * MB, 100 * MB)
+
+
+@pytest.mark.parametrize('headroom_mb', [0, 1024])
+def test_guard_reports_memory_error_as_rejection(headroom_mb):
+    guard = MemoryGuard(headroom_mb=headroom_mb)
+
+    with pytest.raises(DocumentRejectedError) as raised:
+        with guard.guard('pdfminer'):
+            raise MemoryError()
+
+    assert raised.value.code == MEMORY_LIMIT
+    assert 'pdfminer' in str(raised.value)
+
+
+def test_guard_stops_extraction_past_its_headroom():
+    guard = MemoryGuard(headroom_mb=64, interval=0.01)
+    if not guard.enabled:
+        pytest.skip('resident size is not available on this platform')
+
+    chunks = []
+    with pytest.raises(DocumentRejectedError) as raised:
+        with guard.guard('test'):
+            for _ in range(1024):
+                chunks.append(bytearray(MB))
+                time.sleep(0.001)
+
+    assert raised.value.code == MEMORY_LIMIT
+    assert len(chunks) < 1024
+    chunks.clear()
+
+    # Nothing is watched or pending once the block is over
+    with guard.guard('test'):
+        time.sleep(0.05)
+    assert guard._limits == {}
+
+    # The interpreter is left as it was: profiling a call still returns
+    profiled = threading.Thread(target=cProfile.Profile().runcall, args=(lambda: None,), daemon=True)
+    profiled.start()
+    profiled.join(5)
+    assert not profiled.is_alive()
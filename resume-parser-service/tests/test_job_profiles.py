@@ -0,0 +1,91 @@
+"""Job matching scores and the registry of compiled job profiles"""
+import pytest
+
+from parsers.resume_parser import ResumeParser
+from utils.job_profiles import JobProfileRegistry
+from utils.resume_store import ResumeStore, StaleVersionError
+
+RESUME = {'skills': ['Python', 'SQL'], 'total_experience': 4, 'education': []}
+
+
+@pytest.fixture(scope='module')
+def parser():
+    return ResumeParser()
+
+
+def test_repeated_required_skills_each_count(parser):
+    match = parser.calculate_job_match(RESUME, {'required_skills': ['Python', 'python', 'Go'], 'min_experience': 3})
+
+    assert match['breakdown']['skills'] == 66.7
+    assert match['overall_score'] == 83.3
+    assert match['recommendation'] == 'Excellent match - Highly recommended'
+    assert match['matched_skills'] == ['Python', 'python']
+    assert match['missing_skills'] == ['Go']
+
+
+def test_negative_min_experience_is_met(parser):
+    match = parser.calculate_job_match(RESUME, {'required_skills': ['Python'], 'min_experience': -1})
+
+    assert match['breakdown']['experience'] == 100
+    assert match['overall_score'] == 100
+
+
+def test_registered_job_scores_like_inline_requirements(parser):
+    requirements = {'required_skills': ['Python', 'python', 'Go'], 'min_experience': 5, 'education_required': True}
+    profile = JobProfileRegistry().register('job', requirements)
+
+    inline = parser.calculate_job_match(RESUME, requirements)
+    assert parser.match_job_profile(RESUME, profile) == inline
+
+
+def test_versions_increase_and_stale_writes_are_rejected():
+    registry = JobProfileRegistry()
+
+    assert registry.register('job', {'required_skills': ['Python']}).version == 1
+    assert registry.register('job', {'required_skills': ['Go']}).version == 2
+    assert registry.register('job', {'required_skills': ['Rust']}, version=10).version == 10
+
+    # Replaying the current version is accepted, changing it is not
+    assert registry.register('job', {'required_skills': ['Rust']}, version=10).version == 10
+    with pytest.raises(StaleVersionError):
+        registry.register('job', {'required_skills': ['Java']}, version=10)
+    with pytest.raises(StaleVersionError):
+        registry.register('job', {'required_skills': ['Java']}, version=3)
+
+    assert registry.get('job').to_dict()['required_skills'] == ['Rust']
+
+
+def test_least_recently_used_profile_is_evicted():
+    registry = JobProfileRegistry(max_profiles=2)
+    registry.register('a', {'required_skills': ['Python']})
+    registry.register('b', {'required_skills': ['Go']})
+
+    assert registry.get('a') is not None
+    registry.register('c', {'required_skills': ['Rust']})
+
+    assert len(registry) == 2
+    assert registry.get('b') is None
+    assert registry.get('a') is not None and registry.get('c') is not None
+
+
+def test_workers_sharing_a_store_see_new_versions(tmp_path):
+    store = ResumeStore(str(tmp_path / 'resumes.db'))
+    first, second = JobProfileRegistry(max_profiles=1, store=store), JobProfileRegistry(max_profiles=1, store=store)
+    try:
+        first.register('job', {'required_skills': ['Python']})
+        assert second.get('job').to_dict()['required_skills'] == ['Python']
+
+        first.register('job', {'required_skills': ['Go']})
+        profile = second.get('job')
+        assert (profile.version, profile.to_dict()['required_skills']) == (2, ['Go'])
+
+        with pytest.raises(StaleVersionError):
+            second.register('job', {'required_skills': ['Rust']}, version=1)
+
+        # Evicted from the worker's cache, but still stored
+        second.get('other')
+        second.register('other', {'required_skills': ['Rust']})
+        assert len(second) == 1
+        assert second.get('job').version == 2
+    finally:
+        store.close()
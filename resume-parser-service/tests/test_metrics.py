@@ -0,0 +1,51 @@
+"""Per-thread metric shards"""
+import threading
+
+from utils.metrics import Counter, Histogram
+
+
+def run_threads(target, count):
+    for _ in range(count):
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+
+
+def test_shards_of_exited_threads_are_folded_without_a_scrape():
+    counter = Counter('test_requests_total', 'Requests', labelnames=('status',))
+    histogram = Histogram('test_seconds', 'Durations', buckets=(0.1, 1.0))
+
+    def request():
+        counter.inc(status='ok')
+        histogram.observe(0.5)
+
+    run_threads(request, 1000)
+
+    assert len(counter._shards) < 2 * Counter.FOLD_MIN_SHARDS
+    assert len(histogram._shards) < 2 * Histogram.FOLD_MIN_SHARDS
+    assert counter._collect_values() == {('ok',): 1000}
+    assert histogram._collect_values() == {(): [[0, 1000, 0], 500.0, 1000]}
+
+
+def test_live_threads_keep_their_shards():
+    counter = Counter('test_live_total', 'Live')
+    started = threading.Barrier(Counter.FOLD_MIN_SHARDS + 11)
+    finish = threading.Event()
+
+    def worker():
+        counter.inc()
+        started.wait()
+        finish.wait(5)
+        counter.inc()
+
+    threads = [threading.Thread(target=worker) for _ in range(Counter.FOLD_MIN_SHARDS + 10)]
+    for thread in threads:
+        thread.start()
+    started.wait()
+
+    assert counter._collect_values() == {(): len(threads)}
+    finish.set()
+    for thread in threads:
+        thread.join()
+    assert counter._collect_values() == {(): 2 * len(threads)}
+    assert counter._shards == []
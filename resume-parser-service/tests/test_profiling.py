@@ -0,0 +1,39 @@
+"""Explicitly profiled requests keep the status and headers of the view's response"""
+import io
+
+import pytest
+
+import app as service
+from utils.scheduler import FairScheduler
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(service, 'parse_scheduler', FairScheduler(1, timeout=0.2))
+    monkeypatch.setattr(service.request_profiler, 'admin_token', 'secret')
+    monkeypatch.setattr(service.request_profiler, 'dump_dir', str(tmp_path / 'profiles'))
+    monkeypatch.setattr(service.request_profiler, 'sample_rate', 0)
+    return service.app.test_client()
+
+
+def test_profiled_queue_timeout_keeps_retry_after(client):
+    service.parse_scheduler.acquire('holder')
+    try:
+        response = client.post(
+            '/api/parse-resume',
+            data={'file': (io.BytesIO(b'Jane Doe\nPython developer'), 'resume.txt')},
+            headers={'X-Profile': '1', 'X-Admin-Token': 'secret'}
+        )
+    finally:
+        service.parse_scheduler.release('holder')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(service.app.config['ASYNC_RETRY_AFTER'])
+    payload = response.get_json()
+    assert payload['success'] is False
+    assert 'dump_path' in payload['profile']
+
+
+def test_profiling_requires_admin_token(client):
+    response = client.post('/api/parse-resume', headers={'X-Profile': '1', 'X-Admin-Token': 'wrong'})
+    assert response.status_code == 403
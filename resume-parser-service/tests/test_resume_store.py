@@ -0,0 +1,85 @@
+"""Resume store: query escaping, upserts and backfill writes"""
+import pytest
+
+from utils.resume_store import InvalidQueryError, ResumeStore, build_match_query
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResumeStore(str(tmp_path / 'resumes.db'))
+    yield store
+    store.close()
+
+
+def parsed(name, skills):
+    return {'personal_info': {'name': name}, 'skills': skills}
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('python OR java', '"python" AND "OR" AND "java"'),
+    ('NOT sql AND go', '"NOT" AND "sql" AND "AND" AND "go"'),
+    ('NEAR(spark hadoop)', '"NEAR spark" AND "hadoop"'),
+    ('"machine learning', '"machine learning"'),
+    ('name:john', '"name john"'),
+    ('-sql (go)', '"sql" AND "go"'),
+    ('react*', '"react"*'),
+    ('node.js C++ c#', '"node js" AND "C++" AND "c#"'),
+])
+def test_operators_are_quoted(query, expected):
+    assert build_match_query(query) == expected
+
+
+@pytest.mark.parametrize('query', ['', '   ', '"" * - :', None])
+def test_query_without_words_is_rejected(query):
+    with pytest.raises(InvalidQueryError):
+        build_match_query(query)
+
+
+def test_operator_words_are_searched_as_text(store):
+    store.save('a', parsed('Ann', ['Python']), 'Python OR Java developer')
+    store.save('b', parsed('Bob', ['Java']), 'Java developer')
+
+    assert [result['name'] for result in store.search('python OR java')] == ['Ann']
+    assert [result['name'] for result in store.search('name:ann')] == []
+
+
+def test_upsert_by_hash_and_user(store):
+    first = store.save('hash', parsed('Ann', ['Python']), 'Python', user_id='u1')
+    again = store.save('hash', parsed('Ann Lee', ['Go']), 'Go', user_id='u1')
+    other = store.save('hash', parsed('Ann', ['Python']), 'Python', user_id='u2')
+
+    assert again == first
+    assert other != first
+    assert store.count() == 2
+    assert store.get(first)['name'] == 'Ann Lee'
+    assert store.get(first)['skills'] == ['Go']
+    assert [row['user_id'] for row in store.find_by_hash('hash')] == ['u1', 'u2']
+
+
+def test_save_backfill_compare_and_swap(store):
+    resume_id = store.save('hash', parsed('Ann', ['Python']), 'Python developer')
+    read = store.stale_resumes({'skills': 1})[0]
+    update = {
+        'resume_id': resume_id,
+        'read_updated_at': read['updated_at'],
+        'name': read['name'],
+        'skills': read['skills'],
+        'parsed_data': parsed('Ann', ['Python', 'SQL']),
+        'metadata': {'extractor_versions': {'skills': 1}}
+    }
+
+    # Re-uploaded after the read: the backfill must not overwrite it
+    store.save('hash', parsed('Ann', ['Rust']), 'Rust developer')
+    assert store.save_backfill([update]) == 0
+    assert store.get(resume_id)['skills'] == ['Rust']
+
+    read = store.stale_resumes({'skills': 1})[0]
+    update['read_updated_at'] = read['updated_at']
+    update['skills'] = read['skills']
+    assert store.save_backfill([update]) == 1
+    assert store.get(resume_id)['skills'] == ['Python', 'SQL']
+    assert [result['resume_id'] for result in store.search('sql')] == [resume_id]
+
+    # The write changed updated_at, so replaying it is a no-op
+    assert store.save_backfill([update]) == 0
+    assert store.count_stale({'skills': 1}) == 0
@@ -0,0 +1,83 @@
+"""Slot ordering of FairScheduler"""
+import threading
+import time
+
+from utils.scheduler import BULK, INTERACTIVE, FairScheduler
+
+
+def _queue(scheduler, granted, tenant, lane):
+    """Start a parse that records its grant, once it is queued behind the held slot"""
+    queued = scheduler.snapshot()['lanes'][lane]['queued']
+
+    def parse():
+        with scheduler.slot(tenant, lane):
+            granted.append((tenant, lane))
+
+    thread = threading.Thread(target=parse)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while scheduler.snapshot()['lanes'][lane]['queued'] == queued:
+        assert time.monotonic() < deadline, 'parse was not queued'
+        time.sleep(0.001)
+    return thread
+
+
+def _run(scheduler, parses):
+    """Queue (tenant, lane) parses in order behind one held slot, and return the grant order"""
+    granted = []
+    scheduler.acquire('holder')
+    threads = [_queue(scheduler, granted, tenant, lane) for tenant, lane in parses]
+    scheduler.release('holder')
+    for thread in threads:
+        thread.join(5)
+    assert len(granted) == len(parses)
+    return granted
+
+
+def test_single_parse_does_not_wait_behind_a_tenants_backlog():
+    scheduler = FairScheduler(max_concurrency=1)
+    granted = _run(scheduler, [('importer', INTERACTIVE)] * 6 + [('seeker', INTERACTIVE)])
+
+    assert ('seeker', INTERACTIVE) in granted[:2]
+
+
+def test_tenants_alternate_in_proportion_to_their_weights():
+    scheduler = FairScheduler(max_concurrency=1, tenant_weights={'a': 2.0})
+    granted = _run(scheduler, [('a', INTERACTIVE)] * 6 + [('b', INTERACTIVE)] * 6)
+
+    # a finishes a parse every half unit of virtual time, b every unit
+    assert [tenant for tenant, _ in granted[:6]].count('a') == 4
+
+
+def test_interactive_lane_overtakes_bulk_backlog():
+    scheduler = FairScheduler(max_concurrency=1)
+    granted = _run(scheduler, [('importer', BULK)] * 10 + [('seeker', INTERACTIVE)] * 4)
+
+    lanes = [lane for _, lane in granted]
+    # Interactive work gets four slots for each bulk one, and bulk still moves
+    assert lanes[:6].count(INTERACTIVE) == 4
+    assert BULK in lanes[:6]
+
+
+def test_tenant_cap_leaves_slots_to_other_tenants():
+    scheduler = FairScheduler(max_concurrency=2, tenant_max_concurrency=1)
+    scheduler.acquire('a')
+    waited = []
+
+    def parse(tenant):
+        waited.append((tenant, scheduler.acquire(tenant)))
+
+    first = threading.Thread(target=parse, args=('a',))
+    first.start()
+    second = threading.Thread(target=parse, args=('b',))
+    second.start()
+    second.join(5)
+
+    # b runs next to a's first parse; a's second waits for it
+    assert [tenant for tenant, _ in waited] == ['b']
+    scheduler.release('a')
+    first.join(5)
+    assert sorted(tenant for tenant, _ in waited) == ['a', 'b']
+    scheduler.release('a')
+    scheduler.release('b')
+    assert scheduler.snapshot()['active'] == 0
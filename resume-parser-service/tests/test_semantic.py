@@ -0,0 +1,62 @@
+"""IVFIndex search against exhaustive scoring"""
+import numpy as np
+
+from utils.semantic import IVFIndex
+
+DIM = 64
+
+
+def clustered_vectors(rng, count, clusters=40):
+    centers = rng.standard_normal((clusters, DIM))
+    vectors = centers[rng.integers(clusters, size=count)] + 0.5 * rng.standard_normal((count, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def build(vectors, **options):
+    index = IVFIndex(DIM, **options)
+    for key, vector in enumerate(vectors):
+        index.add(key, vector, tag=key % 2)
+    return index
+
+
+def test_ivf_recall_against_exact_search():
+    rng = np.random.default_rng(1)
+    vectors = clustered_vectors(rng, 4000)
+    queries = clustered_vectors(rng, 50)
+    ivf = build(vectors, exact_max=1000, probes=8)
+    exact = build(vectors, exact_max=len(vectors))
+
+    found = 0
+    for query in queries:
+        results, method = ivf.search(query, k=10)
+        expected, expected_method = exact.search(query, k=10)
+        assert (method, expected_method) == ('ivf', 'exact')
+        found += len({key for key, _ in results} & {key for key, _ in expected})
+
+    assert found / (10 * len(queries)) >= 0.9
+
+
+def test_exact_search_is_ordered_and_filters_by_tag():
+    rng = np.random.default_rng(2)
+    vectors = clustered_vectors(rng, 500)
+    index = build(vectors)
+
+    results, method = index.search(vectors[3], k=5, tag=1)
+    scores = [score for _, score in results]
+    assert method == 'exact'
+    assert results[0][0] == 3
+    assert scores == sorted(scores, reverse=True)
+    assert all(key % 2 == 1 for key, _ in results)
+    assert index.search(vectors[3], k=5, tag='missing') == ([], 'exact')
+
+
+def test_replaced_vector_is_found_under_its_key():
+    rng = np.random.default_rng(3)
+    vectors = clustered_vectors(rng, 2000)
+    index = build(vectors, exact_max=500)
+    index.search(vectors[0], k=1)
+
+    index.add(0, vectors[1500], tag=0)
+    keys = [key for key, _ in index.search(vectors[1500], k=2)[0]]
+    assert sorted(keys) == [0, 1500]
+    assert len(index) == 2000
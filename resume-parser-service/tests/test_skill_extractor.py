@@ -0,0 +1,48 @@
+"""SkillMatcher against the per-keyword scan it replaced"""
+import random
+import re
+
+from parsers.skill_extractor import SkillExtractor, SkillMatcher
+
+KEYWORDS = [
+    'python', 'java', 'javascript', 'c', 'c++', 'c#', 'r', 'go', 'react', 'react native', 'node.js',
+    'sql', 'sql server', 'mysql', 'ci/cd', 'gitlab ci/cd', 'git', 'machine learning', 'learning',
+    'aws', '.net', 'asp.net', 'power bi'
+]
+FILLER = ['and', 'with', 'using', 'nodejs', 'pythonic', 'javas', 'reactive', 'sqlite', 'gitlab', 'c+', 'c##']
+SEPARATORS = [' ', ', ', '; ', '\n', ' (', ') ', '/', '-', '.', ':']
+
+
+def scanned(keywords, text_lower):
+    """One whole-word regex search per keyword"""
+    return {keyword for keyword in keywords if re.search(r'\b' + re.escape(keyword) + r'\b', text_lower)}
+
+
+def test_matches_per_keyword_scan():
+    rng = random.Random(5)
+    matcher = SkillMatcher(KEYWORDS)
+    for _ in range(2000):
+        words = rng.choices(KEYWORDS + FILLER, k=rng.randint(1, 12))
+        text = ''.join(word + rng.choice(SEPARATORS) for word in words).lower()
+        assert set(matcher.find(text)) == scanned(KEYWORDS, text), text
+
+
+def test_reports_keywords_in_order_of_first_occurrence():
+    matcher = SkillMatcher(KEYWORDS)
+    found = matcher.find('react native and python, then sql server with react')
+
+    assert found == ['react native', 'react', 'python', 'sql server', 'sql']
+
+
+def test_empty_keyword_list_matches_nothing():
+    assert SkillMatcher([]).find('python') == []
+
+
+def test_extractor_adds_skills_section_items_once():
+    extractor = SkillExtractor(KEYWORDS)
+    text = 'Summary\nPython developer.\n\nSkills: Python, Kubernetes, Terraform\n\nExperience\n'
+
+    assert extractor.extract(text) == ['Python', 'Kubernetes', 'Terraform']
+    assert extractor.extract_with_ids(text) == [
+        ('Python', 'python'), ('Kubernetes', 'kubernetes'), ('Terraform', 'terraform')
+    ]
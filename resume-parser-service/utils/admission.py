@@ -0,0 +1,96 @@
+import asyncio
+import time
+from typing import Dict
+
+from utils.metrics import ADMISSION_WAIT_SECONDS, FAILURES_TOTAL
+
+
+class AdmissionController:
+    """Bound the amount of in-flight and queued work in the async serving mode
+
+    Requests are admitted while the number of pending requests (running plus
+    waiting for an executor slot) stays below ``max_concurrency + max_queue``.
+    Anything beyond that is rejected immediately so the caller can answer 429
+    instead of letting latency grow without bound.
+
+    All mutating methods are expected to run on the event loop thread.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, retry_after: int = 1):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_queue = max(0, int(max_queue))
+        self.retry_after = max(1, int(retry_after))
+
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._pending = 0
+        self._active = 0
+
+        # Counters exposed through snapshot()
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self.wait_count = 0
+        self.wait_seconds_sum = 0.0
+        self.wait_seconds_max = 0.0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of requests that may be pending at once"""
+        return self.max_concurrency + self.max_queue
+
+    @property
+    def queued(self) -> int:
+        """Requests admitted but still waiting for an executor slot"""
+        return self._pending - self._active
+
+    def try_enter(self) -> bool:
+        """Reserve a place in the pending set, or refuse if it is full"""
+        if self._pending >= self.capacity:
+            self.rejected_total += 1
+            FAILURES_TOTAL.inc(reason='overloaded')
+            return False
+
+        self._pending += 1
+        self.admitted_total += 1
+        return True
+
+    def leave(self):
+        """Release the place reserved by try_enter()"""
+        self._pending -= 1
+
+    async def acquire(self) -> float:
+        """
+        Wait for an executor slot
+
+        Returns:
+            Seconds spent waiting in the queue
+        """
+        started = time.perf_counter()
+        await self._slots.acquire()
+        self._active += 1
+
+        waited = time.perf_counter() - started
+        self.wait_count += 1
+        self.wait_seconds_sum += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        ADMISSION_WAIT_SECONDS.observe(waited)
+        return waited
+
+    def release(self):
+        """Give back an executor slot obtained through acquire()"""
+        self._active -= 1
+        self._slots.release()
+
+    def snapshot(self) -> Dict:
+        """Current queue depth and wait-time statistics"""
+        return {
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'active': self._active,
+            'queued': self.queued,
+            'admitted_total': self.admitted_total,
+            'rejected_total': self.rejected_total,
+            'wait_count': self.wait_count,
+            'wait_seconds_sum': round(self.wait_seconds_sum, 6),
+            'wait_seconds_max': round(self.wait_seconds_max, 6),
+            'wait_seconds_avg': round(self.wait_seconds_sum / self.wait_count, 6) if self.wait_count else 0.0
+        }
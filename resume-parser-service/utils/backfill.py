@@ -0,0 +1,240 @@
+"""
+Reprocessing of stored resumes after extractor changes
+
+Every parse result records the version of each extractor that produced it
+(ResumeParser.EXTRACTOR_VERSIONS, stamped into metadata.extractor_versions).
+When an extractor changes its output its version is bumped, and the
+backfill brings the stored resumes up to date without the original files:
+
+- the store is scanned in id order for resumes whose recorded versions
+  differ from the current ones (resumes parsed before versioning record
+  none and are reprocessed in full);
+- for each, only the stale extractors (and those reading their output,
+  e.g. total_experience after experience) are re-run over the stored
+  extracted text and their fields cleaned, the rest of the stored result
+  is kept as it is;
+- the resume's embedding is recomputed from the updated result, which also
+  re-embeds resumes whose vector is missing or from an older model.
+
+Reprocessing runs in worker processes held to a CPU budget, so a backfill
+can share a host with the live service: a budget of 1.5 runs two workers,
+each sleeping for a third of its time. Results are written in batches,
+each write guarded by the resume's updated_at as it was read, so a resume
+re-uploaded meanwhile is left alone. A backfill can be stopped at any
+point and run again; written resumes no longer match the scan.
+
+    python cli.py backfill --store data/resumes.db --cpu-budget 2
+"""
+import logging
+import math
+import multiprocessing
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Per-process state, built by _init_worker()
+_parser = None
+_cleaner = None
+_embedder = None
+_cpu_share = 1.0
+
+
+def stale_extractors(recorded: Optional[Mapping[str, int]], versions: Mapping[str, int],
+                     inputs: Mapping[str, Iterable[str]]) -> Tuple[str, ...]:
+    """
+    Extractors to re-run for a result recorded with the given versions
+
+    Args:
+        recorded: Extractor versions stamped into the stored result (None if none were)
+        versions: Current extractor versions
+        inputs: Extractors reading other extractors' output (EXTRACTOR_INPUTS)
+
+    Returns:
+        Names of the stale extractors, in the order of versions
+    """
+    recorded = recorded or {}
+    stale = {name for name, version in versions.items() if recorded.get(name) != version}
+
+    # An extractor reading a stale extractor's output is stale as well
+    changed = True
+    while changed:
+        changed = False
+        for name, sources in inputs.items():
+            if name not in stale and stale.intersection(sources):
+                stale.add(name)
+                changed = True
+
+    return tuple(name for name in versions if name in stale)
+
+
+def workers_for_budget(cpu_budget: float) -> Tuple[int, float]:
+    """
+    Worker processes and the share of a CPU each may use for a CPU budget
+
+    A budget of 2 runs two workers at full speed, 1.5 two workers at 75%,
+    0.25 one worker at 25%.
+    """
+    if cpu_budget <= 0:
+        raise ValueError('cpu_budget must be positive')
+    workers = max(1, math.ceil(cpu_budget))
+    return workers, min(1.0, cpu_budget / workers)
+
+
+def _init_worker(cpu_share: float = 1.0, nice: int = 0, embed: bool = True):
+    """Build the parser and cleaner once in each worker process"""
+    global _parser, _cleaner, _embedder, _cpu_share
+
+    from parsers.resume_parser import ResumeParser
+    from utils.data_cleaner import DataCleaner
+    from utils.semantic import EMBEDDER
+
+    if nice:
+        os.nice(nice)
+
+    _parser = ResumeParser()
+    _cleaner = DataCleaner()
+    _embedder = EMBEDDER if embed else None
+    _cpu_share = cpu_share
+
+
+def _reprocess(task: Dict) -> Dict:
+    """Re-run a resume's stale extractors in a worker; never raises"""
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    result = {'resume_id': task['resume_id'], 'extractors': task['extractors']}
+
+    try:
+        parsed_data = task['parsed_data']
+        if task['extractors']:
+            extracted = _parser.extract(task['extracted_text'], task['extractors'])
+            # Cleaning works field by field; the fields left out come back empty and are dropped
+            cleaned = _cleaner.clean_resume_data(extracted)
+            parsed_data = dict(parsed_data)
+            for name in extracted:
+                parsed_data[name] = cleaned.get(name, extracted[name])
+
+            metadata = dict(task['metadata'])
+            metadata['extractor_versions'] = dict(_parser.EXTRACTOR_VERSIONS)
+            metadata['backfilled_at'] = datetime.now().isoformat()
+            result.update({'parsed_data': parsed_data, 'metadata': metadata})
+
+        if _embedder is not None:
+            result['vector'] = _embedder.embed_resume(parsed_data).tobytes()
+            result['vector_model'] = _embedder.model
+
+        result['success'] = True
+    except Exception as e:
+        result['success'] = False
+        result['error'] = f"{type(e).__name__}: {str(e)}"
+
+    # Idle in proportion to the CPU used, holding the worker to its share
+    if _cpu_share < 1.0:
+        time.sleep((time.process_time() - cpu_started) * (1.0 - _cpu_share) / _cpu_share)
+
+    result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+class Backfill:
+    """
+    Bring stored resumes up to the current extractor versions
+
+    Args:
+        store: ResumeStore to reprocess
+        versions: Current extractor versions (ResumeParser.EXTRACTOR_VERSIONS)
+        inputs: Extractor dependencies (ResumeParser.EXTRACTOR_INPUTS)
+        cpu_budget: CPUs the workers may use between them
+        embed: Recompute embeddings, and re-embed resumes without a current one
+        batch_size: Resumes read, reprocessed and written at a time
+        nice: Niceness added to the worker processes
+    """
+
+    def __init__(self, store, versions: Mapping[str, int], inputs: Mapping[str, Iterable[str]],
+                 cpu_budget: float = 1.0, embed: bool = True, batch_size: int = 200, nice: int = 10):
+        self.store = store
+        self.versions = dict(versions)
+        self.inputs = {name: tuple(sources) for name, sources in inputs.items()}
+        self.workers, self.cpu_share = workers_for_budget(cpu_budget)
+        self.embed = embed
+        self.batch_size = max(1, batch_size)
+        self.nice = nice
+
+        self.vector_model = None
+        if embed:
+            from utils.semantic import EMBEDDER
+            self.vector_model = EMBEDDER.model
+
+    def pending(self) -> int:
+        """Number of stored resumes that need reprocessing"""
+        return self.store.count_stale(self.versions, self.vector_model)
+
+    def tasks(self, after_id: int = 0) -> Iterable[list]:
+        """Batches of reprocessing tasks, in id order"""
+        while True:
+            rows = self.store.stale_resumes(self.versions, self.vector_model, after_id, self.batch_size)
+            if not rows:
+                return
+            after_id = rows[-1]['resume_id']
+            yield [dict(row, extractors=stale_extractors(
+                row['metadata'].get('extractor_versions'), self.versions, self.inputs
+            )) for row in rows]
+
+    def run(self, progress=None) -> Dict:
+        """
+        Reprocess every stale resume
+
+        Args:
+            progress: Optional object whose record(elapsed_ms, success) is
+                called for every resume
+
+        Returns:
+            Counts of resumes written, skipped (changed while being
+            reprocessed) and failed, and runs per extractor
+        """
+        stats = {'written': 0, 'skipped': 0, 'failed': 0, 'extractor_runs': dict.fromkeys(self.versions, 0)}
+
+        pool = multiprocessing.Pool(processes=self.workers, initializer=_init_worker,
+                                    initargs=(self.cpu_share, self.nice, self.embed))
+        try:
+            for batch in self.tasks():
+                # Only what the worker needs crosses the process boundary
+                read = {task['resume_id']: task for task in batch}
+                work = [{
+                    'resume_id': task['resume_id'],
+                    'extractors': task['extractors'],
+                    'parsed_data': task['parsed_data'],
+                    'extracted_text': task['extracted_text'] if task['extractors'] else '',
+                    'metadata': task['metadata']
+                } for task in batch]
+
+                updates = []
+                chunksize = max(1, len(work) // (self.workers * 4))
+                for result in pool.imap_unordered(_reprocess, work, chunksize=chunksize):
+                    if progress is not None:
+                        progress.record(result['elapsed_ms'], result['success'])
+                    if not result['success']:
+                        stats['failed'] += 1
+                        logger.error(f"Backfill of resume {result['resume_id']} failed: {result['error']}")
+                        continue
+
+                    task = read[result['resume_id']]
+                    result.update({'read_updated_at': task['updated_at'], 'name': task['name'], 'skills': task['skills']})
+                    updates.append(result)
+                    for name in result['extractors']:
+                        stats['extractor_runs'][name] += 1
+
+                written = self.store.save_backfill(updates)
+                stats['written'] += written
+                stats['skipped'] += len(updates) - written
+
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+        return stats
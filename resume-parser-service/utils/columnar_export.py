@@ -0,0 +1,226 @@
+"""
+Columnar export of parsed resumes for analytics
+
+Cleaned resumes are flattened into one table per section, each keyed by
+resume_id, and written as Parquet (or Feather) files in row groups so
+export memory stays bounded by the row group size:
+
+    resumes.parquet         one row per resume: personal info and metadata
+    skills.parquet          one row per (resume, skill)
+    experience.parquet      one row per work experience entry
+    education.parquet       one row per education entry
+    certifications.parquet  one row per certification
+    languages.parquet       one row per language
+
+Analytics then read only the columns they need, e.g. counting candidates
+by skill:
+
+    pd.read_parquet('export/skills.parquet', columns=['skill'])['skill'].value_counts()
+
+pyarrow is optional for the service and only needed here.
+"""
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('parquet', 'feather')
+
+
+def _schemas() -> Dict[str, 'pa.Schema']:
+    """Explicit schemas, so every row group has the same column types"""
+    string, integer, flag = pa.string(), pa.int32(), pa.bool_()
+    return {
+        'resumes': pa.schema([
+            ('resume_id', string), ('name', string), ('email', string), ('phone', string),
+            ('linkedin', string), ('github', string), ('summary', string),
+            ('total_experience', pa.float64()), ('filename', string), ('file_size', pa.int64()),
+            ('text_length', pa.int64()), ('processed_at', string), ('user_id', string), ('job_id', string)
+        ]),
+        'skills': pa.schema([
+            ('resume_id', string), ('ordinal', integer), ('skill', string)
+        ]),
+        'experience': pa.schema([
+            ('resume_id', string), ('ordinal', integer), ('company', string), ('position', string),
+            ('start_date', string), ('end_date', string), ('is_current', flag), ('description', string)
+        ]),
+        'education': pa.schema([
+            ('resume_id', string), ('ordinal', integer), ('institution', string), ('degree', string),
+            ('field_of_study', string), ('start_date', string), ('end_date', string), ('grade', string)
+        ]),
+        'certifications': pa.schema([
+            ('resume_id', string), ('ordinal', integer), ('name', string), ('issuer', string),
+            ('issue_date', string), ('expiry_date', string), ('credential_id', string)
+        ]),
+        'languages': pa.schema([
+            ('resume_id', string), ('ordinal', integer), ('language', string), ('proficiency', string)
+        ])
+    }
+
+
+class ColumnarExporter:
+    """
+    Write cleaned resumes to flat columnar tables
+
+    Args:
+        output_dir: Directory for the table files
+        file_format: 'parquet' or 'feather'
+        row_group_size: Rows buffered per table before a row group is written
+        compression: Codec for the files (zstd, lz4, snappy, ...)
+    """
+
+    def __init__(self, output_dir: str, file_format: str = 'parquet', row_group_size: int = 50000,
+                 compression: str = 'zstd'):
+        if pa is None:
+            raise RuntimeError('Columnar export requires pyarrow (pip install pyarrow)')
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported export format: {file_format}")
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        self.output_dir = output_dir
+        self.file_format = file_format
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.schemas = _schemas()
+        self.rows_written = {table: 0 for table in self.schemas}
+
+        # Coerce values to the column types, so odd parser output can't fail a row group
+        self._converters = {
+            table: [(field.name, _CONVERTERS.get(field.type, _to_str)) for field in schema]
+            for table, schema in self.schemas.items()
+        }
+        self._buffers = {table: self._empty_buffer(table) for table in self.schemas}
+        self._writers = {}
+
+    def _empty_buffer(self, table: str) -> Dict[str, List]:
+        return {name: [] for name in self.schemas[table].names}
+
+    def path(self, table: str) -> str:
+        return os.path.join(self.output_dir, f"{table}.{self.file_format}")
+
+    def add(self, resume_id: str, cleaned_data: Dict, metadata: Optional[Dict] = None):
+        """
+        Buffer one cleaned resume, flushing any table whose row group is full
+
+        Args:
+            resume_id: Key shared by the resume's rows in every table
+            cleaned_data: DataCleaner output
+            metadata: Optional parse metadata (filename, file_size, ...)
+        """
+        metadata = metadata or {}
+        personal_info = cleaned_data.get('personal_info')
+        if not isinstance(personal_info, dict):
+            personal_info = {}
+
+        self._append('resumes', {
+            'resume_id': resume_id,
+            'name': personal_info.get('name'),
+            'email': personal_info.get('email'),
+            'phone': personal_info.get('phone'),
+            'linkedin': personal_info.get('linkedin'),
+            'github': personal_info.get('github'),
+            'summary': cleaned_data.get('summary') or None,
+            'total_experience': cleaned_data.get('total_experience'),
+            'filename': metadata.get('filename'),
+            'file_size': metadata.get('file_size'),
+            'text_length': metadata.get('text_length'),
+            'processed_at': metadata.get('processed_at'),
+            'user_id': metadata.get('user_id'),
+            'job_id': metadata.get('job_id')
+        })
+
+        for ordinal, skill in enumerate(cleaned_data.get('skills') or []):
+            self._append('skills', {'resume_id': resume_id, 'ordinal': ordinal, 'skill': skill})
+
+        # Section entries are dicts; their fields map onto same-named columns
+        for table in ('experience', 'education', 'certifications', 'languages'):
+            for ordinal, entry in enumerate(cleaned_data.get(table) or []):
+                if isinstance(entry, dict):
+                    row = {'resume_id': resume_id, 'ordinal': ordinal}
+                    row.update(entry)
+                    self._append(table, row)
+
+    def _append(self, table: str, row: Dict[str, Any]):
+        buffer = self._buffers[table]
+        for name, convert in self._converters[table]:
+            value = row.get(name)
+            buffer[name].append(None if value is None else convert(value))
+
+        if len(buffer['resume_id']) >= self.row_group_size:
+            self._flush(table)
+
+    def _flush(self, table: str):
+        """Write the buffered rows of a table as one row group"""
+        buffer = self._buffers[table]
+        rows = len(buffer['resume_id'])
+        if not rows:
+            return
+
+        self._writer(table).write_table(pa.Table.from_pydict(buffer, schema=self.schemas[table]))
+
+        self.rows_written[table] += rows
+        self._buffers[table] = self._empty_buffer(table)
+
+    def _writer(self, table: str):
+        writer = self._writers.get(table)
+        if writer is None:
+            if self.file_format == 'parquet':
+                writer = pq.ParquetWriter(self.path(table), self.schemas[table], compression=self.compression)
+            else:
+                options = pa.ipc.IpcWriteOptions(compression=self.compression)
+                writer = pa.ipc.new_file(self.path(table), self.schemas[table], options=options)
+            self._writers[table] = writer
+        return writer
+
+    def close(self) -> Dict[str, int]:
+        """Flush remaining rows, finalize every file and return rows per table"""
+        for table in self.schemas:
+            self._flush(table)
+            # Write an empty file for tables that never received a row
+            self._writer(table).close()
+
+        self._writers = {}
+        return dict(self.rows_written)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_str(value) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+_CONVERTERS = {}
+if pa is not None:
+    _CONVERTERS = {
+        pa.int32(): _to_int,
+        pa.int64(): _to_int,
+        pa.float64(): _to_float,
+        pa.bool_(): bool
+    }
@@ -1,35 +1,86 @@
 import re
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
 from datetime import datetime
 import string
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import CLEANING_SECONDS
 
 logger = logging.getLogger(__name__)
 
 class DataCleaner:
-    """Clean and validate parsed resume data"""
+    """
+    Clean and validate parsed resume data
+    
+    Safe to share across threads: the word lists and patterns are built
+    once in immutable containers and cleaning never writes to the instance.
+    """
+    
+    # Fields whose presence is reported as a fill rate by get_quality_report
+    QUALITY_FIELDS = (
+        'name', 'email', 'phone', 'linkedin', 'github', 'skills', 'experience',
+        'education', 'certifications', 'languages', 'summary', 'total_experience'
+    )
+    QUALITY_LEVELS = ('Excellent', 'Good', 'Fair', 'Needs Improvement')
+    
+    # Kinds of text field cleaned by _clean_field / _clean_field_column
+    FIELD_KINDS = ('text', 'title', 'name', 'company', 'position', 'skill', 'summary', 'date')
+    
+    # Result of cleaning a missing or non-string value, per kind of field
+    _EMPTY_FIELD = MappingProxyType({'date': None, 'skill': None})
     
     def __init__(self):
         # Common words to remove from skills
-        self.skill_stopwords = {
+        self.skill_stopwords = frozenset({
             'and', 'or', 'with', 'using', 'including', 'such', 'as', 'like',
             'also', 'plus', 'etc', 'other', 'various', 'multiple', 'several'
-        }
+        })
         
         # Common job titles to help identify positions vs companies
-        self.job_title_keywords = {
+        self.job_title_keywords = frozenset({
             'developer', 'engineer', 'manager', 'analyst', 'specialist', 'coordinator',
             'director', 'senior', 'junior', 'lead', 'principal', 'architect',
             'consultant', 'designer', 'administrator', 'officer', 'executive',
             'supervisor', 'assistant', 'associate', 'intern', 'trainee'
-        }
+        })
         
         # Company suffixes to help identify companies
-        self.company_suffixes = {
+        self.company_suffixes = frozenset({
             'inc', 'corp', 'corporation', 'ltd', 'limited', 'llc', 'llp',
             'company', 'co', 'group', 'enterprises', 'solutions', 'services',
             'systems', 'technologies', 'tech', 'consulting', 'partners'
-        }
+        })
+        
+        # Precompiled patterns, shared by the per-resume and batch paths
+        self.special_chars_pattern = re.compile(r'[^\w\.\,\-\(\)\&\+\#]+')
+        self.name_prefix_pattern = re.compile(r'\b(mr|mrs|ms|dr|prof|sir|madam)\.?\s*', re.IGNORECASE)
+        self.name_suffix_pattern = re.compile(r'\s*(jr|sr|ii|iii|iv)\.?\s*$', re.IGNORECASE)
+        self.skill_prefix_patterns = (
+            re.compile(r'^(experience\s+(?:with|in)\s+)', re.IGNORECASE),
+            re.compile(r'^(knowledge\s+of\s+)', re.IGNORECASE),
+            re.compile(r'^(proficient\s+in\s+)', re.IGNORECASE)
+        )
+        self.company_prefix_pattern = re.compile(r'^(at\s+)', re.IGNORECASE)
+        self.position_prefix_pattern = re.compile(r'^(as\s+(?:a\s+)?)', re.IGNORECASE)
+        self.summary_prefix_patterns = (
+            re.compile(r'^(summary|objective|profile|about\s+me|professional\s+summary)[:\-\s]*', re.IGNORECASE),
+            re.compile(r'^(i\s+am\s+(?:a\s+)?)', re.IGNORECASE),
+            re.compile(r'^(my\s+(?:name\s+is|background\s+is))', re.IGNORECASE)
+        )
+        self.phone_chars_pattern = re.compile(r'[^\d+]')
+        self.non_digit_pattern = re.compile(r'[^\d]')
+        self.url_pattern = re.compile(r'^https?://[^\s/$.?#].[^\s]*$')
+        self.date_pattern = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+        self.email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+        
+        # Batch path: bytes.translate table doing special_chars_pattern's job
+        # for ASCII text (NUL is kept as the value separator)
+        kept = set((string.ascii_letters + string.digits + '_.,-()&+#\x00').encode('ascii'))
+        self.ascii_clean_table = bytes(byte if byte in kept else 0x20 for byte in range(256))
     
     def clean_resume_data(self, parsed_data: Dict) -> Dict:
         """
@@ -42,16 +93,8 @@ class DataCleaner:
             Cleaned and validated resume data
         """
         try:
-            cleaned_data = {
-                'personal_info': self._clean_personal_info(parsed_data.get('personal_info', {})),
-                'skills': self._clean_skills(parsed_data.get('skills', [])),
-                'experience': self._clean_experience(parsed_data.get('experience', [])),
-                'education': self._clean_education(parsed_data.get('education', [])),
-                'certifications': self._clean_certifications(parsed_data.get('certifications', [])),
-                'languages': self._clean_languages(parsed_data.get('languages', [])),
-                'summary': self._clean_summary(parsed_data.get('summary', '')),
-                'total_experience': self._validate_total_experience(parsed_data.get('total_experience', 0))
-            }
+            with CLEANING_SECONDS.time():
+                cleaned_data = self._clean_resume(parsed_data, self._clean_field)
             
             return cleaned_data
             
@@ -59,17 +102,233 @@ class DataCleaner:
             logger.error(f"Error cleaning resume data: {str(e)}")
             return parsed_data  # Return original data if cleaning fails
     
-    def _clean_personal_info(self, personal_info: Dict) -> Dict:
+    def clean_resumes_batch(self, parsed_resumes: List[Dict]) -> List[Dict]:
+        """
+        Clean many parsed resumes at once
+        
+        Text fields from all resumes are gathered into one column per kind of
+        field, de-duplicated and cleaned column-wise (one NumPy pass over all
+        ASCII text, pandas string operations for the rest); each resume is
+        then reassembled from the cleaned values.
+        The result is identical to calling clean_resume_data on each resume.
+        
+        Args:
+            parsed_resumes: Raw parsed resume data, one dict per resume
+            
+        Returns:
+            Cleaned resume data, in the same order
+        """
+        cleaned_fields = {}
+        for kind, values in self._collect_fields(parsed_resumes).items():
+            if values:
+                values = list(values)
+                # dtype=object keeps Python's re semantics (e.g. Unicode \w)
+                # even where pandas would infer an Arrow-backed string column
+                column = self._clean_field_column(kind, pd.Series(values, dtype=object))
+                cleaned_fields[kind] = dict(zip(values, column.tolist()))
+        
+        def clean(kind: str, value) -> Optional[str]:
+            try:
+                return cleaned_fields[kind][value]
+            except (KeyError, TypeError):
+                return self._clean_field(kind, value)
+        
+        results = []
+        for parsed_data in parsed_resumes:
+            try:
+                results.append(self._clean_resume(parsed_data, clean))
+            except Exception as e:
+                logger.error(f"Error cleaning resume data: {str(e)}")
+                results.append(parsed_data)  # Return original data if cleaning fails
+        
+        return results
+    
+    def _clean_resume(self, parsed_data: Dict, clean: Callable[[str, Any], Optional[str]]) -> Dict:
+        """Clean one resume, taking cleaned text fields from ``clean(kind, value)``"""
+        return {
+            'personal_info': self._clean_personal_info(parsed_data.get('personal_info', {}), clean),
+            'skills': self._clean_skills(parsed_data.get('skills', []), clean),
+            'experience': self._clean_experience(parsed_data.get('experience', []), clean),
+            'education': self._clean_education(parsed_data.get('education', []), clean),
+            'certifications': self._clean_certifications(parsed_data.get('certifications', []), clean),
+            'languages': self._clean_languages(parsed_data.get('languages', []), clean),
+            'summary': self._clean_summary(parsed_data.get('summary', ''), clean),
+            'total_experience': self._validate_total_experience(parsed_data.get('total_experience', 0))
+        }
+    
+    def _collect_fields(self, parsed_resumes: List[Dict]) -> Dict[str, set]:
+        """Gather the distinct text values of every kind of field across resumes"""
+        fields = {kind: set() for kind in self.FIELD_KINDS}
+        
+        def add(kind, value):
+            if value and isinstance(value, str):
+                fields[kind].add(value)
+        
+        for parsed_data in parsed_resumes:
+            # Anything missed here is cleaned value by value during reassembly
+            try:
+                add('name', (parsed_data.get('personal_info') or {}).get('name'))
+                add('summary', parsed_data.get('summary'))
+                
+                for skill in parsed_data.get('skills') or []:
+                    add('skill', skill)
+                
+                for exp in parsed_data.get('experience') or []:
+                    if isinstance(exp, dict):
+                        add('company', exp.get('company'))
+                        add('position', exp.get('position'))
+                        add('text', exp.get('description'))
+                        add('date', exp.get('start_date'))
+                        add('date', exp.get('end_date'))
+                
+                for edu in parsed_data.get('education') or []:
+                    if isinstance(edu, dict):
+                        add('title', edu.get('institution'))
+                        add('title', edu.get('degree'))
+                        add('title', edu.get('field_of_study'))
+                        add('text', edu.get('grade'))
+                        add('date', edu.get('start_date'))
+                        add('date', edu.get('end_date'))
+                
+                for cert in parsed_data.get('certifications') or []:
+                    if isinstance(cert, dict):
+                        add('title', cert.get('name'))
+                        add('title', cert.get('issuer'))
+                        add('text', cert.get('credential_id'))
+                        add('date', cert.get('issue_date'))
+                        add('date', cert.get('expiry_date'))
+                
+                for lang in parsed_data.get('languages') or []:
+                    if isinstance(lang, dict):
+                        add('title', lang.get('language'))
+                        
+            except Exception:
+                continue
+        
+        return fields
+    
+    def _clean_field(self, kind: str, value) -> Optional[str]:
+        """
+        Clean a single text field
+        
+        Args:
+            kind: One of FIELD_KINDS
+            value: Raw field value
+            
+        Returns:
+            Cleaned value; None for an invalid date or a skill to drop
+        """
+        if not value or not isinstance(value, str):
+            return self._EMPTY_FIELD.get(kind, '')
+        
+        if kind == 'date':
+            return self._clean_date(value)
+        
+        text = self._clean_text(value)
+        
+        if kind == 'title':
+            return text.title()
+        
+        if kind == 'name':
+            # Remove common prefixes/suffixes
+            text = self.name_prefix_pattern.sub('', text)
+            text = self.name_suffix_pattern.sub('', text)
+            return text.title()
+        
+        if kind == 'company':
+            return self.company_prefix_pattern.sub('', text).title()
+        
+        if kind == 'position':
+            return self.position_prefix_pattern.sub('', text).title()
+        
+        if kind == 'skill':
+            # Skip if too short or contains only stopwords
+            if len(text) < 2 or text.lower() in self.skill_stopwords:
+                return None
+            for pattern in self.skill_prefix_patterns:
+                text = pattern.sub('', text)
+            return text.strip().title()
+        
+        if kind == 'summary':
+            for pattern in self.summary_prefix_patterns:
+                text = pattern.sub('', text)
+            text = text.strip()
+            return text[0].upper() + text[1:] if text else text
+        
+        return text
+    
+    def _clean_field_column(self, kind: str, column: pd.Series) -> pd.Series:
+        """Vectorized _clean_field over a column of non-empty strings"""
+        if kind == 'date':
+            return column.where(column.str.match(self.date_pattern), None)
+        
+        text = self._clean_text_column(column)
+        
+        if kind == 'title':
+            return text.str.title()
+        
+        if kind == 'name':
+            text = text.str.replace(self.name_prefix_pattern, '', regex=True)
+            text = text.str.replace(self.name_suffix_pattern, '', regex=True)
+            return text.str.title()
+        
+        if kind == 'company':
+            return text.str.replace(self.company_prefix_pattern, '', regex=True).str.title()
+        
+        if kind == 'position':
+            return text.str.replace(self.position_prefix_pattern, '', regex=True).str.title()
+        
+        if kind == 'skill':
+            keep = (text.str.len() >= 2) & ~text.str.lower().isin(self.skill_stopwords)
+            for pattern in self.skill_prefix_patterns:
+                text = text.str.replace(pattern, '', regex=True)
+            return text.str.strip().str.title().where(keep, None)
+        
+        if kind == 'summary':
+            for pattern in self.summary_prefix_patterns:
+                text = text.str.replace(pattern, '', regex=True)
+            text = text.str.strip()
+            return text.str[:1].str.upper() + text.str[1:]
+        
+        return text
+    
+    def _clean_text_column(self, column: pd.Series) -> pd.Series:
+        """Vectorized _clean_text over a column of non-empty strings"""
+        cleaned = column.copy()
+        
+        # ASCII values are cleaned in one pass over their NUL-separated
+        # concatenation: special characters become spaces, then spaces that
+        # follow a space or a value boundary, or precede one, are dropped
+        fast = column.map(lambda value: value.isascii() and '\x00' not in value).astype(bool)
+        if fast.any():
+            joined = '\x00'.join(column[fast]).encode('ascii').translate(self.ascii_clean_table)
+            chars = np.frombuffer(joined, dtype=np.uint8)
+            
+            boundary_before = np.ones(len(chars), dtype=bool)
+            boundary_before[1:] = (chars[:-1] == 0x20) | (chars[:-1] == 0)
+            chars = chars[~((chars == 0x20) & boundary_before)]
+            
+            boundary_after = np.ones(len(chars), dtype=bool)
+            boundary_after[:-1] = chars[1:] == 0
+            chars = chars[~((chars == 0x20) & boundary_after)]
+            
+            cleaned[fast] = chars.tobytes().decode('ascii').split('\x00')
+        
+        if not fast.all():
+            slow = ~fast
+            cleaned[slow] = column[slow].str.replace(self.special_chars_pattern, ' ', regex=True).str.strip()
+        
+        return cleaned
+    
+    def _clean_personal_info(self, personal_info: Dict, clean: Optional[Callable] = None) -> Dict:
         """Clean personal information"""
+        clean = clean or self._clean_field
         cleaned = {}
         
         # Clean name
         if personal_info.get('name'):
-            name = self._clean_text(personal_info['name'])
-            # Remove common prefixes/suffixes
-            name = re.sub(r'\b(mr|mrs|ms|dr|prof|sir|madam)\.?\s*', '', name, flags=re.IGNORECASE)
-            name = re.sub(r'\s*(jr|sr|ii|iii|iv)\.?\s*$', '', name, flags=re.IGNORECASE)
-            cleaned['name'] = name.title() if name else None
+            name = clean('name', personal_info['name'])
+            cleaned['name'] = name if name else None
         
         # Clean and validate email
         if personal_info.get('email'):
@@ -91,11 +350,12 @@ class DataCleaner:
         
         return cleaned
     
-    def _clean_skills(self, skills: List[str]) -> List[str]:
+    def _clean_skills(self, skills: List[str], clean: Optional[Callable] = None) -> List[str]:
         """Clean and deduplicate skills"""
         if not skills:
             return []
         
+        clean = clean or self._clean_field
         cleaned_skills = []
         seen_skills = set()
         
@@ -103,21 +363,11 @@ class DataCleaner:
             if not isinstance(skill, str):
                 continue
             
-            # Clean the skill text
-            clean_skill = self._clean_text(skill)
-            
-            # Skip if too short or contains only stopwords
-            if len(clean_skill) < 2 or clean_skill.lower() in self.skill_stopwords:
+            # Clean, strip prefixes and title-case; None if too short or a stopword
+            clean_skill = clean('skill', skill)
+            if clean_skill is None:
                 continue
             
-            # Remove common prefixes/suffixes
-            clean_skill = re.sub(r'^(experience\s+(?:with|in)\s+)', '', clean_skill, flags=re.IGNORECASE)
-            clean_skill = re.sub(r'^(knowledge\s+of\s+)', '', clean_skill, flags=re.IGNORECASE)
-            clean_skill = re.sub(r'^(proficient\s+in\s+)', '', clean_skill, flags=re.IGNORECASE)
-            
-            # Title case and trim
-            clean_skill = clean_skill.strip().title()
-            
             # Avoid duplicates (case-insensitive)
             if clean_skill and clean_skill.lower() not in seen_skills:
                 cleaned_skills.append(clean_skill)
@@ -125,11 +375,12 @@ class DataCleaner:
         
         return sorted(cleaned_skills)
     
-    def _clean_experience(self, experience: List[Dict]) -> List[Dict]:
+    def _clean_experience(self, experience: List[Dict], clean: Optional[Callable] = None) -> List[Dict]:
         """Clean work experience entries"""
         if not experience:
             return []
         
+        clean = clean or self._clean_field
         cleaned_experience = []
         
         for exp in experience:
@@ -138,29 +389,22 @@ class DataCleaner:
             
             cleaned_exp = {}
             
-            # Clean company name
+            # Clean company name (dropping a leading "at")
             if exp.get('company'):
-                company = self._clean_text(exp['company'])
-                # Remove common prefixes
-                company = re.sub(r'^(at\s+)', '', company, flags=re.IGNORECASE)
-                cleaned_exp['company'] = company.title() if company else ''
+                cleaned_exp['company'] = clean('company', exp['company'])
             
-            # Clean position/title
+            # Clean position/title (dropping a leading "as a")
             if exp.get('position'):
-                position = self._clean_text(exp['position'])
-                # Remove common prefixes
-                position = re.sub(r'^(as\s+(?:a\s+)?)', '', position, flags=re.IGNORECASE)
-                cleaned_exp['position'] = position.title() if position else ''
+                cleaned_exp['position'] = clean('position', exp['position'])
             
             # Validate and clean dates
-            cleaned_exp['start_date'] = self._clean_date(exp.get('start_date'))
-            cleaned_exp['end_date'] = self._clean_date(exp.get('end_date'))
+            cleaned_exp['start_date'] = clean('date', exp.get('start_date'))
+            cleaned_exp['end_date'] = clean('date', exp.get('end_date'))
             cleaned_exp['is_current'] = bool(exp.get('is_current', False))
             
             # Clean description
             if exp.get('description'):
-                description = self._clean_text(exp['description'])
-                cleaned_exp['description'] = description
+                cleaned_exp['description'] = clean('text', exp['description'])
             
             # Only add if we have meaningful data
             if cleaned_exp.get('company') or cleaned_exp.get('position'):
@@ -171,11 +415,12 @@ class DataCleaner:
         
         return cleaned_experience
     
-    def _clean_education(self, education: List[Dict]) -> List[Dict]:
+    def _clean_education(self, education: List[Dict], clean: Optional[Callable] = None) -> List[Dict]:
         """Clean education entries"""
         if not education:
             return []
         
+        clean = clean or self._clean_field
         cleaned_education = []
         
         for edu in education:
@@ -186,27 +431,23 @@ class DataCleaner:
             
             # Clean institution name
             if edu.get('institution'):
-                institution = self._clean_text(edu['institution'])
-                cleaned_edu['institution'] = institution.title() if institution else ''
+                cleaned_edu['institution'] = clean('title', edu['institution'])
             
             # Clean degree
             if edu.get('degree'):
-                degree = self._clean_text(edu['degree'])
-                cleaned_edu['degree'] = degree.title() if degree else ''
+                cleaned_edu['degree'] = clean('title', edu['degree'])
             
             # Clean field of study
             if edu.get('field_of_study'):
-                field = self._clean_text(edu['field_of_study'])
-                cleaned_edu['field_of_study'] = field.title() if field else ''
+                cleaned_edu['field_of_study'] = clean('title', edu['field_of_study'])
             
             # Validate dates
-            cleaned_edu['start_date'] = self._clean_date(edu.get('start_date'))
-            cleaned_edu['end_date'] = self._clean_date(edu.get('end_date'))
+            cleaned_edu['start_date'] = clean('date', edu.get('start_date'))
+            cleaned_edu['end_date'] = clean('date', edu.get('end_date'))
             
             # Clean grade
             if edu.get('grade'):
-                grade = self._clean_text(edu['grade'])
-                cleaned_edu['grade'] = grade
+                cleaned_edu['grade'] = clean('text', edu['grade'])
             
             # Only add if we have meaningful data
             if any([cleaned_edu.get('institution'), cleaned_edu.get('degree'), cleaned_edu.get('field_of_study')]):
@@ -217,11 +458,12 @@ class DataCleaner:
         
         return cleaned_education
     
-    def _clean_certifications(self, certifications: List[Dict]) -> List[Dict]:
+    def _clean_certifications(self, certifications: List[Dict], clean: Optional[Callable] = None) -> List[Dict]:
         """Clean certifications"""
         if not certifications:
             return []
         
+        clean = clean or self._clean_field
         cleaned_certs = []
         seen_certs = set()
         
@@ -233,22 +475,19 @@ class DataCleaner:
             
             # Clean certification name
             if cert.get('name'):
-                name = self._clean_text(cert['name'])
-                cleaned_cert['name'] = name.title() if name else ''
+                cleaned_cert['name'] = clean('title', cert['name'])
             
             # Clean issuer
             if cert.get('issuer'):
-                issuer = self._clean_text(cert['issuer'])
-                cleaned_cert['issuer'] = issuer.title() if issuer else ''
+                cleaned_cert['issuer'] = clean('title', cert['issuer'])
             
             # Validate dates
-            cleaned_cert['issue_date'] = self._clean_date(cert.get('issue_date'))
-            cleaned_cert['expiry_date'] = self._clean_date(cert.get('expiry_date'))
+            cleaned_cert['issue_date'] = clean('date', cert.get('issue_date'))
+            cleaned_cert['expiry_date'] = clean('date', cert.get('expiry_date'))
             
             # Clean credential ID
             if cert.get('credential_id'):
-                credential_id = self._clean_text(cert['credential_id'])
-                cleaned_cert['credential_id'] = credential_id
+                cleaned_cert['credential_id'] = clean('text', cert['credential_id'])
             
             # Avoid duplicates and only add if we have meaningful data
             cert_key = cleaned_cert.get('name', '').lower()
@@ -258,11 +497,12 @@ class DataCleaner:
         
         return cleaned_certs
     
-    def _clean_languages(self, languages: List[Dict]) -> List[Dict]:
+    def _clean_languages(self, languages: List[Dict], clean: Optional[Callable] = None) -> List[Dict]:
         """Clean languages"""
         if not languages:
             return []
         
+        clean = clean or self._clean_field
         cleaned_langs = []
         seen_langs = set()
         
@@ -274,8 +514,7 @@ class DataCleaner:
             
             # Clean language name
             if lang.get('language'):
-                language = self._clean_text(lang['language'])
-                cleaned_lang['language'] = language.title() if language else ''
+                cleaned_lang['language'] = clean('title', lang['language'])
             
             # Validate proficiency level
             proficiency = lang.get('proficiency', 'intermediate').lower()
@@ -293,44 +532,23 @@ class DataCleaner:
         
         return cleaned_langs
     
-    def _clean_summary(self, summary: str) -> str:
+    def _clean_summary(self, summary: str, clean: Optional[Callable] = None) -> str:
         """Clean professional summary"""
         if not summary or not isinstance(summary, str):
             return ""
         
-        # Clean the text
-        cleaned_summary = self._clean_text(summary)
-        
-        # Remove common prefixes
-        prefixes_to_remove = [
-            r'^(summary|objective|profile|about\s+me|professional\s+summary)[:\-\s]*',
-            r'^(i\s+am\s+(?:a\s+)?)',
-            r'^(my\s+(?:name\s+is|background\s+is))'
-        ]
-        
-        for prefix in prefixes_to_remove:
-            cleaned_summary = re.sub(prefix, '', cleaned_summary, flags=re.IGNORECASE)
-        
-        # Capitalize first letter
-        cleaned_summary = cleaned_summary.strip()
-        if cleaned_summary:
-            cleaned_summary = cleaned_summary[0].upper() + cleaned_summary[1:]
-        
-        return cleaned_summary
+        # Clean the text, remove common prefixes and capitalize the first letter
+        clean = clean or self._clean_field
+        return clean('summary', summary)
     
     def _clean_text(self, text: str) -> str:
         """General text cleaning"""
         if not text or not isinstance(text, str):
             return ""
         
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\.\,\-\(\)\&\+\#]', ' ', text)
-        
-        # Remove multiple spaces
-        text = re.sub(r'\s+', ' ', text)
+        # Replace each run of whitespace and special characters (keeping basic
+        # punctuation) with a single space
+        text = self.special_chars_pattern.sub(' ', text)
         
         return text.strip()
     
@@ -340,10 +558,10 @@ class DataCleaner:
             return None
         
         # Remove all non-digit characters except + at the beginning
-        cleaned = re.sub(r'[^\d+]', '', phone)
+        cleaned = self.phone_chars_pattern.sub('', phone)
         
         # Basic validation - should have at least 7 digits
-        digits_only = re.sub(r'[^\d]', '', cleaned)
+        digits_only = self.non_digit_pattern.sub('', cleaned)
         if len(digits_only) < 7:
             return None
         
@@ -359,8 +577,7 @@ class DataCleaner:
             url = 'https://' + url
         
         # Basic URL validation
-        url_pattern = r'^https?://[^\s/$.?#].[^\s]*$'
-        if re.match(url_pattern, url):
+        if self.url_pattern.match(url):
             return url
         
         return None
@@ -371,16 +588,14 @@ class DataCleaner:
             return None
         
         # Basic date format validation (YYYY-MM-DD)
-        date_pattern = r'^\d{4}-\d{2}-\d{2}$'
-        if re.match(date_pattern, date_str):
+        if self.date_pattern.match(date_str):
             return date_str
         
         return None
     
     def _is_valid_email(self, email: str) -> bool:
         """Validate email format"""
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(email_pattern, email))
+        return bool(self.email_pattern.match(email))
     
     def _validate_total_experience(self, experience: float) -> float:
         """Validate total experience value"""
@@ -471,4 +686,161 @@ class DataCleaner:
             'quality_level': quality_level,
             'recommendations': recommendations,
             'completeness_percentage': scores['overall']
-        }
\ No newline at end of file
+        }
+    
+    def get_data_quality_scores_batch(self, cleaned_resumes: Iterable[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Calculate data quality scores for many resumes at once
+        
+        Applies the same rules as get_data_quality_score, as array operations
+        over counts gathered in a single pass.
+        
+        Args:
+            cleaned_resumes: Cleaned resume data, one dict per resume
+            
+        Returns:
+            Dictionary of arrays (one element per resume): the sub-scores,
+            'overall', 'quality_level' and one boolean array per QUALITY_FIELDS
+            entry under 'filled'
+        """
+        features = self._quality_features(cleaned_resumes)
+        filled = features['filled']
+        
+        skill_count = features['skills']
+        exp_count = features['experience']
+        total_exp = features['total_experience']
+        edu_count = features['education']
+        
+        scores = {
+            'personal_info': (10 * filled['name'] + 10 * filled['email'] + 3 * filled['phone']
+                              + 2 * filled['linkedin']).astype(np.int64),
+            'skills': np.select(
+                [skill_count >= 10, skill_count >= 5, skill_count >= 3, skill_count >= 1],
+                [25, 20, 15, 10], default=0
+            ),
+            'experience': np.select(
+                [(exp_count >= 3) & (total_exp >= 2), (exp_count >= 2) & (total_exp >= 1), exp_count >= 1, total_exp > 0],
+                [30, 25, 20, 10], default=0
+            ),
+            'education': np.select([edu_count >= 2, edu_count >= 1], [20, 15], default=0)
+        }
+        
+        overall = scores['personal_info'] + scores['skills'] + scores['experience'] + scores['education']
+        scores['overall'] = overall
+        scores['quality_level'] = np.select(
+            [overall >= 80, overall >= 60, overall >= 40], list(self.QUALITY_LEVELS[:3]),
+            default=self.QUALITY_LEVELS[3]
+        )
+        scores['filled'] = filled
+        
+        return scores
+    
+    def get_quality_report(self, documents: Iterable[Tuple[Any, Dict]], worst_n: int = 10) -> Dict:
+        """
+        Summarize data quality across a corpus of cleaned resumes
+        
+        Args:
+            documents: (document id, cleaned resume data) pairs
+            worst_n: Number of lowest-scoring documents to list
+            
+        Returns:
+            Dictionary with score distributions, quality level counts,
+            per-field fill rates and the worst-scoring documents
+        """
+        ids = []
+        
+        def cleaned_resumes():
+            for document_id, cleaned_data in documents:
+                ids.append(document_id)
+                yield cleaned_data
+        
+        scores = self.get_data_quality_scores_batch(cleaned_resumes())
+        overall = scores['overall']
+        count = len(overall)
+        
+        if count == 0:
+            return {'documents': 0, 'distributions': {}, 'quality_levels': {}, 'fill_rates': {}, 'worst': []}
+        
+        sub_scores = ('personal_info', 'skills', 'experience', 'education', 'overall')
+        distributions = {}
+        for name in sub_scores:
+            values = scores[name]
+            p10, p25, p50, p75, p90 = np.percentile(values, [10, 25, 50, 75, 90])
+            distributions[name] = {
+                'mean': round(float(values.mean()), 2),
+                'std': round(float(values.std()), 2),
+                'min': int(values.min()),
+                'p10': float(p10),
+                'p25': float(p25),
+                'median': float(p50),
+                'p75': float(p75),
+                'p90': float(p90),
+                'max': int(values.max())
+            }
+        
+        histogram, edges = np.histogram(overall, bins=10, range=(0, 100))
+        distributions['overall']['histogram'] = [
+            {'from': int(low), 'to': int(high), 'count': int(bucket)}
+            for low, high, bucket in zip(edges[:-1], edges[1:], histogram)
+        ]
+        
+        levels, level_counts = np.unique(scores['quality_level'], return_counts=True)
+        level_counts = dict(zip(levels.tolist(), level_counts.tolist()))
+        
+        # Stable sort keeps input order among equally scored documents
+        worst = []
+        for index in np.argsort(overall, kind='stable')[:worst_n]:
+            worst.append({
+                'id': ids[index],
+                'overall': int(overall[index]),
+                'scores': {name: int(scores[name][index]) for name in sub_scores[:-1]},
+                'quality_level': str(scores['quality_level'][index])
+            })
+        
+        return {
+            'documents': count,
+            'distributions': distributions,
+            'quality_levels': {level: level_counts.get(level, 0) for level in self.QUALITY_LEVELS},
+            'fill_rates': {
+                field: round(float(present.mean()), 4) for field, present in scores['filled'].items()
+            },
+            'worst': worst
+        }
+    
+    def _quality_features(self, cleaned_resumes: Iterable[Dict]) -> Dict:
+        """Gather the per-resume counts and field presence quality scoring needs"""
+        counts = {name: [] for name in ('skills', 'experience', 'education', 'certifications', 'languages')}
+        total_experience = []
+        present = {field: [] for field in ('name', 'email', 'phone', 'linkedin', 'github', 'summary')}
+        
+        for cleaned_data in cleaned_resumes:
+            if not isinstance(cleaned_data, dict):
+                cleaned_data = {}
+            personal_info = cleaned_data.get('personal_info')
+            if not isinstance(personal_info, dict):
+                personal_info = {}
+            
+            for field in ('name', 'email', 'phone', 'linkedin', 'github'):
+                present[field].append(bool(personal_info.get(field)))
+            
+            for name, values in counts.items():
+                entries = cleaned_data.get(name)
+                values.append(len(entries) if isinstance(entries, (list, tuple)) else 0)
+            
+            try:
+                total_experience.append(float(cleaned_data.get('total_experience') or 0))
+            except (TypeError, ValueError):
+                total_experience.append(0.0)
+            
+            present['summary'].append(bool(cleaned_data.get('summary')))
+        
+        features = {name: np.array(values, dtype=np.int64) for name, values in counts.items()}
+        features['total_experience'] = np.array(total_experience, dtype=np.float64)
+        
+        filled = {field: np.array(values, dtype=bool) for field, values in present.items()}
+        for name in counts:
+            filled[name] = features[name] > 0
+        filled['total_experience'] = features['total_experience'] > 0
+        features['filled'] = {field: filled[field] for field in self.QUALITY_FIELDS}
+        
+        return features
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Streaming text extraction for Word documents
+
+A DOCX is a zip archive; its text lives in word/document.xml, next to
+styles, headers, footers and embedded media. Only that one part is read
+here, inflated straight from the archive and parsed with iterparse, so
+paragraphs come out while the XML is still being decompressed and
+memory stays bounded by a single paragraph. No media part is opened.
+
+Legacy Word 97-2003 .doc files are OLE compound documents, not zips.
+sniff_format() tells them apart from the first bytes, so they go to
+antiword or catdoc (when installed) instead of a zip reader that would
+only fail.
+"""
+import shutil
+import subprocess
+import zipfile
+from types import MappingProxyType
+from typing import Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+# Leading bytes of an OLE compound document (.doc) and of a zip (.docx)
+OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+ZIP_MAGIC = b'PK\x03\x04'
+
+DOCUMENT_PART = 'word/document.xml'
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_PARAGRAPH = _W + 'p'
+_TEXT = _W + 't'
+# Run-level elements that stand for whitespace
+_BREAKS = MappingProxyType({_W + 'tab': '\t', _W + 'br': '\n', _W + 'cr': '\n'})
+
+# Command lines for legacy .doc converters, tried in order (no line wrapping, UTF-8 output)
+DOC_CONVERTERS = (
+    ('antiword', ['-w', '0', '-m', 'UTF-8.txt']),
+    ('catdoc', ['-w', '-d', 'utf-8'])
+)
+
+
+def sniff_format(file_path: str) -> str:
+    """'ole' for a legacy .doc, 'zip' for a DOCX, otherwise 'unknown'"""
+    with open(file_path, 'rb') as file:
+        head = file.read(len(OLE_MAGIC))
+
+    if head == OLE_MAGIC:
+        return 'ole'
+    if head.startswith(ZIP_MAGIC):
+        return 'zip'
+    return 'unknown'
+
+
+def iter_paragraphs(file_path: str) -> Iterator[str]:
+    """
+    Yield the text of each body paragraph of a DOCX, in document order
+
+    Table cells are paragraphs too and come out one per cell. Paragraphs
+    nested in another (text boxes) become lines of the paragraph holding
+    them, where they appear in it.
+
+    Raises:
+        KeyError: If the archive has no word/document.xml
+        zipfile.BadZipFile, xml.etree.ElementTree.ParseError: On corrupt input
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open(DOCUMENT_PART) as stream:
+        # One text buffer per open paragraph
+        buffers: List[List[str]] = []
+
+        for event, element in iterparse(stream, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if tag == _PARAGRAPH:
+                    buffers.append([])
+                continue
+
+            if tag == _PARAGRAPH:
+                text = ''.join(buffers.pop())
+                if buffers:
+                    buffers[-1].append(f"\n{text}\n")
+                else:
+                    yield text
+            elif buffers:
+                if tag == _TEXT:
+                    buffers[-1].append(element.text or '')
+                elif tag in _BREAKS:
+                    buffers[-1].append(_BREAKS[tag])
+
+            # Drop what has been read, so only the open elements stay in memory
+            element.clear()
+
+
+def read_docx(file_path: str, max_chars: int = 0) -> Tuple[str, bool]:
+    """
+    Body text of a DOCX, one line per paragraph
+
+    Args:
+        file_path: Path to the .docx file
+        max_chars: Stop reading once this many characters were collected (0 reads everything)
+
+    Returns:
+        Tuple of (text, whether reading stopped at max_chars)
+    """
+    parts = []
+    length = 0
+
+    for paragraph in iter_paragraphs(file_path):
+        parts.append(paragraph)
+        length += len(paragraph) + 1
+        if max_chars and length >= max_chars:
+            return '\n'.join(parts)[:max_chars], True
+
+    return '\n'.join(parts), False
+
+
+def doc_converter() -> Optional[List[str]]:
+    """Command line of the first installed .doc converter, None if there is none"""
+    for name, options in DOC_CONVERTERS:
+        path = shutil.which(name)
+        if path:
+            return [path] + options
+    return None
+
+
+def read_doc(file_path: str, timeout: float = 30.0) -> str:
+    """
+    Text of a legacy Word 97-2003 .doc via antiword or catdoc
+
+    Raises:
+        RuntimeError: If no converter is installed or the conversion fails
+    """
+    command = doc_converter()
+    if command is None:
+        raise RuntimeError('No .doc converter installed (antiword or catdoc)')
+
+    try:
+        result = subprocess.run(command + [file_path], capture_output=True, timeout=timeout, check=True)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"{command[0]} timed out after {timeout:.0f}s")
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode('utf-8', 'replace').strip()
+        raise RuntimeError(f"{command[0]} failed: {message or e.returncode}")
+
+    return result.stdout.decode('utf-8', 'replace')
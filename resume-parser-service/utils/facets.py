@@ -0,0 +1,777 @@
+"""
+Faceted counts over the stored candidates with compressed bitmaps
+
+Dashboards ask for counts: candidates per skill, per experience band, with
+education, with certifications, per language, and those counts filtered by
+each other. Counting by walking the parsed resumes costs a pass over the
+whole pool per widget. FacetIndex instead keeps a bitmap of resume ids per
+facet value, so a filter is a few bitmap ANDs, ORs and AND NOTs and a count
+is a popcount.
+
+Bitmaps are split into chunks of 65536 ids, as in Roaring bitmaps, and
+empty chunks are not stored. A chunk holding up to 1024 ids is a sorted
+array of 16-bit offsets; a fuller one is a Python int used as a 65536-bit
+set, whose &, | and & ~ run in C over 8 KiB. Values held by up to 4096
+candidates (free-text skills, most users) are not bitmaps at all: their
+(id, value) pairs are kept in a pair of numpy arrays per facet, the facet's
+tail, at 8 bytes per pair. A value held by every candidate of a
+million-resume pool takes 128 KiB.
+
+Counting a facet under a filter intersects the filter with every value of
+the facet, largest values first; once the requested number of values is
+found, values holding fewer candidates than the lowest count so far are
+skipped without being looked at. Top-20 skill counts thus touch the few
+hundred common skills; only narrow filters reach the tail, which is
+counted in one pass over its array.
+
+Facets:
+
+    skill           canonical skill id (see utils/job_profiles.py)
+    experience      band of total_experience in years: 0-1, 1-3, 3-5, 5-10, 10+
+    education       yes / no
+    certifications  yes / no
+    language        language, case-folded
+    user            user_id the resume was uploaded for
+
+ResumeFacetIndex keeps an index in step with a ResumeStore: the store
+numbers every change of a resume in its resume_changes table, and each
+query first applies the changes made since the previous one, by any
+worker. A parse is counted from the next query on, without a rebuild.
+
+Filters are JSON expressions:
+
+    {"skill": "python"}                         resumes with a facet value
+    {"skill": ["python", "java"]}               with any of the values
+    {"and": [...]}, {"or": [...]}, {"not": ...} combinations
+    [..., ...]                                  shorthand for "and"
+"""
+import heapq
+import json
+import logging
+import re
+import threading
+from array import array
+from itertools import filterfalse, repeat
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from utils.job_profiles import normalize_skill
+
+logger = logging.getLogger(__name__)
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+OFFSET_MASK = CHUNK_SIZE - 1
+# Chunks of at most this many ids are arrays of offsets, a quarter of the
+# size of a full chunk's int; counting over larger arrays is slower than
+# over the int
+SPARSE_MAX = 1024
+# Values held by at most this many candidates are kept in their facet's
+# tail (see _Tail) rather than as bitmaps
+SMALL_MAX = 4096
+
+FACETS = ('skill', 'experience', 'education', 'certifications', 'language', 'user')
+
+# (upper bound in years, exclusive; band)
+EXPERIENCE_BANDS = ((1, '0-1'), (3, '1-3'), (5, '3-5'), (10, '5-10'), (None, '10+'))
+
+Container = Union[int, array]
+
+_ONE_BITS = re.compile('1')
+# Binary digits to bytes 0 and 1
+_DIGIT_BYTES = bytes.maketrans(b'01', bytes((0, 1)))
+
+if hasattr(int, 'bit_count'):
+    def _popcount(value: int) -> int:
+        return value.bit_count()
+else:  # Python < 3.10
+    def _popcount(value: int) -> int:
+        return bin(value).count('1')
+
+
+class InvalidFacetQueryError(ValueError):
+    """Raised when a facet filter or facet name is malformed"""
+
+
+def _sparse(offsets: Iterable[int]) -> array:
+    """Chunk array of the given offsets"""
+    return array('H', sorted(set(offsets)))
+
+
+def _dense(offsets: Iterable[int]) -> int:
+    """Chunk int with the given offsets set"""
+    bits = bytearray(CHUNK_SIZE // 8)
+    for offset in offsets:
+        bits[offset >> 3] |= 1 << (offset & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _bits(value: int) -> bytes:
+    """A byte per offset of a chunk int, 1 where its bit is set"""
+    # Binary digits least significant first, so a digit's index is its offset
+    digits = bin(value)[:1:-1].encode('ascii').translate(_DIGIT_BYTES)
+    return digits + bytes(CHUNK_SIZE - len(digits))
+
+
+def _offsets(value: int, reverse: bool = False) -> List[int]:
+    """Offsets set in a chunk int, ascending (or descending)"""
+    offsets = [match.start() for match in _ONE_BITS.finditer(bin(value)[:1:-1])]
+    return offsets[::-1] if reverse else offsets
+
+
+def _count(container: Container) -> int:
+    return len(container) if isinstance(container, array) else _popcount(container)
+
+
+def _as_int(container: Container) -> int:
+    return _dense(container) if isinstance(container, array) else container
+
+
+def _compact(container: Container) -> Optional[Container]:
+    """Smaller representation of a chunk, None if it is empty"""
+    if isinstance(container, array):
+        if len(container) > SPARSE_MAX:
+            return _dense(container)
+        return container or None
+    if not container:
+        return None
+    if _popcount(container) <= SPARSE_MAX:
+        return array('H', _offsets(container))
+    return container
+
+
+def _and(a: Container, b: Container) -> Container:
+    if isinstance(b, array) and not isinstance(a, array):
+        a, b = b, a
+    if isinstance(a, array):
+        if isinstance(b, array):
+            return array('H', filter(set(b).__contains__, a))
+        return array('H', filter(_bits(b).__getitem__, a))
+    return a & b
+
+
+def _or(a: Container, b: Container) -> Container:
+    if isinstance(a, array) and isinstance(b, array):
+        merged = set(a).union(b)
+        return _sparse(merged) if len(merged) <= SPARSE_MAX else _dense(merged)
+    return _as_int(a) | _as_int(b)
+
+
+def _and_not(a: Container, b: Container) -> Container:
+    if isinstance(a, array):
+        if isinstance(b, array):
+            return array('H', filterfalse(set(b).__contains__, a))
+        return array('H', filterfalse(_bits(b).__getitem__, a))
+    return a & ~_as_int(b)
+
+
+class Bitmap:
+    """
+    Set of non-negative ints stored as chunks of 65536 (see module docstring)
+
+    Bitmaps returned by &, | and - are new; update() changes a bitmap in place.
+    """
+
+    __slots__ = ('chunks', '_count')
+
+    def __init__(self, chunks: Optional[Dict[int, Container]] = None):
+        # Chunk index -> container; empty chunks are left out
+        self.chunks = chunks if chunks is not None else {}
+        self._count = None
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> 'Bitmap':
+        bitmap = cls()
+        for chunk, offsets in _group(ids).items():
+            bitmap.update(chunk, add=offsets)
+        return bitmap
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = sum(_count(container) for container in self.chunks.values())
+        return self._count
+
+    def __bool__(self) -> bool:
+        return bool(self.chunks)
+
+    def __contains__(self, value: int) -> bool:
+        container = self.chunks.get(value >> CHUNK_BITS)
+        if container is None:
+            return False
+        offset = value & OFFSET_MASK
+        return offset in container if isinstance(container, array) else bool(container >> offset & 1)
+
+    def __and__(self, other: 'Bitmap') -> 'Bitmap':
+        small, large = (self, other) if len(self.chunks) <= len(other.chunks) else (other, self)
+        chunks = {}
+        for chunk, container in small.chunks.items():
+            if chunk in large.chunks:
+                result = _and(container, large.chunks[chunk])
+                if result:
+                    chunks[chunk] = result
+        return Bitmap(chunks)
+
+    def __or__(self, other: 'Bitmap') -> 'Bitmap':
+        chunks = dict(self.chunks)
+        for chunk, container in other.chunks.items():
+            chunks[chunk] = _or(chunks[chunk], container) if chunk in chunks else container
+        return Bitmap(chunks)
+
+    def __sub__(self, other: 'Bitmap') -> 'Bitmap':
+        chunks = {}
+        for chunk, container in self.chunks.items():
+            result = _and_not(container, other.chunks[chunk]) if chunk in other.chunks else container
+            if result:
+                chunks[chunk] = result
+        return Bitmap(chunks)
+
+    def update(self, chunk: int, add: Sequence[int] = (), remove: Sequence[int] = ()):
+        """Add and remove offsets within one chunk (removals first)"""
+        old = self.chunks.get(chunk)
+        container = array('H') if old is None else old
+        if remove:
+            container = _and_not(container, _sparse(remove))
+        if add:
+            container = _or(container, _sparse(add) if len(add) <= SPARSE_MAX else _dense(add))
+
+        container = _compact(container)
+        if container is None:
+            self.chunks.pop(chunk, None)
+        else:
+            self.chunks[chunk] = container
+        if self._count is not None:
+            self._count += (0 if container is None else _count(container)) - (0 if old is None else _count(old))
+
+    def ids(self, limit: Optional[int] = None, reverse: bool = False) -> List[int]:
+        """Members in ascending (or descending) order, at most limit of them"""
+        result = []
+        for chunk in sorted(self.chunks, reverse=reverse):
+            container = self.chunks[chunk]
+            if isinstance(container, array):
+                offsets = reversed(container) if reverse else container
+            else:
+                offsets = _offsets(container, reverse)
+            base = chunk << CHUNK_BITS
+            for offset in offsets:
+                if limit is not None and len(result) >= limit:
+                    return result
+                result.append(base | offset)
+        return result
+
+
+def _group(ids: Iterable[int]) -> Dict[int, List[int]]:
+    """Offsets of ids by chunk"""
+    chunks = {}
+    for value in ids:
+        chunks.setdefault(value >> CHUNK_BITS, []).append(value & OFFSET_MASK)
+    return chunks
+
+
+class _Probe:
+    """
+    A bitmap set up for counting its intersection with many others
+
+    Every chunk is held as an int, and also as a byte per offset, 1 for a
+    member, so an array chunk of the other bitmap is counted by one numpy
+    gather instead of testing its offsets one by one.
+    """
+
+    __slots__ = ('dense', 'bits')
+
+    def __init__(self, bitmap: Bitmap):
+        self.dense = {chunk: _as_int(container) for chunk, container in bitmap.chunks.items()}
+        self.bits = {chunk: np.frombuffer(_bits(container), dtype=np.uint8) for chunk, container in self.dense.items()}
+
+    def table(self, end: int) -> np.ndarray:
+        """A byte per id below end, 1 for a member"""
+        table = np.zeros(end, dtype=np.uint8)
+        for chunk, bits in self.bits.items():
+            table[chunk << CHUNK_BITS:(chunk + 1) << CHUNK_BITS] = bits
+        return table
+
+    def count(self, other: Bitmap) -> int:
+        """len(bitmap & other)"""
+        count = 0
+        for chunk, container in other.chunks.items():
+            mine = self.dense.get(chunk)
+            if mine is None:
+                continue
+            if isinstance(container, array):
+                count += int(np.count_nonzero(self.bits[chunk][np.frombuffer(container, dtype=np.uint16)]))
+            else:
+                count += _popcount(container & mine)
+        return count
+
+
+class _Tail:
+    """
+    The values of a facet held by at most SMALL_MAX candidates
+
+    Every (candidate id, value number) pair is a slot of two numpy arrays,
+    so a filter is counted over the whole tail by one gather and a bincount
+    instead of a step per value. Added pairs are appended; removed ones
+    get value number 0 and are compacted away once they are half the slots.
+    """
+
+    __slots__ = ('ids', 'owners', 'used', 'removed', 'values', 'numbers', 'sizes')
+
+    def __init__(self):
+        self.ids = np.zeros(1024, dtype=np.uint32)
+        self.owners = np.zeros(1024, dtype=np.uint32)
+        self.used = 0
+        self.removed = 0
+        # Value of each number (0 and numbers of values gone are None), and back
+        self.values: List[Optional[str]] = [None]
+        self.numbers: Dict[str, int] = {}
+        self.sizes = array('I', [0])
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.numbers
+
+    def size(self, value: str) -> int:
+        number = self.numbers.get(value)
+        return 0 if number is None else self.sizes[number]
+
+    def get(self, value: str) -> List[int]:
+        """Ids holding the value, ascending"""
+        number = self.numbers.get(value)
+        if number is None:
+            return []
+        return np.sort(self.ids[:self.used][self.owners[:self.used] == number]).tolist()
+
+    def add(self, additions: Mapping[str, Sequence[int]]):
+        """Add ids to values; none of them may hold the value already"""
+        ids, owners = [], []
+        for value, value_ids in additions.items():
+            number = self.numbers.get(value)
+            if number is None:
+                number = self.numbers[value] = len(self.values)
+                self.values.append(value)
+                self.sizes.append(0)
+            self.sizes[number] += len(value_ids)
+            ids.extend(value_ids)
+            owners.extend(repeat(number, len(value_ids)))
+
+        end = self.used + len(ids)
+        if end > len(self.ids):
+            capacity = max(end, 2 * len(self.ids))
+            self.ids = np.concatenate([self.ids[:self.used], np.zeros(capacity - self.used, dtype=np.uint32)])
+            self.owners = np.concatenate([self.owners[:self.used], np.zeros(capacity - self.used, dtype=np.uint32)])
+        self.ids[self.used:end] = ids
+        self.owners[self.used:end] = owners
+        self.used = end
+
+    def take(self, values: Iterable[str]) -> Dict[str, List[int]]:
+        """Remove values from the tail, returning their ids"""
+        numbers = [self.numbers[value] for value in values]
+        if not numbers:
+            return {}
+        owners = self.owners[:self.used]
+        slots = np.flatnonzero(np.isin(owners, numbers))
+        taken = {value: [] for value in values}
+        for candidate_id, number in zip(self.ids[slots].tolist(), owners[slots].tolist()):
+            taken[self.values[number]].append(candidate_id)
+        owners[slots] = 0
+        self._forget(numbers, len(slots))
+        return taken
+
+    def remove(self, marked: np.ndarray):
+        """
+        Remove candidates from every value
+
+        Args:
+            marked: A byte per id, 1 for a candidate to remove, covering every id of the tail
+        """
+        owners = self.owners[:self.used]
+        slots = np.flatnonzero(marked[self.ids[:self.used]] & (owners != 0))
+        if not len(slots):
+            return
+        numbers, counts = np.unique(owners[slots], return_counts=True)
+        gone = []
+        for number, count in zip(numbers.tolist(), counts.tolist()):
+            self.sizes[number] -= count
+            if not self.sizes[number]:
+                gone.append(number)
+        owners[slots] = 0
+        self._forget(gone, len(slots))
+
+    def _forget(self, numbers: Iterable[int], slots: int):
+        """Drop values whose slots were just cleared, and compact if half the slots are"""
+        for number in numbers:
+            del self.numbers[self.values[number]]
+            self.values[number] = None
+            self.sizes[number] = 0
+
+        self.removed += slots
+        if self.removed * 2 > self.used:
+            keep = self.owners[:self.used] != 0
+            self.ids = self.ids[:self.used][keep]
+            self.owners = self.owners[:self.used][keep]
+            self.used = len(self.ids)
+            self.removed = 0
+
+    def counts(self, table: Optional[np.ndarray] = None, least: int = 1) -> List[Tuple[int, str]]:
+        """
+        (count, value) of the values counting at least least
+
+        Args:
+            table: A byte per id, 1 for a match, covering every id of the
+                tail; without one each value counts its candidates
+        """
+        if table is None:
+            counts = np.frombuffer(self.sizes, dtype=np.uint32).copy()
+        else:
+            owners = self.owners[:self.used]
+            counts = np.bincount(owners[table[self.ids[:self.used]] != 0], minlength=len(self.values))
+        counts[0] = 0
+        numbers = np.flatnonzero(counts >= least)
+        return [(count, self.values[number]) for number, count in zip(numbers.tolist(), counts[numbers].tolist())]
+
+
+def experience_band(years) -> str:
+    """Band of a total_experience value"""
+    try:
+        years = float(years or 0)
+    except (TypeError, ValueError):
+        years = 0.0
+    for upper, band in EXPERIENCE_BANDS:
+        if upper is None or years < upper:
+            return band
+    return EXPERIENCE_BANDS[-1][1]
+
+
+def candidate_facets(row: Mapping) -> Dict[str, Set[str]]:
+    """
+    Facet values of a stored resume
+
+    Args:
+        row: user_id, skills (newline separated), total_experience,
+            education and certifications (entry counts) and languages (JSON
+            list), as returned by ResumeStore.changes_since()
+    """
+    languages = set()
+    try:
+        for language in json.loads(row['languages'] or '[]'):
+            if isinstance(language, dict) and isinstance(language.get('language'), str):
+                languages.add(normalize_skill(language['language']))
+    except (TypeError, ValueError):
+        pass
+
+    values = {
+        'skill': {normalize_skill(skill) for skill in (row['skills'] or '').split('\n') if skill.strip()},
+        'experience': {experience_band(row['total_experience'])},
+        'education': {'yes' if row['education'] else 'no'},
+        'certifications': {'yes' if row['certifications'] else 'no'},
+        'language': languages - {''}
+    }
+    if row['user_id']:
+        values['user'] = {row['user_id']}
+    return values
+
+
+class FacetIndex:
+    """
+    Ids of the candidates holding each facet value
+
+    A value held by at most SMALL_MAX candidates is kept in its facet's
+    tail; larger ones are Bitmaps in bitmaps, also filed by size class (bit
+    length of their size) so counting can skip every bitmap too small to
+    make the top of a facet without sorting them.
+
+    Not thread-safe; ResumeFacetIndex serializes access.
+    """
+
+    def __init__(self):
+        self.all = Bitmap()
+        self.bitmaps: Dict[str, Dict[str, Bitmap]] = {facet: {} for facet in FACETS}
+        self.tails: Dict[str, _Tail] = {facet: _Tail() for facet in FACETS}
+        # Per facet: size class -> values of bitmaps of that size, see _resize()
+        self._classes: Dict[str, Dict[int, Set[str]]] = {facet: {} for facet in FACETS}
+
+    def __len__(self) -> int:
+        return len(self.all)
+
+    def update(self, candidates: Iterable[Tuple[int, Mapping[str, Iterable[str]]]]):
+        """
+        Add candidates, or replace the facet values of indexed ones
+
+        Args:
+            candidates: (candidate id, {facet: values}) pairs
+        """
+        latest = dict(candidates)
+        if not latest:
+            return
+
+        # A replaced candidate is first cleared from every value it may hold
+        replaced = {candidate_id for candidate_id in latest if candidate_id in self.all}
+        if replaced:
+            self._remove(replaced)
+
+        additions: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+        for candidate_id, values in latest.items():
+            for facet, facet_values in values.items():
+                for value in facet_values:
+                    additions[facet].setdefault(value, []).append(candidate_id)
+
+        for facet, values in additions.items():
+            bitmaps, tail = self.bitmaps[facet], self.tails[facet]
+            grown = {}
+            for value, ids in values.items():
+                bitmap = bitmaps.get(value)
+                if bitmap is None:
+                    grown[value] = ids
+                    continue
+                size = len(bitmap)
+                for chunk, offsets in _group(ids).items():
+                    bitmap.update(chunk, add=offsets)
+                self._resize(facet, value, size, len(bitmap))
+
+            # Values outgrowing the tail move to bitmaps
+            promoted = [value for value, ids in grown.items() if tail.size(value) + len(ids) > SMALL_MAX]
+            for value, ids in tail.take([value for value in promoted if value in tail]).items():
+                grown[value] = ids + grown[value]
+            for value in promoted:
+                ids = grown.pop(value)
+                bitmaps[value] = Bitmap.from_ids(sorted(ids))
+                self._resize(facet, value, 0, len(ids))
+            tail.add(grown)
+
+        for chunk, offsets in _group(latest).items():
+            self.all.update(chunk, add=offsets)
+
+    def remove(self, candidate_ids: Iterable[int]):
+        """Drop candidates from the index"""
+        ids = {candidate_id for candidate_id in candidate_ids if candidate_id in self.all}
+        if not ids:
+            return
+        self._remove(ids)
+        for chunk, offsets in _group(ids).items():
+            self.all.update(chunk, remove=offsets)
+
+    def _remove(self, ids: Set[int]):
+        """Clear candidates from every value"""
+        grouped = _group(ids)
+        marked = np.zeros(self._end(), dtype=np.uint8)
+        marked[list(ids)] = 1
+
+        for facet in FACETS:
+            self.tails[facet].remove(marked)
+
+            bitmaps = self.bitmaps[facet]
+            for value, bitmap in list(bitmaps.items()):
+                size = len(bitmap)
+                for chunk, offsets in grouped.items():
+                    if chunk in bitmap.chunks:
+                        bitmap.update(chunk, remove=offsets)
+                if not bitmap:
+                    del bitmaps[value]
+                self._resize(facet, value, size, len(bitmap))
+
+    def _end(self) -> int:
+        """End of the id range the index covers, a multiple of CHUNK_SIZE"""
+        return (max(self.all.chunks, default=-1) + 1) << CHUNK_BITS
+
+    def _resize(self, facet: str, value: str, old: int, new: int):
+        """File a bitmap whose size changed from old to new under its new size class"""
+        old_class, new_class = old.bit_length(), new.bit_length()
+        if old_class == new_class:
+            return
+        classes = self._classes[facet]
+        if old:
+            values = classes[old_class]
+            values.discard(value)
+            if not values:
+                del classes[old_class]
+        if new:
+            classes.setdefault(new_class, set()).add(value)
+
+    def evaluate(self, expression) -> Bitmap:
+        """
+        Candidates matching a filter expression (see module docstring)
+
+        Raises:
+            InvalidFacetQueryError: If the expression is malformed
+        """
+        if isinstance(expression, list):
+            return self._all_of(expression)
+        if not isinstance(expression, dict) or len(expression) != 1:
+            raise InvalidFacetQueryError('A filter is an object with a single key, or a list of filters')
+
+        (key, operand), = expression.items()
+        if key in ('and', 'or'):
+            if not isinstance(operand, list):
+                raise InvalidFacetQueryError(f'"{key}" takes a list of filters')
+            if key == 'and':
+                return self._all_of(operand)
+            result = Bitmap()
+            for item in operand:
+                result = result | self.evaluate(item)
+            return result
+        if key == 'not':
+            return self.all - self.evaluate(operand)
+        if key in self.bitmaps:
+            return self._any_value(key, operand)
+        raise InvalidFacetQueryError(f"Unknown facet or operator: {key}")
+
+    def _all_of(self, expressions: List) -> Bitmap:
+        if not expressions:
+            return self.all
+        # Smallest first, so every AND works on the fewest chunks
+        bitmaps = sorted((self.evaluate(item) for item in expressions), key=len)
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            if not result:
+                break
+            result = result & bitmap
+        return result
+
+    def _any_value(self, facet: str, operand) -> Bitmap:
+        values = operand if isinstance(operand, list) else [operand]
+        if not values or not all(isinstance(value, str) for value in values):
+            raise InvalidFacetQueryError(f'"{facet}" takes a value or a list of values')
+
+        result = Bitmap()
+        for value in values:
+            if facet in ('skill', 'language'):
+                value = normalize_skill(value)
+            bitmap = self.bitmaps[facet].get(value)
+            if bitmap is None and value in self.tails[facet]:
+                bitmap = Bitmap.from_ids(self.tails[facet].get(value))
+            if bitmap is not None:
+                result = result | bitmap if result else bitmap
+        return result
+
+    def counts(self, expression=None, facets: Optional[Sequence[str]] = None,
+               limit: Optional[int] = 20) -> Tuple[Bitmap, Dict[str, List[Dict]]]:
+        """
+        Candidates matching a filter, and per facet value how many of them have it
+
+        Args:
+            expression: Filter expression (default: every candidate)
+            facets: Facets to count (default: all)
+            limit: Values to return per facet, most frequent first (None for all)
+
+        Returns:
+            The matching candidates, and per facet a list of value and count,
+            most frequent first (values no candidate matches are left out)
+
+        Raises:
+            InvalidFacetQueryError: If the filter, a facet name or the limit is malformed
+        """
+        facets = FACETS if facets is None else facets
+        unknown = [facet for facet in facets if facet not in self.bitmaps]
+        if unknown:
+            raise InvalidFacetQueryError(f"Unknown facets: {', '.join(map(str, unknown))}")
+        if limit is not None and limit < 1:
+            raise InvalidFacetQueryError('limit must be positive')
+
+        matched = self.all if expression is None else self.evaluate(expression)
+        total = len(matched)
+        probe = None if matched is self.all else _Probe(matched)
+        table = None
+
+        results = {}
+        for facet in facets:
+            bitmaps = self.bitmaps[facet]
+            counted = []
+            # Counts of the limit best values so far; a value holding fewer
+            # candidates than the lowest of them, overall, cannot make the list
+            best = []
+            for size_class in sorted(self._classes[facet], reverse=True):
+                if len(best) == limit and min((1 << size_class) - 1, total) < best[0]:
+                    break
+                for value in self._classes[facet][size_class]:
+                    bitmap = bitmaps[value]
+                    if len(best) == limit and len(bitmap) < best[0]:
+                        continue
+                    count = len(bitmap) if probe is None else probe.count(bitmap)
+                    if not count:
+                        continue
+                    counted.append((count, value))
+                    if limit is not None:
+                        if len(best) < limit:
+                            heapq.heappush(best, count)
+                        elif count > best[0]:
+                            heapq.heapreplace(best, count)
+
+            # The tail in one pass, unless the list is already full of larger counts
+            least = best[0] if len(best) == limit else 1
+            tail = self.tails[facet]
+            if tail and min(SMALL_MAX, total) >= least:
+                if probe is None:
+                    counted.extend(tail.counts(least=least))
+                else:
+                    if table is None:
+                        table = probe.table(self._end())
+                    counted.extend(tail.counts(table, least))
+
+            counted.sort(key=lambda item: (-item[0], item[1]))
+            results[facet] = [{'value': value, 'count': count} for count, value in counted[:limit]]
+
+        return matched, results
+
+
+class ResumeFacetIndex:
+    """
+    FacetIndex over the resumes of a ResumeStore
+
+    Each query first applies the resumes inserted, updated or deleted since
+    the previous one, read from the store's resume_changes table.
+
+    Args:
+        store: ResumeStore to index
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.index = FacetIndex()
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _sync(self):
+        """Apply changes made since the last sync; the lock must be held"""
+        applied = 0
+        while True:
+            rows = self.store.changes_since(self._seq)
+            if not rows:
+                break
+            self.index.remove(row['resume_id'] for row in rows if row['deleted'])
+            self.index.update((row['resume_id'], candidate_facets(row)) for row in rows if not row['deleted'])
+            self._seq = rows[-1]['seq']
+            applied += len(rows)
+
+        if applied:
+            logger.debug(f"Applied {applied} resume changes to the facet index ({len(self.index)} candidates)")
+
+    def query(self, expression=None, facets: Optional[Sequence[str]] = None, limit: Optional[int] = 20,
+              ids: int = 0) -> Dict:
+        """
+        Facet counts of the candidates matching a filter
+
+        Args:
+            expression: Filter expression (default: every candidate)
+            facets: Facets to count (default: all)
+            limit: Values to return per facet
+            ids: Number of matching resume ids to return, newest first
+
+        Returns:
+            total (matching candidates), candidates (indexed candidates),
+            facets and, if ids were asked for, resume_ids
+
+        Raises:
+            InvalidFacetQueryError: If the filter or a facet name is malformed
+        """
+        with self._lock:
+            self._sync()
+            matched, counts = self.index.counts(expression, facets, limit)
+            result = {'total': len(matched), 'candidates': len(self.index), 'facets': counts}
+            if ids:
+                result['resume_ids'] = matched.ids(ids, reverse=True)
+            return result
@@ -1,31 +1,297 @@
 import os
+import codecs
+import mmap
 import docx2txt
 import PyPDF2
-from pdfminer.high_level import extract_text
 from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
 from pdfminer.converter import TextConverter
 from pdfminer.layout import LAParams
 from pdfminer.pdfpage import PDFPage
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import StringIO
 import logging
+import multiprocessing
+import threading
+from types import MappingProxyType
+from typing import Dict, Tuple
+
+try:
+    from charset_normalizer import from_bytes as detect_charset
+except ImportError:
+    detect_charset = None
+
+from utils.metrics import EXTRACTION_SECONDS
+from utils.guardrails import (
+    DocumentRejectedError, MemoryGuard, LEGACY_DOC_UNSUPPORTED, check_zip_archive, check_text_length,
+    limit_address_space, reject
+)
+from utils.docx_reader import doc_converter, read_doc, read_docx, sniff_format
+from utils.lifecycle import register_post_fork
 
 logger = logging.getLogger(__name__)
 
+# pdfminer layout analysis settings per extraction profile:
+# - fast: no layout analysis; glyphs are written in content-stream order
+#   with line breaks and spaces inferred from their positions
+# - balanced: characters are grouped into lines and boxes, but the costly
+#   hierarchical ordering of boxes (boxes_flow) is skipped
+# - accurate: pdfminer's default LAParams, as used by extract_text()
+PDF_PROFILES = MappingProxyType({
+    'fast': None,
+    'balanced': MappingProxyType({'boxes_flow': None}),
+    'accurate': MappingProxyType({})
+})
+
+# Byte order marks, longest first (the UTF-32 LE mark starts with the UTF-16 LE one)
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be')
+)
+
+# Western European code pages; cp1252 decodes the same letters as the others
+WESTERN_CODEPAGES = frozenset({'cp1252', 'latin_1', 'iso8859_15'})
+
+# Text files at least this large are memory-mapped instead of read into a copy
+TXT_MMAP_MIN_BYTES = 1024 * 1024
+
+# Bytes handed to charset_normalizer, which samples far less than this anyway
+DETECT_SAMPLE_BYTES = 64 * 1024
+
+def detect_encoding(sample: bytes):
+    """
+    Encoding of non-UTF-8 text according to charset_normalizer, or None
+    
+    Takes the least chaotic, most coherent decoding. When a Western code
+    page decodes the text as well, in the same language, the detector can't
+    tell them apart and cp1252 is reported: Spanish text otherwise comes out
+    as cp1250, with an acute n for every n with a tilde. Central European
+    text, which reads as another language (or worse) in cp1252, keeps its
+    code page.
+    """
+    if detect_charset is None:
+        return None
+    
+    matches = list(detect_charset(sample))
+    if not matches:
+        return None
+    
+    # Stable, so ties keep charset_normalizer's order
+    best = min(matches, key=lambda match: (match.chaos, -match.coherence))
+    for match in matches:
+        western = WESTERN_CODEPAGES.intersection(match.could_be_from_charset)
+        if western and (match is best or (match.chaos, match.coherence, match.language) ==
+                                          (best.chaos, best.coherence, best.language)):
+            return 'cp1252' if 'cp1252' in western else match.encoding
+    return best.encoding
+
+def decode_text(data) -> Tuple[str, str]:
+    """
+    Decode the bytes of a text file, detecting their encoding
+    
+    Checks for a byte order mark, then strict UTF-8, then asks
+    charset_normalizer (when installed, see detect_encoding()) and finally
+    falls back to cp1252 or latin-1, which decode any byte. Only the first
+    DETECT_SAMPLE_BYTES are copied for detection, so a memory-mapped file is
+    decoded into the result string without an intermediate copy.
+    
+    Args:
+        data: bytes or any buffer (e.g. an mmap) holding the file contents
+        
+    Returns:
+        Tuple of (text, encoding name)
+    """
+    with memoryview(data) as view:
+        for bom, encoding in BOMS:
+            if view[:len(bom)] == bom:
+                # utf-8-sig drops the mark itself; the explicit-endian codecs do not
+                start = 0 if encoding == 'utf-8-sig' else len(bom)
+                return str(view[start:], encoding, 'replace'), encoding
+        
+        try:
+            return str(view, 'utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        
+        sample = bytes(view[:DETECT_SAMPLE_BYTES])
+        if len(view) > DETECT_SAMPLE_BYTES:
+            # End on a line so a multi-byte character isn't cut in half
+            sample = sample[:sample.rfind(b'\n') + 1] or sample
+        
+        encoding = detect_encoding(sample)
+        if encoding is not None:
+            # The sample decoded cleanly; don't fail on a stray byte past it
+            return str(view, encoding, 'replace'), encoding
+        
+        try:
+            return str(view, 'cp1252'), 'cp1252'
+        except UnicodeDecodeError:
+            return str(view, 'latin-1'), 'latin-1'
+
+class FastTextDevice(PDFTextDevice):
+    """
+    Collect text without building pdfminer's layout objects
+    
+    Creating an LTChar per glyph and analysing the page layout dominates
+    pdfminer's cost. This device only tracks where the previous glyph ended:
+    a change of baseline starts a new line (a blank line after a large
+    vertical gap), a small horizontal gap inserts a space and a column-wide
+    gap starts a new line, as separate text boxes would.
+    """
+    
+    def __init__(self, rsrcmgr):
+        super().__init__(rsrcmgr)
+        self.parts = []
+        self._reset_line()
+    
+    def _reset_line(self):
+        self._line_y = None
+        self._line_end = None
+    
+    def begin_page(self, page, ctm):
+        super().begin_page(page, ctm)
+        self._reset_line()
+    
+    def end_page(self, page):
+        # Same page separator as TextConverter
+        self.parts.append('\n\f')
+    
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, *args):
+        adv = font.char_width(cid) * fontsize * scaling
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            return adv
+        
+        x, y = matrix[4], matrix[5]
+        height = fontsize * (abs(matrix[3]) or abs(matrix[1]) or 1)
+        
+        if self._line_y is not None:
+            gap = x - self._line_end
+            if abs(y - self._line_y) > height * 0.5:
+                self.parts.append('\n\n' if abs(y - self._line_y) > height * 2 else '\n')
+            elif gap > height * 3:
+                self.parts.append('\n')
+            elif gap > height * 0.15 and text != ' ' and self.parts[-1] != ' ':
+                self.parts.append(' ')
+        
+        self.parts.append(text)
+        self._line_y = y
+        self._line_end = x + adv * matrix[0]
+        return adv
+    
+    def get_text(self) -> str:
+        return ''.join(self.parts)
+
+def pdfminer_text(file_path: str, laparams: LAParams = None, page_numbers=None) -> str:
+    """
+    Extract text with pdfminer, without layout analysis when laparams is None
+    
+    Module-level so page ranges can be extracted in worker processes.
+    """
+    with open(file_path, 'rb') as file:
+        rsrcmgr = PDFResourceManager(caching=True)
+        if laparams is None:
+            device = FastTextDevice(rsrcmgr)
+        else:
+            output = StringIO()
+            device = TextConverter(rsrcmgr, output, laparams=laparams)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        
+        for page in PDFPage.get_pages(file, page_numbers, caching=True):
+            interpreter.process_page(page)
+        
+        device.close()
+    
+    return device.get_text() if laparams is None else output.getvalue()
+
+def pdf_page_count(file_path: str) -> int:
+    """Page count from the PDF's page tree, without parsing any page (0 if unknown)"""
+    try:
+        with open(file_path, 'rb') as file:
+            document = PDFDocument(PDFParser(file))
+            return int(resolve1(resolve1(document.catalog['Pages'])['Count']))
+    except Exception as e:
+        logger.debug(f"Could not read page count of {file_path}: {str(e)}")
+        return 0
+
 class FileHandler:
-    """Handle file operations and text extraction from various file formats"""
+    """
+    Handle file operations and text extraction from various file formats
+    
+    Safe to share across threads: configuration is fixed at construction
+    and every extraction builds its own parser objects and buffers. The
+    page pool and the memory watchdog are started lazily under a lock.
+    """
     
-    def __init__(self):
-        self.supported_formats = ['pdf', 'docx', 'doc', 'txt']
+    def __init__(self, max_text_chars: int = 200000, memory_headroom_mb: int = 1024,
+                 max_zip_ratio: float = 100.0, max_zip_entry_bytes: int = 50 * 1024 * 1024,
+                 max_zip_total_bytes: int = 100 * 1024 * 1024, pdf_profile: str = 'accurate',
+                 pdf_parallel_min_pages: int = 8, pdf_parallel_workers: int = 0, docx_char_budget: int = 0):
+        self.supported_formats = ('pdf', 'docx', 'doc', 'txt')
+        
+        # Default PDF extraction profile (see PDF_PROFILES)
+        if pdf_profile not in PDF_PROFILES:
+            raise ValueError(f"Unknown PDF extraction profile: {pdf_profile}")
+        self.pdf_profile = pdf_profile
+        self.laparams = MappingProxyType({
+            profile: None if params is None else LAParams(**params)
+            for profile, params in PDF_PROFILES.items()
+        })
+        
+        # Page-parallel extraction of long PDFs (fewer than 2 workers disables)
+        self.pdf_parallel_min_pages = pdf_parallel_min_pages
+        self.pdf_parallel_workers = pdf_parallel_workers
+        self._page_pool = None
+        self._page_pool_lock = threading.Lock()
+        register_post_fork(self._after_fork)
+        
+        # DOCX text beyond this many characters is not read (0 reads everything)
+        self.docx_char_budget = docx_char_budget
+        
+        # Resource guardrails (see utils/guardrails.py)
+        self.max_text_chars = max_text_chars
+        self.memory_guard = MemoryGuard(headroom_mb=memory_headroom_mb)
+        self.max_zip_ratio = max_zip_ratio
+        self.max_zip_entry_bytes = max_zip_entry_bytes
+        self.max_zip_total_bytes = max_zip_total_bytes
     
-    def extract_text(self, file_path: str) -> str:
+    def extract_text(self, file_path: str, pdf_profile: str = None) -> str:
         """
         Extract text from various file formats
         
         Args:
             file_path: Path to the file
+            pdf_profile: PDF extraction profile (default: the handler's profile)
             
         Returns:
             Extracted text content
+            
+        Raises:
+            DocumentRejectedError: If the document trips a resource guardrail
+        """
+        text, _ = self.extract(file_path, pdf_profile)
+        return text
+    
+    def extract(self, file_path: str, pdf_profile: str = None) -> Tuple[str, Dict]:
+        """
+        Extract text and report how it was extracted
+        
+        Returns:
+            Tuple of (extracted text, extraction details: pdf_profile for
+            PDFs, format and truncated for Word documents, the detected
+            encoding for text files)
+            
+        Raises:
+            DocumentRejectedError: If the document trips a resource guardrail
         """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
@@ -34,33 +300,56 @@ class FileHandler:
         _, extension = os.path.splitext(file_path)
         extension = extension.lower().lstrip('.')
         
+        details = {}
+        
         try:
             if extension == 'pdf':
-                return self._extract_from_pdf(file_path)
+                details['pdf_profile'] = pdf_profile or self.pdf_profile
+                text = self._extract_from_pdf(file_path, details['pdf_profile'])
             elif extension in ['docx', 'doc']:
-                return self._extract_from_docx(file_path)
+                text, word_details = self._extract_from_word(file_path)
+                details.update(word_details)
             elif extension == 'txt':
-                return self._extract_from_txt(file_path)
+                text, details['encoding'] = self._extract_from_txt(file_path)
             else:
                 raise ValueError(f"Unsupported file format: {extension}")
-                
+            
+            check_text_length(text, self.max_text_chars)
+            return text, details
+            
+        except DocumentRejectedError:
+            raise
+            
         except Exception as e:
             logger.error(f"Error extracting text from {file_path}: {str(e)}")
             raise e
     
-    def _extract_from_pdf(self, file_path: str) -> str:
+    def _extract_from_pdf(self, file_path: str, profile: str = 'accurate') -> str:
         """Extract text from PDF files using multiple methods"""
+        if profile not in PDF_PROFILES:
+            raise ValueError(f"Unknown PDF extraction profile: {profile}")
+        
         text = ""
         
         try:
-            # Method 1: Use pdfminer (most reliable)
-            text = extract_text(file_path)
+            # Method 1: Use pdfminer (most reliable), spread over processes for long documents
+            page_count = self._parallel_page_count(file_path)
+            engine = 'pdfminer_parallel' if page_count else 'pdfminer'
+            with EXTRACTION_SECONDS.time(engine=engine, profile=profile), self.memory_guard.guard(engine):
+                if page_count:
+                    text = self._extract_pages_parallel(file_path, profile, page_count)
+                else:
+                    text = self._extract_pdfminer(file_path, profile)
             
             # If pdfminer doesn't work well, try PyPDF2 as backup
             if len(text.strip()) < 100:  # If extracted text is too short
                 logger.warning(f"pdfminer extracted minimal text from {file_path}, trying PyPDF2")
                 text = self._extract_pdf_pypdf2(file_path)
                 
+        except DocumentRejectedError:
+            # Don't retry a document that has already exhausted its budget
+            raise
+            
         except Exception as e:
             logger.warning(f"pdfminer failed for {file_path}: {str(e)}, trying PyPDF2")
             try:
@@ -71,12 +360,79 @@ class FileHandler:
         
         return text.strip()
     
+    def _extract_pdfminer(self, file_path: str, profile: str) -> str:
+        """Extract text with pdfminer using a profile's layout settings"""
+        return pdfminer_text(file_path, self.laparams[profile])
+    
+    def _parallel_page_count(self, file_path: str) -> int:
+        """Page count if the PDF is long enough to extract in parallel, else 0"""
+        if self.pdf_parallel_workers < 2:
+            return 0
+        
+        page_count = pdf_page_count(file_path)
+        return page_count if page_count >= self.pdf_parallel_min_pages else 0
+    
+    def _extract_pages_parallel(self, file_path: str, profile: str, page_count: int) -> str:
+        """
+        Extract contiguous page ranges in worker processes and join them in order
+        
+        Pages are independent in pdfminer's text output (each ends with a form
+        feed), so the result is the same as a sequential extraction.
+        """
+        chunks = min(self.pdf_parallel_workers, page_count)
+        bounds = [page_count * index // chunks for index in range(chunks + 1)]
+        file_path = os.path.abspath(file_path)
+        
+        try:
+            pool = self._get_page_pool()
+            futures = [
+                pool.submit(pdfminer_text, file_path, self.laparams[profile], set(range(start, end)))
+                for start, end in zip(bounds, bounds[1:])
+            ]
+            return ''.join(future.result() for future in futures)
+            
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool next time
+            with self._page_pool_lock:
+                self._page_pool = None
+            raise
+    
+    def _get_page_pool(self) -> ProcessPoolExecutor:
+        """
+        Process pool for page ranges, created on first use
+        
+        Workers come from a fork server rather than forking this process,
+        which may be running threads (log writer, executor) at the time. The
+        fork server imports this module once, so workers start with pdfminer
+        already loaded. The workers only ever extract, so each caps its own
+        address space at its size plus the extraction headroom.
+        """
+        with self._page_pool_lock:
+            if self._page_pool is None:
+                if 'forkserver' in multiprocessing.get_all_start_methods():
+                    context = multiprocessing.get_context('forkserver')
+                    context.set_forkserver_preload([__name__])
+                else:
+                    context = multiprocessing.get_context('spawn')
+                self._page_pool = ProcessPoolExecutor(
+                    max_workers=self.pdf_parallel_workers, mp_context=context,
+                    initializer=limit_address_space, initargs=(self.memory_guard.headroom_mb,)
+                )
+                logger.info(f"Started page extraction pool with {self.pdf_parallel_workers} processes")
+            return self._page_pool
+    
+    def _after_fork(self):
+        """A pool started before fork belongs to the parent process"""
+        self._page_pool = None
+        self._page_pool_lock = threading.Lock()
+    
     def _extract_pdf_pypdf2(self, file_path: str) -> str:
         """Extract text from PDF using PyPDF2"""
         text = ""
         
         try:
-            with open(file_path, 'rb') as file:
+            with EXTRACTION_SECONDS.time(engine='pypdf2'), self.memory_guard.guard('pypdf2'), \
+                    open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 
                 # Extract text from all pages
@@ -85,40 +441,99 @@ class FileHandler:
                     page_text = page.extract_text()
                     text += page_text + "\n"
                     
+                    # Stop paging through an oversized document early
+                    check_text_length(text, self.max_text_chars)
+                    
+        except DocumentRejectedError:
+            raise
+            
         except Exception as e:
             logger.error(f"PyPDF2 extraction failed for {file_path}: {str(e)}")
             raise e
         
         return text.strip()
     
-    def _extract_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX/DOC files"""
+    def _extract_from_word(self, file_path: str) -> Tuple[str, Dict]:
+        """
+        Extract text from DOCX/DOC files by their content, whatever the extension
+        
+        Returns:
+            Tuple of (text, {'format': 'docx' or 'doc', 'truncated': bool})
+        """
+        if sniff_format(file_path) == 'ole':
+            return self._extract_from_doc(file_path), {'format': 'doc', 'truncated': False}
+        
+        text, truncated = self._extract_from_docx(file_path)
+        return text, {'format': 'docx', 'truncated': truncated}
+    
+    def _extract_from_docx(self, file_path: str) -> Tuple[str, bool]:
+        """Extract the body text of a DOCX, returning (text, whether the budget cut it short)"""
+        # Reject zip bombs before anything is inflated
+        check_zip_archive(file_path, self.max_zip_ratio, self.max_zip_entry_bytes, self.max_zip_total_bytes)
+        
+        # Stop at the budget, or as soon as the text is too long to be accepted anyway
+        max_chars = self.docx_char_budget
+        if self.max_text_chars and (not max_chars or self.max_text_chars < max_chars):
+            max_chars = self.max_text_chars + 1
+        
         try:
-            text = docx2txt.process(file_path)
-            return text.strip()
+            with EXTRACTION_SECONDS.time(engine='docx_stream'), self.memory_guard.guard('docx_stream'):
+                text, stopped = read_docx(file_path, max_chars)
+            truncated = stopped and max_chars == self.docx_char_budget
+            return text.strip(), truncated
+            
+        except DocumentRejectedError:
+            raise
+            
+        except Exception as e:
+            logger.warning(f"Streaming DOCX extraction failed for {file_path}, trying docx2txt: {str(e)}")
+        
+        try:
+            with EXTRACTION_SECONDS.time(engine='docx2txt'), self.memory_guard.guard('docx2txt'):
+                text = docx2txt.process(file_path)
+            return text.strip(), False
+            
+        except DocumentRejectedError:
+            raise
             
         except Exception as e:
             logger.error(f"Error extracting text from DOCX file {file_path}: {str(e)}")
             raise e
     
-    def _extract_from_txt(self, file_path: str) -> str:
-        """Extract text from plain text files"""
+    def _extract_from_doc(self, file_path: str) -> str:
+        """Extract text from a legacy (OLE) .doc with antiword or catdoc"""
+        if doc_converter() is None:
+            raise reject(
+                LEGACY_DOC_UNSUPPORTED,
+                'Legacy Word 97-2003 .doc files are not supported on this server; please upload DOCX or PDF'
+            )
+        
+        try:
+            with EXTRACTION_SECONDS.time(engine='doc'), self.memory_guard.guard('doc'):
+                text = read_doc(file_path)
+            return text.strip()
+            
+        except DocumentRejectedError:
+            raise
+            
+        except Exception as e:
+            logger.error(f"Error extracting text from DOC file {file_path}: {str(e)}")
+            raise e
+    
+    def _extract_from_txt(self, file_path: str) -> Tuple[str, str]:
+        """Extract text from plain text files, returning (text, detected encoding)"""
         try:
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as file:
-                        text = file.read()
-                        return text.strip()
-                except UnicodeDecodeError:
-                    continue
-            
-            # If all encodings fail, read as binary and decode with errors='ignore'
-            with open(file_path, 'rb') as file:
-                text = file.read().decode('utf-8', errors='ignore')
-                return text.strip()
+            with EXTRACTION_SECONDS.time(engine='txt'), open(file_path, 'rb') as file:
+                size = os.fstat(file.fileno()).st_size
+                
+                # Read the bytes once; large files are decoded straight from the page cache
+                if size >= TXT_MMAP_MIN_BYTES:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        text, encoding = decode_text(data)
+                else:
+                    text, encoding = decode_text(file.read())
+                
+                return text.strip(), encoding
                 
         except Exception as e:
             logger.error(f"Error reading text file {file_path}: {str(e)}")
@@ -0,0 +1,265 @@
+"""
+Resource guardrails for text extraction
+
+A 10 MB upload limit does not bound how much memory a document costs once
+it is decoded: image-heavy or malformed PDFs can make pdfminer's layout
+analysis allocate hundreds of MB, and a DOCX is a zip archive that may
+expand to gigabytes. These checks reject such documents early, each with a
+specific error code that is reported to the client and counted in
+resume_parser_guardrail_rejections_total.
+"""
+import contextlib
+import ctypes
+import logging
+import os
+import threading
+import time
+import zipfile
+from typing import Dict, Set
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from utils.lifecycle import register_post_fork
+from utils.metrics import GUARDRAIL_REJECTIONS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Error codes returned to clients
+MEMORY_LIMIT = 'memory_limit_exceeded'
+ZIP_RATIO = 'zip_ratio_exceeded'
+ZIP_ENTRY_SIZE = 'zip_entry_too_large'
+ZIP_TOTAL_SIZE = 'zip_total_too_large'
+TEXT_TOO_LONG = 'text_too_long'
+# Not a resource limit: a legacy .doc on a host without a .doc converter
+LEGACY_DOC_UNSUPPORTED = 'legacy_doc_unsupported'
+
+# Small entries compress unusually well (empty parts, repeated markup), so
+# the ratio is only checked once an entry inflates to a meaningful size
+RATIO_MIN_BYTES = 1024 * 1024
+
+
+class DocumentRejectedError(ValueError):
+    """Raised when a document trips a resource guardrail"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def reject(code: str, message: str) -> DocumentRejectedError:
+    """Count a rejection and build the error to raise"""
+    GUARDRAIL_REJECTIONS_TOTAL.inc(guard=code)
+    logger.warning(f"Document rejected ({code}): {message}")
+    return DocumentRejectedError(code, message)
+
+
+def _virtual_memory_size() -> int:
+    """Current address space size of this process in bytes (0 if unknown)"""
+    try:
+        with open('/proc/self/statm', 'r') as file:
+            return int(file.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _resident_size() -> int:
+    """Current resident set size of this process in bytes (0 if unknown)"""
+    try:
+        with open('/proc/self/statm', 'r') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _raise_in_thread(thread_id: int, exception) -> bool:
+    """
+    Schedule an exception in another thread
+
+    The thread raises it at its next bytecode, which interrupts pure Python
+    work such as pdfminer's layout analysis but not a single native call.
+    """
+    return ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), ctypes.py_object(exception)) > 0
+
+
+def limit_address_space(headroom_mb: int):
+    """
+    Cap this process's address space at its current size plus headroom_mb
+
+    RLIMIT_AS holds for every allocation for the rest of the process's life,
+    so this is only for processes that do nothing but extract, e.g. the
+    workers of the page extraction pool (used as their initializer).
+    """
+    current = _virtual_memory_size()
+    if resource is None or headroom_mb <= 0 or not current:
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + headroom_mb * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not set RLIMIT_AS: {str(e)}")
+
+
+class MemoryGuard:
+    """
+    Resident memory watchdog for document extraction
+
+    Nothing is capped outside ``guard()`` blocks. While at least one
+    extraction runs under one, a watchdog thread samples the process's
+    resident size every ``interval`` seconds; an extraction may grow it by
+    ``headroom_mb`` over the size at the time it started. Past that,
+    MemoryError is raised in the extracting thread, and ``guard()`` turns it
+    into a DocumentRejectedError instead of letting the OOM killer take down
+    the worker. The resident size is the whole process's, so concurrent
+    extractions each check their own limit against the total.
+
+    Args:
+        headroom_mb: Growth allowed per extraction (0 disables)
+        interval: Seconds between samples
+    """
+
+    def __init__(self, headroom_mb: int = 1024, interval: float = 0.05):
+        self.headroom_mb = headroom_mb
+        self.interval = interval
+        self._supported = hasattr(ctypes, 'pythonapi') and _resident_size() > 0
+        self._after_fork()
+        register_post_fork(self._after_fork)
+
+    @property
+    def enabled(self) -> bool:
+        return self.headroom_mb > 0 and self._supported
+
+    def _after_fork(self):
+        """The watchdog thread and the watched threads belong to the parent process"""
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # Thread id -> resident size that thread's extraction may not exceed
+        self._limits: Dict[int, int] = {}
+        # Threads an exception was raised in, until their guard() exits
+        self._aborted: Set[int] = set()
+        self._watchdog = None
+
+    def _watch(self):
+        """Watchdog loop: sleeps while nothing is guarded"""
+        while True:
+            with self._lock:
+                while not self._limits:
+                    self._wakeup.wait()
+
+                resident = _resident_size()
+                for thread_id, limit in list(self._limits.items()):
+                    if resident > limit:
+                        # Each extraction is aborted once; it stops being watched
+                        del self._limits[thread_id]
+                        self._aborted.add(thread_id)
+                        _raise_in_thread(thread_id, MemoryError)
+
+            time.sleep(self.interval)
+
+    def _enter(self, thread_id: int):
+        with self._lock:
+            self._aborted.discard(thread_id)
+            self._limits[thread_id] = _resident_size() + self.headroom_mb * 1024 * 1024
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(target=self._watch, name='memory-guard', daemon=True)
+                self._watchdog.start()
+            self._wakeup.notify()
+
+    def _leave(self, thread_id: int):
+        with self._lock:
+            self._limits.pop(thread_id, None)
+            aborted = thread_id in self._aborted
+            self._aborted.discard(thread_id)
+
+        if aborted:
+            # The extraction may have finished before the exception arrived:
+            # let it arrive here and drop it. Clearing it with
+            # PyThreadState_SetAsyncExc(NULL) instead leaves the interpreter's
+            # eval breaker set on CPython 3.11, and the next cProfile run
+            # (see utils/profiling.py) spins forever on its first call.
+            try:
+                for _ in range(2):
+                    pass
+            except MemoryError:
+                pass
+
+    @contextlib.contextmanager
+    def guard(self, engine: str):
+        """Run extraction under the watchdog, reporting an overrun as a rejection"""
+        thread_id = threading.get_ident() if self.enabled else None
+        try:
+            if thread_id is not None:
+                self._enter(thread_id)
+            try:
+                yield
+            finally:
+                if thread_id is not None:
+                    self._leave(thread_id)
+        except MemoryError:
+            # Also catches an exception the watchdog raised just as the block ended
+            raise reject(
+                MEMORY_LIMIT,
+                f"Document needs more memory than allowed for extraction ({engine})"
+            ) from None
+
+
+def check_zip_archive(file_path: str, max_ratio: float, max_entry_bytes: int, max_total_bytes: int):
+    """
+    Inspect a zip container (DOCX) before anything is decompressed
+
+    Uses only the sizes declared in the central directory, so a zip bomb is
+    rejected without inflating a single byte.
+
+    Raises:
+        DocumentRejectedError: If an entry or the archive exceeds a limit
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            entries = archive.infolist()
+    except zipfile.BadZipFile:
+        # Not a zip (e.g. a legacy .doc); leave it to the extractor to fail
+        return
+
+    total_size = 0
+
+    for entry in entries:
+        if entry.file_size > max_entry_bytes:
+            raise reject(
+                ZIP_ENTRY_SIZE,
+                f"Archive entry {entry.filename} expands to {entry.file_size} bytes (max: {max_entry_bytes})"
+            )
+
+        ratio = entry.file_size / max(entry.compress_size, 1)
+        if entry.file_size >= RATIO_MIN_BYTES and ratio > max_ratio:
+            raise reject(
+                ZIP_RATIO,
+                f"Archive entry {entry.filename} has compression ratio {ratio:.0f}:1 (max: {max_ratio:.0f}:1)"
+            )
+
+        total_size += entry.file_size
+
+    if total_size > max_total_bytes:
+        raise reject(
+            ZIP_TOTAL_SIZE,
+            f"Archive expands to {total_size} bytes (max: {max_total_bytes})"
+        )
+
+
+def check_text_length(text: str, max_chars: int):
+    """
+    Reject documents whose extracted text is longer than any real resume
+
+    Raises:
+        DocumentRejectedError: If more than max_chars were extracted
+    """
+    if max_chars and len(text) > max_chars:
+        raise reject(
+            TEXT_TOO_LONG,
+            f"Extracted text is {len(text)} characters (max: {max_chars})"
+        )
@@ -0,0 +1,228 @@
+"""
+Registered job requirement profiles
+
+Matching against a job used to mean shipping its requirements with every
+request and normalizing the required skills on every match. A job can
+instead be registered once under its job_id; its requirements are
+compiled into an immutable JobProfile (skill ids, thresholds and the
+embedding of its text) that every match reads without copying or locking.
+
+Profiles are versioned. Each registration of a job_id bumps the version,
+or carries an explicit version from the backend that owns the job, and a
+write older than the current version is rejected. The compiled profile is
+swapped in with one assignment, so a match sees either the old or the new
+requirements, never a mix.
+
+With a resume store the requirements are stored in its job_profiles table
+and every worker process keeps an LRU cache of compiled profiles,
+revalidated against the stored version on each lookup. Without a store
+the registry lives in process memory only and an evicted job must be
+registered again.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from utils.metrics import JOB_PROFILE_CACHE_TOTAL
+from utils.resume_store import StaleVersionError
+from utils.semantic import EMBEDDER, job_fragments
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidJobRequirementsError(ValueError):
+    """Raised when job requirements are not in the expected shape"""
+
+
+def normalize_skill(skill: str) -> str:
+    """
+    Skill id used for matching: case-folded with whitespace collapsed
+
+    "Machine  Learning" and "machine learning" share the id
+    "machine learning".
+    """
+    return ' '.join(skill.casefold().split())
+
+
+class JobProfile(NamedTuple):
+    """Job requirements compiled for matching"""
+
+    job_id: Optional[str]
+    version: int
+    # (skill as given, skill id) pairs in the given order; a repeated skill
+    # counts once per occurrence towards the skills score
+    required_skills: Optional[Tuple[Tuple[str, str], ...]]
+    skill_ids: FrozenSet[str]
+    min_experience: Optional[float]
+    education_required: bool
+    # Unit float32 vector of the title, description and skills (see utils/semantic.py), None without text
+    embedding: Optional[bytes] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.job_id,
+            'version': self.version,
+            'required_skills': [skill for skill, _ in self.required_skills or ()],
+            'skill_ids': [skill_id for _, skill_id in self.required_skills or ()],
+            'min_experience': self.min_experience,
+            'education_required': self.education_required
+        }
+
+
+def compile_job_requirements(job_requirements: Dict, job_id: Optional[str] = None, version: int = 0) -> JobProfile:
+    """
+    Validate and compile job requirements
+
+    Args:
+        job_requirements: required_skills (list of strings), min_experience
+            (years), education_required, title and description, each optional
+        job_id: Job the requirements belong to
+        version: Version of the requirements
+
+    Raises:
+        InvalidJobRequirementsError: If a field has the wrong type
+    """
+    if not isinstance(job_requirements, dict):
+        raise InvalidJobRequirementsError('job_requirements must be an object')
+
+    required_skills = None
+    if 'required_skills' in job_requirements:
+        skills = job_requirements['required_skills']
+        if not isinstance(skills, (list, tuple)) or not all(isinstance(skill, str) for skill in skills):
+            raise InvalidJobRequirementsError('required_skills must be a list of strings')
+
+        required_skills = tuple((skill, normalize_skill(skill)) for skill in skills)
+
+    min_experience = None
+    if 'min_experience' in job_requirements:
+        min_experience = job_requirements['min_experience']
+        # A negative minimum is met by every resume, as it always has been
+        if isinstance(min_experience, bool) or not isinstance(min_experience, (int, float)):
+            raise InvalidJobRequirementsError('min_experience must be a number of years')
+
+    for field in ('title', 'description'):
+        if job_requirements.get(field) is not None and not isinstance(job_requirements[field], str):
+            raise InvalidJobRequirementsError(f'{field} must be a string')
+
+    fragments = job_fragments(job_requirements)
+    embedding = EMBEDDER.embed(fragments).tobytes() if fragments else None
+
+    return JobProfile(
+        job_id=job_id,
+        version=version,
+        required_skills=required_skills,
+        skill_ids=frozenset(skill_id for _, skill_id in required_skills or ()),
+        min_experience=min_experience,
+        education_required=bool(job_requirements.get('education_required', False)),
+        embedding=embedding
+    )
+
+
+class JobProfileRegistry:
+    """
+    Compiled job profiles by job_id
+
+    Args:
+        max_profiles: Compiled profiles kept per process (least recently used are evicted)
+        store: Optional ResumeStore holding the requirements for all workers
+    """
+
+    def __init__(self, max_profiles: int = 10000, store=None):
+        self.max_profiles = max(1, max_profiles)
+        self.store = store
+        self._profiles: 'OrderedDict[str, JobProfile]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def register(self, job_id: str, job_requirements: Dict, version: Optional[int] = None) -> JobProfile:
+        """
+        Compile and register a job's requirements
+
+        Args:
+            job_id: Job to register
+            job_requirements: Requirements, as accepted by compile_job_requirements
+            version: Version set by the caller; by default the current version plus one
+
+        Returns:
+            The registered profile
+
+        Raises:
+            InvalidJobRequirementsError: If the requirements are malformed
+            StaleVersionError: If version is not newer than the registered one
+        """
+        # Validate before anything is stored
+        profile = compile_job_requirements(job_requirements, job_id)
+
+        if self.store is not None:
+            version = self.store.save_job_profile(job_id, job_requirements, version)
+            profile = profile._replace(version=version)
+            self._cache(profile)
+            return profile
+
+        with self._lock:
+            current = self._profiles.get(job_id)
+            current_version = current.version if current else 0
+            if version is None:
+                version = current_version + 1
+            elif version <= current_version:
+                if version == current_version and current == profile._replace(version=version):
+                    return current
+                raise StaleVersionError(job_id, version, current_version)
+
+            profile = profile._replace(version=version)
+            self._put(profile)
+        return profile
+
+    def get(self, job_id: str) -> Optional[JobProfile]:
+        """The job's current compiled profile, None if it is not registered"""
+        if self.store is None:
+            with self._lock:
+                profile = self._profiles.get(job_id)
+                if profile is not None:
+                    self._profiles.move_to_end(job_id)
+            JOB_PROFILE_CACHE_TOTAL.inc(event='hit' if profile else 'miss')
+            return profile
+
+        # Another worker may have registered a newer version
+        version = self.store.job_profile_version(job_id)
+        with self._lock:
+            profile = self._profiles.get(job_id)
+            if version is None:
+                self._profiles.pop(job_id, None)
+                profile = None
+            elif profile is not None and profile.version == version:
+                self._profiles.move_to_end(job_id)
+                JOB_PROFILE_CACHE_TOTAL.inc(event='hit')
+                return profile
+
+        JOB_PROFILE_CACHE_TOTAL.inc(event='miss')
+        if version is None:
+            return None
+
+        stored = self.store.get_job_profile(job_id)
+        if stored is None:
+            return None
+        profile = compile_job_requirements(stored['requirements'], job_id, stored['version'])
+        return self._cache(profile)
+
+    def _cache(self, profile: JobProfile) -> JobProfile:
+        """Cache a profile unless a newer version of the job is already cached"""
+        with self._lock:
+            current = self._profiles.get(profile.job_id)
+            if current is not None and current.version > profile.version:
+                return current
+            self._put(profile)
+        return profile
+
+    def _put(self, profile: JobProfile):
+        """Insert or replace a profile, evicting the least recently used; the lock must be held"""
+        self._profiles[profile.job_id] = profile
+        self._profiles.move_to_end(profile.job_id)
+
+        while len(self._profiles) > self.max_profiles:
+            job_id, _ = self._profiles.popitem(last=False)
+            JOB_PROFILE_CACHE_TOTAL.inc(event='eviction')
+            logger.debug(f"Evicted compiled job profile {job_id}")
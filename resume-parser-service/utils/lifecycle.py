@@ -0,0 +1,57 @@
+import gc
+import logging
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+# Callbacks that re-create fork-unsafe resources (threads, pools, connections)
+# in a freshly forked worker
+_post_fork_hooks: List[Callable[[], None]] = []
+
+
+def register_post_fork(hook: Callable[[], None]) -> Callable[[], None]:
+    """
+    Register a callback to run in each worker right after it is forked
+
+    Can be used as a decorator. Hooks run in registration order.
+    """
+    _post_fork_hooks.append(hook)
+    return hook
+
+
+def prepare_master():
+    """
+    Prepare the master process for building shared state
+
+    Disabling the cyclic GC while the application is imported and warmed up
+    avoids freed holes in the pages that workers will later share
+    copy-on-write. freeze_shared_state() turns it back on.
+    """
+    gc.disable()
+
+
+def freeze_shared_state():
+    """
+    Move every object allocated so far into the permanent GC generation
+
+    Called in the master right before forking so that collections in the
+    workers never touch (and therefore never copy) the pages holding the
+    preloaded parsers, compiled patterns and NLP models. The GC is then
+    re-enabled in the master, which outlives every worker and would
+    otherwise never collect cycles again; the next fork freezes whatever
+    it allocated since.
+    """
+    gc.freeze()
+    gc.enable()
+    logger.debug(f"Frozen {gc.get_freeze_count()} objects before fork")
+
+
+def after_fork():
+    """Re-enable the GC and re-create fork-unsafe resources in a worker"""
+    gc.enable()
+
+    for hook in _post_fork_hooks:
+        try:
+            hook()
+        except Exception as e:
+            logger.error(f"Post-fork hook {getattr(hook, '__name__', hook)} failed: {str(e)}")
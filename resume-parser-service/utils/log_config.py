@@ -0,0 +1,222 @@
+"""
+Non-blocking structured logging for the Resume Parser Service
+
+Request threads only put records on a bounded in-memory queue; a background
+QueueListener formats them as JSON and writes them to the log file and
+stderr. When the queue is full (for example because the disk is stalling),
+records below ERROR are dropped instead of blocking the request.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from utils.lifecycle import register_post_fork
+from utils.metrics import LOG_RECORDS_DROPPED_TOTAL, LOG_RECORDS_SUPPRESSED_TOTAL
+
+# Id of the request being handled in the current context
+request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+
+        return json.dumps(entry, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request id to every record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'request_id'):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most ``burst`` WARNING records per call site every
+    ``interval`` seconds
+
+    The first record emitted after a suppressed period carries a
+    ``suppressed`` count of the records that were dropped.
+    """
+
+    def __init__(self, burst: int = 10, interval: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.WARNING or self.burst <= 0:
+            return True
+
+        key = (record.name, record.levelno, record.pathname, record.lineno)
+        now = time.monotonic()
+
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+
+            window[2] += 1
+
+        LOG_RECORDS_SUPPRESSED_TOTAL.inc()
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops low-severity records instead of blocking on a full queue"""
+
+    def __init__(self, log_queue: queue.Queue, block_timeout: float = 0.05):
+        super().__init__(log_queue)
+        self.block_timeout = block_timeout
+        self._exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge message arguments now, keeping any traceback separate from the message"""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.ERROR:
+                # Errors are worth a short wait, but never an unbounded one
+                try:
+                    self.queue.put(record, timeout=self.block_timeout)
+                    return
+                except queue.Full:
+                    pass
+            LOG_RECORDS_DROPPED_TOTAL.inc(level=record.levelname)
+
+
+class _Listener(QueueListener):
+    """QueueListener whose stop() waits for room in a full queue"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class _LoggingState:
+    """Handlers owned by configure_logging(), kept so they can be rebuilt after fork"""
+
+    def __init__(self):
+        self.queue_handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[_Listener] = None
+        self.output_handlers = []
+        self.queue_size = 0
+
+
+_state = _LoggingState()
+
+
+def configure_logging(log_file: str, level: str = 'INFO', queue_size: int = 10000,
+                      warning_burst: int = 10, warning_interval: float = 60.0):
+    """
+    Route all logging through a bounded queue drained by a background writer
+
+    Args:
+        log_file: Path of the JSON log file
+        level: Root log level
+        queue_size: Maximum number of records buffered in memory
+        warning_burst: WARNING records per call site allowed each interval
+        warning_interval: Rate limiting window in seconds
+    """
+    log_dir = os.path.dirname(log_file)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    formatter = JsonFormatter()
+    file_handler = logging.FileHandler(log_file)
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    _state.output_handlers = [file_handler, stream_handler]
+    _state.queue_size = queue_size
+
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    queue_handler.addFilter(RequestContextFilter())
+    queue_handler.addFilter(RateLimitFilter(burst=warning_burst, interval=warning_interval))
+    _state.queue_handler = queue_handler
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _start_listener()
+
+
+def _start_listener():
+    """Start the background writer draining the queue"""
+    _state.listener = _Listener(
+        _state.queue_handler.queue, *_state.output_handlers, respect_handler_level=True
+    )
+    _state.listener.start()
+
+
+def stop_logging():
+    """Flush queued records and stop the background writer"""
+    if _state.listener is not None:
+        _state.listener.stop()
+        _state.listener = None
+
+
+@register_post_fork
+def _restart_listener_after_fork():
+    """The writer thread does not survive fork; give the worker its own queue and thread"""
+    if _state.queue_handler is None:
+        return
+
+    _state.queue_handler.queue = queue.Queue(maxsize=_state.queue_size)
+    _start_listener()
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,378 @@
+"""
+Prometheus-style metrics for the Resume Parser Service
+
+Metric updates on the hot path never take a lock: every thread writes to its
+own shard and shards are only summed when /metrics is scraped. Shards of
+threads that have exited are folded into a retired total at scrape time and
+whenever the shard list has doubled since the last fold, so thread-per-request
+servers do not grow the shard list without bound even if nothing scrapes.
+
+Each worker process keeps its own registry; scrape every worker (or put the
+service behind one worker per target) to see the complete picture.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.lifecycle import register_post_fork
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (
+    10 * 1024, 50 * 1024, 100 * 1024, 250 * 1024, 500 * 1024,
+    1024 * 1024, 2.5 * 1024 * 1024, 5 * 1024 * 1024, 10 * 1024 * 1024
+)
+
+# Per-request stage timings, only collected while record_stages() is active
+_stage_recorder: ContextVar[Optional[Dict]] = ContextVar('stage_recorder', default=None)
+
+
+@contextmanager
+def record_stages():
+    """
+    Collect the timings of every timed block run in the current context
+
+    Yields a dict mapping stage names (for example ``parse:skills``) to
+    ``{'seconds': ..., 'calls': ...}``.
+    """
+    stages = _stage_recorder.get()
+    if stages is not None:
+        # Nested recorders share the outermost one
+        yield stages
+        return
+
+    stages, token = begin_stage_recording()
+    try:
+        yield stages
+    finally:
+        end_stage_recording(token)
+
+
+def begin_stage_recording() -> Tuple[Dict, object]:
+    """Start recording stage timings in the current context (see record_stages)"""
+    stages = {}
+    return stages, _stage_recorder.set(stages)
+
+
+def end_stage_recording(token):
+    """Stop a recording started with begin_stage_recording()"""
+    try:
+        _stage_recorder.reset(token)
+    except ValueError:
+        # Token created in another context (e.g. a streamed response); nothing to undo here
+        pass
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = '') -> str:
+    """Render a Prometheus label set"""
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(labelnames, labelvalues)
+    ]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value"""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Timer:
+    """Context manager that observes the elapsed time into a histogram"""
+
+    __slots__ = ('_histogram', '_labelvalues', '_started', 'elapsed')
+
+    def __init__(self, histogram, labelvalues):
+        self._histogram = histogram
+        self._labelvalues = labelvalues
+        self._started = 0.0
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self._started
+        self._histogram._observe(self._labelvalues, self.elapsed)
+
+        stages = _stage_recorder.get()
+        if stages is not None:
+            name = self._histogram.stage_name
+            if self._labelvalues:
+                name = f"{name}:{'/'.join(self._labelvalues)}"
+            stage = stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stage['seconds'] += self.elapsed
+            stage['calls'] += 1
+        return False
+
+
+class _Metric:
+    """Base class holding per-thread shards of a metric"""
+
+    metric_type = ''
+
+    # Shards kept before the first fold of dead threads' shards outside a scrape
+    FOLD_MIN_SHARDS = 64
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.reset()
+
+    def reset(self):
+        """Drop all recorded values"""
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict]] = []
+        self._retired: Dict = {}
+        self._fold_at = self.FOLD_MIN_SHARDS
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Dict:
+        """Return the calling thread's shard, creating it on first use"""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append((threading.current_thread(), shard))
+                if len(self._shards) >= self._fold_at:
+                    self._fold_dead()
+                    # Fold again once the live shards have doubled: amortized O(1) per thread
+                    self._fold_at = max(self.FOLD_MIN_SHARDS, 2 * len(self._shards))
+            self._local.shard = shard
+            return shard
+
+    def _labelvalues(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _merge(self, target: Dict, source: Dict):
+        raise NotImplementedError
+
+    def _fold_dead(self):
+        """Fold the shards of exited threads into the retired total; the lock must be held"""
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                self._merge(self._retired, dict(shard))
+        self._shards = alive
+
+    def _collect_values(self) -> Dict:
+        """Sum every shard, folding shards of dead threads into the retired total"""
+        with self._shards_lock:
+            self._fold_dead()
+
+            totals: Dict = {}
+            self._merge(totals, self._retired)
+            for _, shard in self._shards:
+                self._merge(totals, dict(shard))
+
+        return totals
+
+    def collect(self) -> List[str]:
+        raise NotImplementedError
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}"
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    metric_type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        shard = self._shard()
+        key = self._labelvalues(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def _merge(self, target: Dict, source: Dict):
+        for key, value in source.items():
+            target[key] = target.get(key, 0) + value
+
+    def collect(self) -> List[str]:
+        lines = self._header()
+        for key, value in sorted(self._collect_values().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value that can go up and down (summed across threads)"""
+
+    metric_type = 'gauge'
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose value is computed when the registry is scraped"""
+
+    metric_type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def collect(self) -> List[str]:
+        try:
+            value = self.callback()
+        except Exception:
+            return []
+        if value is None:
+            return []
+        return self._header() + [f"{self.name} {_format_value(value)}"]
+
+
+class Histogram(_Metric):
+    """Histogram with fixed upper bounds"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.stage_name = name.replace('resume_parser_', '', 1).replace('_seconds', '')
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float, **labels):
+        self._observe(self._labelvalues(labels), value)
+
+    def time(self, **labels) -> _Timer:
+        """Time a block: ``with HISTOGRAM.time(stage='x'): ...``"""
+        return _Timer(self, self._labelvalues(labels))
+
+    def _observe(self, key: Tuple, value: float):
+        shard = self._shard()
+        state = shard.get(key)
+        if state is None:
+            # [per-bucket counts (last one is +Inf), sum, count]
+            state = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            shard[key] = state
+
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def _merge(self, target: Dict, source: Dict):
+        for key, (counts, total, count) in source.items():
+            merged = target.get(key)
+            if merged is None:
+                target[key] = [list(counts), total, count]
+            else:
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+                merged[2] += count
+
+    def collect(self) -> List[str]:
+        lines = self._header()
+        for key, (counts, total, count) in sorted(self._collect_values().items()):
+            cumulative = 0
+            for upper, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(upper)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together in the text exposition format"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def reset(self):
+        """Drop every recorded value (used after fork so workers start from zero)"""
+        for metric in self._metrics:
+            metric.reset()
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+register_post_fork(REGISTRY.reset)
+
+UPLOAD_SIZE_BYTES = REGISTRY.register(Histogram(
+    'resume_parser_upload_size_bytes', 'Size of uploaded resume files',
+    buckets=SIZE_BUCKETS
+))
+EXTRACTION_SECONDS = REGISTRY.register(Histogram(
+    'resume_parser_extraction_seconds', 'Text extraction time per engine and PDF profile',
+    labelnames=('engine', 'profile')
+))
+PARSE_SECONDS = REGISTRY.register(Histogram(
+    'resume_parser_parse_seconds', 'ResumeParser time per extractor',
+    labelnames=('extractor',)
+))
+CLEANING_SECONDS = REGISTRY.register(Histogram(
+    'resume_parser_cleaning_seconds', 'DataCleaner.clean_resume_data time'
+))
+MATCH_SECONDS = REGISTRY.register(Histogram(
+    'resume_parser_match_seconds', 'Job matching time'
+))
+FAILURES_TOTAL = REGISTRY.register(Counter(
+    'resume_parser_failures_total', 'Failed requests by reason',
+    labelnames=('reason',)
+))
+IN_FLIGHT_REQUESTS = REGISTRY.register(Gauge(
+    'resume_parser_in_flight_requests', 'Requests currently being handled'
+))
+LOG_RECORDS_DROPPED_TOTAL = REGISTRY.register(Counter(
+    'resume_parser_log_records_dropped_total', 'Log records dropped because the log queue was full',
+    labelnames=('level',)
+))
+LOG_RECORDS_SUPPRESSED_TOTAL = REGISTRY.register(Counter(
+    'resume_parser_log_records_suppressed_total', 'Repetitive log records suppressed by rate limiting'
+))
+ADMISSION_WAIT_SECONDS = REGISTRY.register(Histogram(
+    'resume_parser_admission_wait_seconds', 'Time requests wait for an executor slot in async mode'
+))
+GUARDRAIL_REJECTIONS_TOTAL = REGISTRY.register(Counter(
+    'resume_parser_guardrail_rejections_total', 'Documents rejected by resource guardrails',
+    labelnames=('guard',)
+))
+STORE_SECONDS = REGISTRY.register(Histogram(
+    'resume_parser_store_seconds', 'Resume store time per operation',
+    labelnames=('operation',)
+))
+JOB_PROFILE_CACHE_TOTAL = REGISTRY.register(Counter(
+    'resume_parser_job_profile_cache_total', 'Compiled job profile cache hits, misses and evictions',
+    labelnames=('event',)
+))
+SCHEDULER_WAIT_SECONDS = REGISTRY.register(Histogram(
+    'resume_parser_scheduler_wait_seconds', 'Time parses wait for a parse slot, by lane',
+    labelnames=('lane',)
+))
+SCHEDULER_QUEUED = REGISTRY.register(Gauge(
+    'resume_parser_scheduler_queued', 'Parses waiting for a parse slot, by lane',
+    labelnames=('lane',)
+))
+SCHEDULER_ACTIVE = REGISTRY.register(Gauge(
+    'resume_parser_scheduler_active', 'Parses holding a parse slot, by lane',
+    labelnames=('lane',)
+))
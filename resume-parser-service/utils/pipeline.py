@@ -0,0 +1,88 @@
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientTextError(ValueError):
+    """Raised when too little text could be extracted from a resume"""
+
+
+class ResumePipeline:
+    """Run a resume file through text extraction, parsing and cleaning"""
+
+    MIN_TEXT_LENGTH = 50
+
+    def __init__(self, file_handler, resume_parser, data_cleaner):
+        self.file_handler = file_handler
+        self.resume_parser = resume_parser
+        self.data_cleaner = data_cleaner
+
+    def process(self, file_path: str, pdf_profile: Optional[str] = None) -> Tuple[Dict, str, Dict]:
+        """
+        Extract, parse and clean a single resume file
+
+        Args:
+            file_path: Path to the resume file
+            pdf_profile: PDF extraction profile (default: the file handler's)
+
+        Returns:
+            Tuple of (cleaned resume data, extracted text, extraction details)
+
+        Raises:
+            InsufficientTextError: If the file yields too little text to parse
+        """
+        # Extract text from file
+        extracted_text, extraction = self.file_handler.extract(file_path, pdf_profile)
+
+        if not extracted_text or len(extracted_text.strip()) < self.MIN_TEXT_LENGTH:
+            raise InsufficientTextError(
+                'Could not extract sufficient text from the resume. '
+                'Please ensure the file is not corrupted or password-protected.'
+            )
+
+        # Parse resume data
+        parsed_data = self.resume_parser.parse(extracted_text, file_path)
+
+        # Clean and validate data
+        cleaned_data = self.data_cleaner.clean_resume_data(parsed_data)
+
+        return cleaned_data, extracted_text, extraction
+
+    @staticmethod
+    def parsing_stats(cleaned_data: Dict) -> Dict:
+        """Summary counts reported alongside parsed data"""
+        return {
+            'skills_found': len(cleaned_data.get('skills', [])),
+            'experience_entries': len(cleaned_data.get('experience', [])),
+            'education_entries': len(cleaned_data.get('education', [])),
+            'certifications_found': len(cleaned_data.get('certifications', [])),
+            'languages_found': len(cleaned_data.get('languages', []))
+        }
+
+
+def build_parse_data(cleaned_data: Dict, extracted_text: str, filename: str, file_path: str,
+                     user_id: Optional[str] = None, job_id: Optional[str] = None,
+                     extraction: Optional[Dict] = None, extractor_versions: Optional[Mapping[str, int]] = None) -> Dict:
+    """
+    Build the 'data' section of a parse response
+
+    extractor_versions (the parser's EXTRACTOR_VERSIONS) is stamped into the
+    metadata so a stored result records which extractor code produced it.
+    """
+    return {
+        'parsed_data': cleaned_data,
+        'metadata': {
+            'filename': filename,
+            'file_size': os.path.getsize(file_path),
+            'processed_at': datetime.now().isoformat(),
+            'text_length': len(extracted_text),
+            'extraction': extraction or {},
+            'extractor_versions': dict(extractor_versions or {}),
+            'user_id': user_id,
+            'job_id': job_id
+        },
+        'parsing_stats': ResumePipeline.parsing_stats(cleaned_data)
+    }
@@ -0,0 +1,123 @@
+import cProfile
+import hmac
+import itertools
+import json
+import logging
+import os
+import pstats
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.metrics import record_stages
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfiler:
+    """Run individual requests under cProfile and summarize where time went"""
+
+    def __init__(self, admin_token: Optional[str] = None, sample_rate: int = 0,
+                 dump_dir: str = 'profiles', top_n: int = 25):
+        """
+        Args:
+            admin_token: Token required to request profiling explicitly (disabled if empty)
+            sample_rate: Profile 1 in N requests automatically (0 disables sampling)
+            dump_dir: Directory where profiles are written
+            top_n: Number of hot functions included in a report
+        """
+        self.admin_token = admin_token or None
+        self.sample_rate = max(0, int(sample_rate))
+        self.dump_dir = dump_dir
+        self.top_n = top_n
+        self._counter = itertools.count(1)
+
+    def is_requested(self, headers, args) -> bool:
+        """Check whether the caller asked for a profile via header or query flag"""
+        flag = headers.get('X-Profile') or args.get('profile') or ''
+        return flag.lower() in ('1', 'true', 'yes')
+
+    def is_authorized(self, headers) -> bool:
+        """Check the admin token sent with an explicit profiling request"""
+        if not self.admin_token:
+            return False
+
+        token = headers.get('X-Admin-Token', '')
+        return hmac.compare_digest(token.encode('utf-8'), self.admin_token.encode('utf-8'))
+
+    def should_sample(self) -> bool:
+        """Decide whether this request is one of the automatically profiled 1 in N"""
+        if not self.sample_rate:
+            return False
+        return next(self._counter) % self.sample_rate == 0
+
+    def profile(self, func: Callable, *args, **kwargs) -> Tuple[object, Dict, cProfile.Profile]:
+        """
+        Call func under the profiler
+
+        Returns:
+            Tuple of (func result, report, raw profile)
+        """
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+
+        with record_stages() as stages:
+            profiler.enable()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                profiler.disable()
+
+        total = time.perf_counter() - started
+        report = {
+            'total_seconds': round(total, 6),
+            'stages': self._format_stages(stages),
+            'hot_functions': self._hot_functions(profiler)
+        }
+        return result, report, profiler
+
+    def dump(self, report: Dict, profiler: cProfile.Profile, endpoint: str) -> Optional[str]:
+        """
+        Write the raw profile (.prof) and its report (.json) to the dump directory
+
+        Returns:
+            Base path of the written files, or None if writing failed
+        """
+        try:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            name = endpoint.strip('/').replace('/', '_') or 'root'
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            base_path = os.path.join(self.dump_dir, f"{timestamp}_{name}_{uuid.uuid4().hex[:8]}")
+
+            profiler.dump_stats(f"{base_path}.prof")
+            with open(f"{base_path}.json", 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2)
+
+            return base_path
+
+        except Exception as e:
+            logger.error(f"Error writing profile for {endpoint}: {str(e)}")
+            return None
+
+    def _format_stages(self, stages: Dict) -> List[Dict]:
+        """Order stage timings by time spent"""
+        return [
+            {'stage': name, 'seconds': round(stage['seconds'], 6), 'calls': stage['calls']}
+            for name, stage in sorted(stages.items(), key=lambda item: item[1]['seconds'], reverse=True)
+        ]
+
+    def _hot_functions(self, profiler: cProfile.Profile) -> List[Dict]:
+        """Top functions by own (self) time"""
+        stats = pstats.Stats(profiler).stats
+        ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+
+        hot = []
+        for (filename, line, function), (_, calls, own_time, cumulative_time, _) in ranked[:self.top_n]:
+            hot.append({
+                'function': f"{os.path.basename(filename)}:{line}({function})",
+                'calls': calls,
+                'own_seconds': round(own_time, 6),
+                'cumulative_seconds': round(cumulative_time, 6)
+            })
+        return hot
@@ -0,0 +1,711 @@
+"""
+Persistent store of parsed resumes with full-text search
+
+Cleaned resumes, their extracted text and parse metadata are kept in an
+embedded SQLite database so they can be looked up and searched without
+re-parsing the original files:
+
+    resumes      one row per (resume_hash, user_id); the hash is the SHA-256
+                 of the uploaded file, so re-uploading a file updates its row
+    resumes_fts  FTS5 index over name, skills and extracted text, using
+                 resumes as its external content (the text is stored once)
+    job_profiles registered job requirements by job_id, with a version
+                 bumped on every edit (see utils/job_profiles.py)
+    resume_vectors
+                 one embedding per resume (see utils/semantic.py); seq grows
+                 with every write, so readers can load just the new ones
+    resume_changes
+                 the latest change of each resume, kept by triggers; seq
+                 grows with every insert, update or delete of a resume's
+                 data, so in-memory indexes (see utils/facets.py) apply
+                 just those
+
+The metadata of each resume records the extractor versions that produced
+it, which is how stale_resumes() finds the resumes a backfill must
+reprocess (see utils/backfill.py).
+
+The database runs in WAL mode, so searches never block on a writer and
+writes are only fsynced at checkpoints. Each thread uses its own
+connection; connections are dropped in forked workers.
+
+Search queries are plain words (all must match), "quoted phrases" and
+prefixes ending in * (pyth*), e.g. ``"machine learning" pyth* aws``.
+"""
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from utils.lifecycle import register_post_fork
+from utils.metrics import STORE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    resume_hash TEXT NOT NULL,
+    user_id TEXT NOT NULL DEFAULT '',
+    job_id TEXT,
+    filename TEXT,
+    name TEXT,
+    skills TEXT,
+    parsed_data TEXT NOT NULL,
+    extracted_text TEXT NOT NULL,
+    metadata TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS resumes_hash_user ON resumes (resume_hash, user_id);
+CREATE INDEX IF NOT EXISTS resumes_user ON resumes (user_id, id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(
+    name, skills, extracted_text,
+    content='resumes', content_rowid='id',
+    tokenize="unicode61 remove_diacritics 2 tokenchars '+#'",
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS resumes_fts_insert AFTER INSERT ON resumes BEGIN
+    INSERT INTO resumes_fts (rowid, name, skills, extracted_text)
+    VALUES (new.id, new.name, new.skills, new.extracted_text);
+END;
+CREATE TRIGGER IF NOT EXISTS resumes_fts_delete AFTER DELETE ON resumes BEGIN
+    INSERT INTO resumes_fts (resumes_fts, rowid, name, skills, extracted_text)
+    VALUES ('delete', old.id, old.name, old.skills, old.extracted_text);
+END;
+CREATE TRIGGER IF NOT EXISTS resumes_fts_update AFTER UPDATE OF name, skills, extracted_text ON resumes BEGIN
+    INSERT INTO resumes_fts (resumes_fts, rowid, name, skills, extracted_text)
+    VALUES ('delete', old.id, old.name, old.skills, old.extracted_text);
+    INSERT INTO resumes_fts (rowid, name, skills, extracted_text)
+    VALUES (new.id, new.name, new.skills, new.extracted_text);
+END;
+
+CREATE TABLE IF NOT EXISTS job_profiles (
+    job_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    requirements TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS resume_vectors (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id INTEGER NOT NULL UNIQUE,
+    model TEXT NOT NULL,
+    vector BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS resume_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id INTEGER NOT NULL UNIQUE
+);
+-- Delete and insert: an upsert's conflict policy would override OR REPLACE here
+CREATE TRIGGER IF NOT EXISTS resumes_changes_insert AFTER INSERT ON resumes BEGIN
+    DELETE FROM resume_changes WHERE resume_id = new.id;
+    INSERT INTO resume_changes (resume_id) VALUES (new.id);
+END;
+CREATE TRIGGER IF NOT EXISTS resumes_changes_update AFTER UPDATE OF user_id, skills, parsed_data ON resumes BEGIN
+    DELETE FROM resume_changes WHERE resume_id = new.id;
+    INSERT INTO resume_changes (resume_id) VALUES (new.id);
+END;
+CREATE TRIGGER IF NOT EXISTS resumes_changes_delete AFTER DELETE ON resumes BEGIN
+    DELETE FROM resume_changes WHERE resume_id = old.id;
+    INSERT INTO resume_changes (resume_id) VALUES (old.id);
+END;
+"""
+
+# Resumes stored before schema version 4 have no resume_changes entry yet
+_SEED_CHANGES = """
+INSERT OR IGNORE INTO resume_changes (resume_id) SELECT id FROM resumes ORDER BY id
+"""
+
+# Matches in the name and skills outrank matches in the body text
+_BM25 = 'bm25(resumes_fts, 10.0, 5.0, 1.0)'
+
+SORT_ORDERS = ('relevance', 'recent')
+
+_UPSERT = """
+INSERT INTO resumes (resume_hash, user_id, job_id, filename, name, skills, parsed_data,
+                     extracted_text, metadata, created_at, updated_at)
+VALUES (:resume_hash, :user_id, :job_id, :filename, :name, :skills, :parsed_data,
+        :extracted_text, :metadata, :created_at, :created_at)
+ON CONFLICT (resume_hash, user_id) DO UPDATE SET
+    job_id = excluded.job_id,
+    filename = excluded.filename,
+    name = excluded.name,
+    skills = excluded.skills,
+    parsed_data = excluded.parsed_data,
+    extracted_text = excluded.extracted_text,
+    metadata = excluded.metadata,
+    updated_at = excluded.updated_at
+"""
+
+# REPLACE deletes the resume's previous vector, so the new one gets a new seq
+_UPSERT_VECTOR = """
+INSERT OR REPLACE INTO resume_vectors (resume_id, model, vector)
+SELECT id, :vector_model, :vector FROM resumes WHERE resume_hash = :resume_hash AND user_id = :user_id
+"""
+
+# Backfill writes (see utils/backfill.py) only land on the row as it was
+# read: a resume re-uploaded meanwhile already has a fresh result. name and
+# skills are only set when they changed, to spare the FTS index a rewrite
+_BACKFILL_UPDATE = """
+UPDATE resumes SET parsed_data = :parsed_data, metadata = :metadata, updated_at = :updated_at
+WHERE id = :resume_id AND updated_at = :read_updated_at
+"""
+_BACKFILL_UPDATE_INDEXED = """
+UPDATE resumes SET name = :name, skills = :skills, parsed_data = :parsed_data, metadata = :metadata,
+                   updated_at = :updated_at
+WHERE id = :resume_id AND updated_at = :read_updated_at
+"""
+_BACKFILL_VECTOR = """
+INSERT OR REPLACE INTO resume_vectors (resume_id, model, vector)
+SELECT id, :vector_model, :vector FROM resumes WHERE id = :resume_id AND updated_at = :read_updated_at
+"""
+
+_SUMMARY_COLUMNS = 'r.id, r.resume_hash, r.user_id, r.job_id, r.filename, r.name, r.skills, r.created_at, r.updated_at'
+
+# Quoted phrases or bare terms; a term may end in * for a prefix match
+_QUERY_TOKEN = re.compile(r'"([^"]*)"?|(\S+)')
+_WORD = re.compile(r'[\w+#]+')
+
+
+class InvalidQueryError(ValueError):
+    """Raised when a search query contains no searchable words"""
+
+
+class StaleVersionError(ValueError):
+    """Raised when a job profile write carries a version older than the stored one"""
+
+    def __init__(self, job_id: str, version: int, current_version: int):
+        super().__init__(f"Job {job_id} is at version {current_version}; version {version} is stale")
+        self.current_version = current_version
+
+
+def file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's contents, used to recognise re-uploaded resumes"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_match_query(query: str) -> str:
+    """
+    Translate a user query into an FTS5 MATCH expression
+
+    Every word is quoted, so FTS5 operators and column filters typed by a
+    user are searched as text instead of being interpreted.
+
+    Raises:
+        InvalidQueryError: If the query has no searchable words
+    """
+    parts = []
+
+    for phrase, term in _QUERY_TOKEN.findall(query or ''):
+        if phrase:
+            words = _WORD.findall(phrase)
+            if words:
+                parts.append('"' + ' '.join(words) + '"')
+        elif term:
+            words = _WORD.findall(term)
+            if not words:
+                continue
+            # "node.js" becomes the phrase "node js", matching how it was indexed
+            match = '"' + ' '.join(words) + '"'
+            if term.endswith('*'):
+                match += '*'
+            parts.append(match)
+
+    if not parts:
+        raise InvalidQueryError('Search query has no searchable words')
+
+    return ' AND '.join(parts)
+
+
+class ResumeStore:
+    """
+    SQLite-backed store of parsed resumes
+
+    Args:
+        path: Database file (created with its directory if missing)
+        cache_size_mb: Page cache per connection
+        mmap_size_mb: Memory-mapped I/O window per connection (0 disables)
+    """
+
+    def __init__(self, path: str, cache_size_mb: int = 64, mmap_size_mb: int = 256):
+        self.path = path
+        self.cache_size_mb = cache_size_mb
+        self.mmap_size_mb = mmap_size_mb
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Create the schema on a short-lived connection, so none is open
+        # when a preloading master forks its workers
+        connection = self._connect()
+        try:
+            with connection:
+                previous_version = connection.execute('PRAGMA user_version').fetchone()[0]
+                connection.executescript(_SCHEMA)
+                if previous_version < 4:
+                    connection.execute(_SEED_CHANGES)
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        finally:
+            connection.close()
+
+        register_post_fork(self._after_fork)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('PRAGMA synchronous = NORMAL')
+        connection.execute('PRAGMA temp_store = MEMORY')
+        connection.execute(f"PRAGMA cache_size = {-self.cache_size_mb * 1024}")
+        connection.execute(f"PRAGMA mmap_size = {self.mmap_size_mb * 1024 * 1024}")
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def _after_fork(self):
+        """SQLite connections must not be used across fork"""
+        self._local = threading.local()
+
+    def close(self):
+        """Close this thread's connection, letting SQLite update its statistics"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.execute('PRAGMA optimize')
+            connection.close()
+            self._local.connection = None
+
+    @staticmethod
+    def _row(record: Dict) -> Dict:
+        """Flatten a record into upsert parameters"""
+        parsed_data = record.get('parsed_data') or {}
+        personal_info = parsed_data.get('personal_info')
+        skills = parsed_data.get('skills') or []
+
+        return {
+            'resume_hash': record['resume_hash'],
+            'user_id': record.get('user_id') or '',
+            'job_id': record.get('job_id'),
+            'filename': record.get('filename'),
+            'name': personal_info.get('name') if isinstance(personal_info, dict) else None,
+            'skills': '\n'.join(str(skill) for skill in skills),
+            'parsed_data': json.dumps(parsed_data, ensure_ascii=False, default=str),
+            'extracted_text': record.get('extracted_text') or '',
+            'metadata': json.dumps(record.get('metadata') or {}, ensure_ascii=False, default=str),
+            'created_at': datetime.now().isoformat(),
+            'vector': record.get('vector'),
+            'vector_model': record.get('vector_model')
+        }
+
+    def save(self, resume_hash: str, parsed_data: Dict, extracted_text: str, metadata: Optional[Dict] = None,
+             user_id: Optional[str] = None, job_id: Optional[str] = None, filename: Optional[str] = None,
+             vector: Optional[bytes] = None, vector_model: Optional[str] = None) -> int:
+        """
+        Insert or update one resume, and its embedding if given
+
+        Returns:
+            The stored resume's id
+        """
+        row = self._row({
+            'resume_hash': resume_hash, 'parsed_data': parsed_data, 'extracted_text': extracted_text,
+            'metadata': metadata, 'user_id': user_id, 'job_id': job_id, 'filename': filename,
+            'vector': vector, 'vector_model': vector_model
+        })
+
+        connection = self.connection
+        with STORE_SECONDS.time(operation='save'), self._transaction(connection):
+            connection.execute(_UPSERT, row)
+            if row['vector'] is not None:
+                connection.execute(_UPSERT_VECTOR, row)
+            return connection.execute(
+                'SELECT id FROM resumes WHERE resume_hash = ? AND user_id = ?',
+                (row['resume_hash'], row['user_id'])
+            ).fetchone()[0]
+
+    def save_many(self, records: Iterable[Dict], batch_size: int = 1000) -> int:
+        """
+        Insert or update resumes in transactions of batch_size rows
+
+        Each record holds resume_hash, parsed_data, extracted_text and
+        optionally metadata, user_id, job_id, filename, and vector with
+        vector_model.
+
+        Returns:
+            Number of records written
+        """
+        connection = self.connection
+        written = 0
+        batch = []
+
+        for record in records:
+            batch.append(self._row(record))
+            if len(batch) >= batch_size:
+                written += self._write_batch(connection, batch)
+                batch = []
+
+        if batch:
+            written += self._write_batch(connection, batch)
+
+        return written
+
+    def _write_batch(self, connection: sqlite3.Connection, rows: List[Dict]) -> int:
+        with STORE_SECONDS.time(operation='save_many'), self._transaction(connection):
+            connection.executemany(_UPSERT, rows)
+            connection.executemany(_UPSERT_VECTOR, (row for row in rows if row['vector'] is not None))
+        return len(rows)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _transaction(connection: sqlite3.Connection):
+        """
+        Explicit write transaction; BEGIN IMMEDIATE takes the write lock up
+        front instead of failing when a read transaction tries to upgrade
+        """
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def get(self, resume_id: int) -> Optional[Dict]:
+        """Full stored resume by id"""
+        row = self.connection.execute('SELECT * FROM resumes WHERE id = ?', (resume_id,)).fetchone()
+        return self._full(row) if row else None
+
+    def find_by_hash(self, resume_hash: str, user_id: Optional[str] = None) -> List[Dict]:
+        """Stored resumes for a file hash, optionally for one user"""
+        sql = f"SELECT {_SUMMARY_COLUMNS} FROM resumes r WHERE r.resume_hash = ?"
+        params = [resume_hash]
+        if user_id is not None:
+            sql += ' AND r.user_id = ?'
+            params.append(user_id)
+
+        return [self._summary(row) for row in self.connection.execute(sql + ' ORDER BY r.id', params)]
+
+    def find_by_user(self, user_id: str, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """A user's stored resumes, newest first"""
+        rows = self.connection.execute(
+            f"SELECT {_SUMMARY_COLUMNS} FROM resumes r WHERE r.user_id = ? ORDER BY r.id DESC LIMIT ? OFFSET ?",
+            (user_id, limit, offset)
+        )
+        return [self._summary(row) for row in rows]
+
+    def search(self, query: str, user_id: Optional[str] = None, limit: int = 20, offset: int = 0,
+               sort: str = 'relevance') -> List[Dict]:
+        """
+        Full-text search
+
+        Relevance ranking scores every matching document, so a very common
+        term over a large store costs more than sort='recent' (newest
+        first), which stops after the requested page.
+
+        Raises:
+            InvalidQueryError: If the query has no searchable words
+            ValueError: If sort is not one of SORT_ORDERS
+        """
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unsupported sort order: {sort}")
+
+        match = build_match_query(query)
+        connection = self.connection
+
+        with STORE_SECONDS.time(operation='search'):
+            # Rank first and fetch snippets and columns for the page only
+            sql = f"SELECT resumes_fts.rowid AS id, {_BM25} AS score FROM resumes_fts"
+            params = []
+            if user_id is not None:
+                sql += ' JOIN resumes r ON r.id = resumes_fts.rowid AND r.user_id = ?'
+                params.append(user_id)
+            sql += ' WHERE resumes_fts MATCH ?'
+            sql += ' ORDER BY score' if sort == 'relevance' else ' ORDER BY resumes_fts.rowid DESC'
+            sql += ' LIMIT ? OFFSET ?'
+            params.extend([match, limit, offset])
+
+            scores = {row['id']: row['score'] for row in connection.execute(sql, params)}
+            if not scores:
+                return []
+
+            placeholders = ', '.join('?' * len(scores))
+            rows = connection.execute(
+                f"SELECT {_SUMMARY_COLUMNS}, snippet(resumes_fts, 2, '[', ']', '...', 16) AS snippet "
+                "FROM resumes_fts JOIN resumes r ON r.id = resumes_fts.rowid "
+                f"WHERE resumes_fts MATCH ? AND resumes_fts.rowid IN ({placeholders})",
+                [match, *scores]
+            ).fetchall()
+
+        by_id = {row['id']: row for row in rows}
+        results = []
+        for resume_id, score in scores.items():
+            row = by_id.get(resume_id)
+            if row is None:  # Deleted between the two queries
+                continue
+            result = self._summary(row)
+            result['snippet'] = row['snippet']
+            # bm25 is lower for better matches; report higher-is-better
+            result['score'] = round(-score, 4)
+            results.append(result)
+        return results
+
+    def summaries(self, resume_ids: List[int]) -> Dict[int, Dict]:
+        """Summaries of the given resumes by id (ids not stored are left out)"""
+        if not resume_ids:
+            return {}
+
+        placeholders = ', '.join('?' * len(resume_ids))
+        rows = self.connection.execute(
+            f"SELECT {_SUMMARY_COLUMNS} FROM resumes r WHERE r.id IN ({placeholders})", list(resume_ids)
+        )
+        return {row['id']: self._summary(row) for row in rows}
+
+    def count(self) -> int:
+        return self.connection.execute('SELECT count(*) FROM resumes').fetchone()[0]
+
+    def vectors_since(self, seq: int, model: str, limit: int = 10000) -> List[sqlite3.Row]:
+        """
+        Resume vectors of an embedding model written after seq, oldest first
+
+        Returns:
+            Rows of seq, resume_id, user_id and vector (float32 bytes)
+        """
+        with STORE_SECONDS.time(operation='vectors_since'):
+            return self.connection.execute(
+                'SELECT v.seq, v.resume_id, r.user_id, v.vector FROM resume_vectors v '
+                'JOIN resumes r ON r.id = v.resume_id '
+                'WHERE v.seq > ? AND v.model = ? ORDER BY v.seq LIMIT ?',
+                (seq, model, limit)
+            ).fetchall()
+
+    def changes_since(self, seq: int, limit: int = 10000) -> List[sqlite3.Row]:
+        """
+        Resumes inserted, updated or deleted after seq, oldest change first,
+        with the fields facets are built from (see utils/facets.py)
+
+        Returns:
+            Rows of seq, resume_id, deleted, user_id, skills (newline
+            separated), total_experience, education and certifications
+            (entry counts) and languages (JSON list); the fields of a
+            deleted resume are NULL
+        """
+        with STORE_SECONDS.time(operation='changes_since'):
+            return self.connection.execute(
+                'SELECT c.seq, c.resume_id, r.id IS NULL AS deleted, r.user_id, r.skills, '
+                "json_extract(r.parsed_data, '$.total_experience') AS total_experience, "
+                "json_array_length(r.parsed_data, '$.education') AS education, "
+                "json_array_length(r.parsed_data, '$.certifications') AS certifications, "
+                "json_extract(r.parsed_data, '$.languages') AS languages "
+                'FROM resume_changes c LEFT JOIN resumes r ON r.id = c.resume_id '
+                'WHERE c.seq > ? ORDER BY c.seq LIMIT ?',
+                (seq, limit)
+            ).fetchall()
+
+    @staticmethod
+    def _stale_condition(versions: Mapping[str, int], vector_model: Optional[str]):
+        """WHERE clause and parameters selecting results older than the given versions"""
+        conditions = []
+        params = []
+        for name, version in versions.items():
+            conditions.append('json_extract(r.metadata, ?) IS NOT ?')
+            params.extend([f"$.extractor_versions.{name}", version])
+        if vector_model is not None:
+            conditions.append('v.model IS NOT ?')
+            params.append(vector_model)
+        return '(' + ' OR '.join(conditions or ['0']) + ')', params
+
+    def stale_resumes(self, versions: Mapping[str, int], vector_model: Optional[str] = None,
+                      after_id: int = 0, limit: int = 500) -> List[Dict]:
+        """
+        Stored resumes parsed by older extractor versions, in id order
+
+        Args:
+            versions: Current version of each extractor; a resume is stale if
+                the extractor_versions in its metadata differ for any of them
+            vector_model: Also select resumes without a vector of this model
+            after_id: Only resumes with a greater id (for paging)
+            limit: Maximum number of resumes
+
+        Returns:
+            Dicts of resume_id, updated_at, name, skills, parsed_data,
+            extracted_text, metadata and vector_model
+        """
+        condition, params = self._stale_condition(versions, vector_model)
+        with STORE_SECONDS.time(operation='stale_resumes'):
+            rows = self.connection.execute(
+                'SELECT r.id, r.updated_at, r.name, r.skills, r.parsed_data, r.extracted_text, r.metadata, '
+                'v.model AS vector_model FROM resumes r LEFT JOIN resume_vectors v ON v.resume_id = r.id '
+                f"WHERE r.id > ? AND {condition} ORDER BY r.id LIMIT ?",
+                [after_id, *params, limit]
+            ).fetchall()
+
+        return [{
+            'resume_id': row['id'],
+            'updated_at': row['updated_at'],
+            'name': row['name'],
+            'skills': row['skills'],
+            'parsed_data': json.loads(row['parsed_data']),
+            'extracted_text': row['extracted_text'],
+            'metadata': json.loads(row['metadata'] or '{}'),
+            'vector_model': row['vector_model']
+        } for row in rows]
+
+    def count_stale(self, versions: Mapping[str, int], vector_model: Optional[str] = None) -> int:
+        """Number of resumes stale_resumes() would return without a limit"""
+        condition, params = self._stale_condition(versions, vector_model)
+        return self.connection.execute(
+            'SELECT count(*) FROM resumes r LEFT JOIN resume_vectors v ON v.resume_id = r.id '
+            f"WHERE {condition}", params
+        ).fetchone()[0]
+
+    def save_backfill(self, updates: Iterable[Dict]) -> int:
+        """
+        Write reprocessed results in one transaction
+
+        Each update holds resume_id and read_updated_at (the updated_at
+        read by stale_resumes()), then parsed_data and metadata to replace
+        the stored ones and/or vector with vector_model. An update is
+        skipped if the resume changed since it was read, so writing the
+        same update twice has no further effect.
+
+        Returns:
+            Number of resumes written
+        """
+        connection = self.connection
+        written = 0
+        with STORE_SECONDS.time(operation='save_backfill'), self._transaction(connection):
+            for update in updates:
+                params = {
+                    'resume_id': update['resume_id'],
+                    'read_updated_at': update['read_updated_at'],
+                    'vector': update.get('vector'),
+                    'vector_model': update.get('vector_model')
+                }
+                # The vector first: its guard reads updated_at before the row update changes it
+                if params['vector'] is not None:
+                    cursor = connection.execute(_BACKFILL_VECTOR, params)
+                    if not cursor.rowcount:
+                        continue
+
+                if update.get('parsed_data') is not None:
+                    row = self._row({
+                        'resume_hash': '', 'parsed_data': update['parsed_data'], 'metadata': update.get('metadata')
+                    })
+                    params.update({
+                        'name': row['name'],
+                        'skills': row['skills'],
+                        'parsed_data': row['parsed_data'],
+                        'metadata': row['metadata'],
+                        'updated_at': row['created_at']
+                    })
+                    indexed = (row['name'], row['skills']) != (update.get('name'), update.get('skills'))
+                    cursor = connection.execute(_BACKFILL_UPDATE_INDEXED if indexed else _BACKFILL_UPDATE, params)
+                    if not cursor.rowcount:
+                        continue
+
+                written += 1
+        return written
+
+    def save_job_profile(self, job_id: str, requirements: Dict, version: Optional[int] = None) -> int:
+        """
+        Insert or replace a job's requirements
+
+        Without a version the stored version is incremented. An explicit
+        version must be newer than the stored one; repeating the stored
+        version with the same requirements is accepted as a retry.
+
+        Returns:
+            The stored version
+
+        Raises:
+            StaleVersionError: If version is not newer than the stored one
+        """
+        serialized = json.dumps(requirements, ensure_ascii=False, sort_keys=True, default=str)
+
+        connection = self.connection
+        with STORE_SECONDS.time(operation='save_job_profile'), self._transaction(connection):
+            row = connection.execute(
+                'SELECT version, requirements FROM job_profiles WHERE job_id = ?', (job_id,)
+            ).fetchone()
+            current = row['version'] if row else 0
+
+            if version is None:
+                version = current + 1
+            elif version <= current:
+                if version == current and row['requirements'] == serialized:
+                    return current
+                raise StaleVersionError(job_id, version, current)
+
+            connection.execute(
+                'INSERT OR REPLACE INTO job_profiles (job_id, version, requirements, updated_at) VALUES (?, ?, ?, ?)',
+                (job_id, version, serialized, datetime.now().isoformat())
+            )
+            return version
+
+    def get_job_profile(self, job_id: str) -> Optional[Dict]:
+        """A job's stored requirements with their version, None if not registered"""
+        row = self.connection.execute('SELECT * FROM job_profiles WHERE job_id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'job_id': row['job_id'],
+            'version': row['version'],
+            'requirements': json.loads(row['requirements']),
+            'updated_at': row['updated_at']
+        }
+
+    def job_profile_version(self, job_id: str) -> Optional[int]:
+        """A job's stored version (a primary key lookup), None if not registered"""
+        row = self.connection.execute('SELECT version FROM job_profiles WHERE job_id = ?', (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def optimize(self):
+        """Merge the FTS index segments; worth running after large imports"""
+        connection = self.connection
+        connection.execute("INSERT INTO resumes_fts (resumes_fts) VALUES ('optimize')")
+        connection.execute('PRAGMA optimize')
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> Dict:
+        return {
+            'resume_id': row['id'],
+            'resume_hash': row['resume_hash'],
+            'user_id': row['user_id'] or None,
+            'job_id': row['job_id'],
+            'filename': row['filename'],
+            'name': row['name'],
+            'skills': [skill for skill in (row['skills'] or '').split('\n') if skill],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at']
+        }
+
+    @classmethod
+    def _full(cls, row: sqlite3.Row) -> Dict:
+        result = cls._summary(row)
+        result.update({
+            'parsed_data': json.loads(row['parsed_data']),
+            'extracted_text': row['extracted_text'],
+            'metadata': json.loads(row['metadata'] or '{}')
+        })
+        return result
+
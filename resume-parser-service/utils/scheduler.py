@@ -0,0 +1,296 @@
+"""
+Weighted fair scheduling of parse work
+
+Parsing is CPU bound, so a worker runs only a few parses at a time. Which
+parse runs next used to be first come, first served: one recruiter
+importing 2,000 resumes could hold every slot while a job seeker's single
+upload waited behind the whole import.
+
+FairScheduler hands out the parse slots instead. Every parse waits in a
+lane, 'interactive' for single uploads and 'bulk' for multi-file imports,
+and lanes share the slots in proportion to their weights (4:1 by
+default), so bulk work keeps moving but an interactive upload is served
+within a slot or two. Inside a lane each tenant (user or account) has its
+own queue, and the queues are served by weighted fair queuing: every
+parse gets a virtual finish time, its tenant's previous finish time (or
+the lane's clock, whichever is later) plus cost / weight, and the
+earliest finish time goes next. A tenant with 2,000 queued parses
+therefore alternates with one that has a single parse. A tenant may also
+be capped at a number of concurrent parses.
+
+Bulk requests take a slot per file, so an import yields to interactive
+uploads between files.
+
+Slots are granted in the calling thread, so the scheduler only reorders
+work when requests outnumber slots: run more request threads
+(GUNICORN_THREADS, ASYNC_MAX_CONCURRENCY) than PARSE_MAX_CONCURRENCY.
+"""
+import contextlib
+import logging
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Deque, Dict, Iterator, Mapping, Optional
+
+from utils.metrics import SCHEDULER_ACTIVE, SCHEDULER_QUEUED, SCHEDULER_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+
+LANE_WEIGHTS = MappingProxyType({INTERACTIVE: 4.0, BULK: 1.0})
+
+
+class SchedulerTimeoutError(Exception):
+    """Raised when a parse waited longer than the scheduler timeout for a slot"""
+
+    def __init__(self, lane: str, waited: float):
+        super().__init__(f"No parse slot became free within {waited:.1f}s ({lane} lane)")
+        self.lane = lane
+        self.waited = waited
+
+
+def parse_tenant_settings(value: Optional[str]) -> Dict[str, float]:
+    """
+    Per-tenant settings from a "tenant=value,tenant=value" string
+
+    Raises:
+        ValueError: If an entry is not tenant=number
+    """
+    settings = {}
+    for entry in (value or '').split(','):
+        if not entry.strip():
+            continue
+        tenant, separator, number = entry.rpartition('=')
+        if not separator or not tenant.strip():
+            raise ValueError(f"Expected tenant=number, got {entry!r}")
+        settings[tenant.strip()] = float(number)
+    return settings
+
+
+class _Waiter:
+    """One parse waiting for a slot"""
+
+    __slots__ = ('tenant', 'lane', 'cost', 'finish', 'granted', 'event')
+
+    def __init__(self, tenant: str, lane: str, cost: float, finish: float):
+        self.tenant = tenant
+        self.lane = lane
+        self.cost = cost
+        self.finish = finish
+        self.granted = False
+        self.event = threading.Event()
+
+
+class _Lane:
+    """Per-tenant queues of one lane"""
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        # Lane's share of the slots used so far, in cost / weight
+        self.virtual_time = 0.0
+        # Finish time of the last parse started, the lane's WFQ clock
+        self.clock = 0.0
+        self.queues: Dict[str, Deque[_Waiter]] = {}
+        self.last_finish: Dict[str, float] = {}
+        self.queued = 0
+        self.active = 0
+        # Wait statistics exposed through snapshot()
+        self.wait_count = 0
+        self.wait_seconds_sum = 0.0
+        self.wait_seconds_max = 0.0
+
+
+class FairScheduler:
+    """
+    Grants parse slots by lane weight, then by weighted fair queuing per tenant
+
+    Thread-safe.
+
+    Args:
+        max_concurrency: Parses running at once
+        lane_weights: Share of the slots per lane
+        tenant_max_concurrency: Parses one tenant may run at once (0 for no cap)
+        tenant_limits: Caps for particular tenants, overriding tenant_max_concurrency
+        tenant_weights: Weights for particular tenants (default 1)
+        timeout: Seconds a parse may wait for a slot (0 waits forever)
+    """
+
+    def __init__(self, max_concurrency: int, lane_weights: Mapping[str, float] = LANE_WEIGHTS,
+                 tenant_max_concurrency: int = 0, tenant_limits: Optional[Mapping[str, float]] = None,
+                 tenant_weights: Optional[Mapping[str, float]] = None, timeout: float = 0):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.tenant_max_concurrency = max(0, int(tenant_max_concurrency))
+        self.tenant_limits = MappingProxyType({tenant: int(limit) for tenant, limit in (tenant_limits or {}).items()})
+        self.tenant_weights = MappingProxyType(dict(tenant_weights or {}))
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._lanes = {lane: _Lane(float(weight)) for lane, weight in lane_weights.items()}
+        self._active = 0
+        self._tenant_active: Dict[str, int] = {}
+
+    @property
+    def lanes(self):
+        return tuple(self._lanes)
+
+    def tenant_limit(self, tenant: str) -> int:
+        """Concurrent parses the tenant may run, 0 for no cap"""
+        return self.tenant_limits.get(tenant, self.tenant_max_concurrency)
+
+    @contextlib.contextmanager
+    def slot(self, tenant: str, lane: str = INTERACTIVE, cost: float = 1.0) -> Iterator[float]:
+        """
+        Hold a parse slot for the duration of the block
+
+        Yields:
+            Seconds spent waiting for the slot
+
+        Raises:
+            SchedulerTimeoutError: If no slot was granted within the timeout
+        """
+        waited = self.acquire(tenant, lane, cost)
+        try:
+            yield waited
+        finally:
+            self.release(tenant, lane)
+
+    def acquire(self, tenant: str, lane: str = INTERACTIVE, cost: float = 1.0) -> float:
+        """
+        Wait for a parse slot; release() must follow
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            KeyError: If the lane does not exist
+            SchedulerTimeoutError: If no slot was granted within the timeout
+        """
+        started = time.perf_counter()
+
+        with self._lock:
+            queue = self._lanes[lane]
+            waiter = self._enqueue(queue, tenant, lane, cost)
+            self._dispatch()
+
+        if not waiter.event.wait(self.timeout or None):
+            with self._lock:
+                if not waiter.granted:
+                    self._remove(queue, waiter)
+                    SCHEDULER_QUEUED.dec(lane=lane)
+                    raise SchedulerTimeoutError(lane, time.perf_counter() - started)
+
+        waited = time.perf_counter() - started
+        with self._lock:
+            queue.wait_count += 1
+            queue.wait_seconds_sum += waited
+            queue.wait_seconds_max = max(queue.wait_seconds_max, waited)
+        SCHEDULER_WAIT_SECONDS.observe(waited, lane=lane)
+        return waited
+
+    def release(self, tenant: str, lane: str = INTERACTIVE):
+        """Give back a slot obtained through acquire()"""
+        with self._lock:
+            self._active -= 1
+            self._lanes[lane].active -= 1
+            remaining = self._tenant_active[tenant] - 1
+            if remaining:
+                self._tenant_active[tenant] = remaining
+            else:
+                del self._tenant_active[tenant]
+            SCHEDULER_ACTIVE.dec(lane=lane)
+            self._dispatch()
+
+    def _enqueue(self, queue: _Lane, tenant: str, lane: str, cost: float) -> _Waiter:
+        """Queue a parse with its virtual finish time; the lock must be held"""
+        if not queue.queued and not queue.active:
+            # A lane that was idle does not bank credit for the time it was idle
+            busy = [other.virtual_time for other in self._lanes.values() if other.queued or other.active]
+            if busy:
+                queue.virtual_time = max(queue.virtual_time, min(busy))
+
+        start = max(queue.clock, queue.last_finish.get(tenant, 0.0))
+        waiter = _Waiter(tenant, lane, cost, start + cost / self.tenant_weights.get(tenant, 1.0))
+        queue.last_finish[tenant] = waiter.finish
+        queue.queues.setdefault(tenant, deque()).append(waiter)
+        queue.queued += 1
+        SCHEDULER_QUEUED.inc(lane=lane)
+        return waiter
+
+    def _remove(self, queue: _Lane, waiter: _Waiter):
+        """Take a waiter out of its queue; the lock must be held"""
+        tenant_queue = queue.queues[waiter.tenant]
+        tenant_queue.remove(waiter)
+        queue.queued -= 1
+        if not tenant_queue:
+            del queue.queues[waiter.tenant]
+            queue.last_finish.pop(waiter.tenant, None)
+
+    def _next(self) -> Optional[_Waiter]:
+        """The waiter to run next: lane with the least weighted use, then earliest finish time"""
+        best = None
+        best_lane = None
+        for queue in self._lanes.values():
+            head = None
+            for tenant, tenant_queue in queue.queues.items():
+                limit = self.tenant_limit(tenant)
+                if limit and self._tenant_active.get(tenant, 0) >= limit:
+                    continue
+                if head is None or tenant_queue[0].finish < head.finish:
+                    head = tenant_queue[0]
+            if head is not None and (best_lane is None or queue.virtual_time < best_lane.virtual_time):
+                best, best_lane = head, queue
+        return best
+
+    def _dispatch(self):
+        """Grant free slots to waiters; the lock must be held"""
+        while self._active < self.max_concurrency:
+            waiter = self._next()
+            if waiter is None:
+                return
+
+            queue = self._lanes[waiter.lane]
+            tenant_queue = queue.queues[waiter.tenant]
+            tenant_queue.popleft()
+            if not tenant_queue:
+                # Its last finish time is the lane clock now, so nothing is lost
+                del queue.queues[waiter.tenant]
+                queue.last_finish.pop(waiter.tenant, None)
+
+            queue.queued -= 1
+            queue.active += 1
+            queue.clock = max(queue.clock, waiter.finish)
+            queue.virtual_time += waiter.cost / queue.weight
+            self._active += 1
+            self._tenant_active[waiter.tenant] = self._tenant_active.get(waiter.tenant, 0) + 1
+
+            SCHEDULER_QUEUED.dec(lane=waiter.lane)
+            SCHEDULER_ACTIVE.inc(lane=waiter.lane)
+            waiter.granted = True
+            waiter.event.set()
+
+    def snapshot(self) -> Dict:
+        """Slots in use and per-lane queue depth and wait-time statistics"""
+        with self._lock:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'tenant_max_concurrency': self.tenant_max_concurrency,
+                'active': self._active,
+                'active_tenants': len(self._tenant_active),
+                'lanes': {
+                    lane: {
+                        'weight': queue.weight,
+                        'active': queue.active,
+                        'queued': queue.queued,
+                        'queued_tenants': len(queue.queues),
+                        'wait_count': queue.wait_count,
+                        'wait_seconds_sum': round(queue.wait_seconds_sum, 6),
+                        'wait_seconds_max': round(queue.wait_seconds_max, 6),
+                        'wait_seconds_avg': round(queue.wait_seconds_sum / queue.wait_count, 6)
+                        if queue.wait_count else 0.0
+                    }
+                    for lane, queue in self._lanes.items()
+                }
+            }
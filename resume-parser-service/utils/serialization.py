@@ -0,0 +1,88 @@
+"""
+Response encoding for the Resume Parser Service
+
+orjson, msgpack and zstandard are optional: when one of them is missing the
+service falls back to the stdlib JSON encoder, JSON bodies and gzip.
+"""
+import gzip
+import logging
+from typing import Dict, Optional, Tuple
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson when it is installed"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+
+def available_mimetypes() -> Tuple[str, ...]:
+    """Response types this process can produce, JSON first"""
+    if msgpack is None:
+        return (JSON_MIMETYPE,)
+    return (JSON_MIMETYPE,) + MSGPACK_MIMETYPES
+
+
+def encode_body(payload: Dict, mimetype: str, json_provider) -> bytes:
+    """
+    Encode a payload for the negotiated content type
+
+    Args:
+        payload: Response payload
+        mimetype: One of available_mimetypes()
+        json_provider: The app's JSON provider, used for JSON bodies
+
+    Returns:
+        Encoded response body
+    """
+    if mimetype in MSGPACK_MIMETYPES and msgpack is not None:
+        return msgpack.packb(payload, use_bin_type=True, default=str)
+
+    return json_provider.dumps(payload).encode('utf-8')
+
+
+def choose_encoding(accept_encoding) -> Optional[str]:
+    """Pick the content encoding to use from an Accept-Encoding header"""
+    if zstandard is not None and accept_encoding['zstd']:
+        return 'zstd'
+    if accept_encoding['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: str, level: int = 5) -> bytes:
+    """Compress a response body with gzip or zstd"""
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(body)
+
+    return gzip.compress(body, compresslevel=level)
+